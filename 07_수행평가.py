@@ -3,7 +3,8 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import os
+
+from shared.endangered import load_endangered
 
 # --- 설정 및 데이터 로드 ---
 st.set_page_config(
@@ -11,26 +12,11 @@ st.set_page_config(
     layout="wide"
 )
 
-# 데이터 파일 경로 설정 (루트 폴더에 있다고 가정)
-CSV_FILE_PATH = 'endangered.csv'
-
-@st.cache_data
-def load_data(path):
-    """CSV 파일을 로드하고 캐싱합니다."""
-    try:
-        # 파일 인코딩 문제 해결을 위해 'cp949' 또는 'euc-kr' 시도
-        df = pd.read_csv(path, encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            df = pd.read_csv(path, encoding='cp949')
-        except UnicodeDecodeError:
-            df = pd.read_csv(path, encoding='euc-kr')
-    
-    # '등급'과 '분류군' 컬럼의 결측값을 처리 (필요시)
-    df = df.dropna(subset=['등급', '분류군']).copy()
-    return df
+def load_data():
+    """공유 로더에서 멸종위기종 목록을 가져옵니다. (인코딩 판별 + 모든 페이지가 같은 캐시 사용)"""
+    return load_endangered()
 
-df = load_data(CSV_FILE_PATH)
+df = load_data()
 
 # --- Streamlit 앱 시작 ---
 st.title("멸종위기 야생생물 등급별 분포 분석 🐘🌿")
@@ -56,6 +42,7 @@ filtered_df = df[df['등급'] == selected_grade]
 if not filtered_df.empty:
     ranking_data = filtered_df['분류군'].value_counts().reset_index()
     ranking_data.columns = ['분류군', '개체수']
+    ranking_data = ranking_data[ranking_data['개체수'] > 0]  # category 컬럼은 0개인 분류군도 포함되므로 제외
     
     # 순위를 개체수 내림차순으로 정렬
     ranking_data = ranking_data.sort_values(by='개체수', ascending=False)
@@ -0,0 +1,124 @@
+"""
+데이터셋별 메모리 비교: pandas 기본 dtype 으로 읽은 프레임 vs 앱이 캐시에 올린 객체
+- 기본: read_csv 기본값(object 문자열, int64, float64 — pandas 2 의 기본, pandas 3 의 str 도 object 로 되돌려 비교).
+  인구는 이전 페이지처럼 dtype=str 로 읽어 float64 로 변환, 지하철은 모든 월 파일을 이어 붙인 프레임입니다.
+- 앱 데이터: 같은 내용을 앱이 보관하는 형태 (지하철 전체 프레임, 인구 cube, 멸종위기종 프레임, MBTI 행렬, 관광지 인덱스)
+- 앱 전체: 로더가 shared.memory.track 으로 알린 모든 객체(인덱스·시계열 등 파생 구조 포함)의 합계 (같은 객체는 한 번만 셈)
+- --scale 을 주면 bench.pages 의 합성 데이터 사본(.cache/bench/x<배율>)에서 잽니다.
+
+실행: python -m bench.memory [--scale 10]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from shared.paths import ROOT
+
+# 데이터셋마다 원본과 같은 내용을 담은 앱 객체 이름 (앞부분)
+BASE_OBJECTS = {"subway": "frame", "population": "cube", "endangered": "frame", "mbti": "matrix", "places": "index"}
+
+
+def default_frames():
+    """데이터셋 이름 → pandas 기본 dtype 으로 읽은 프레임"""
+    population = pd.read_csv(ROOT / "population.csv", dtype=str).set_index("행정구역")
+    frames = {
+        "subway": pd.concat([pd.read_csv(path, encoding="cp949") for path in sorted(ROOT.glob("subway*.csv"))]),
+        "population": population.apply(lambda col: col.str.replace(",", "").astype("float64")),
+        "endangered": pd.read_csv(ROOT / "endangered.csv", encoding="cp949"),
+        "mbti": pd.read_csv(ROOT / "countriesMBTI_16types.csv", encoding="utf-8"),
+        "places": pd.concat([pd.read_csv(ROOT / "places.csv"), pd.read_csv(ROOT / "stations.csv")]),
+    }
+    return {name: _as_object(frame) for name, frame in frames.items()}
+
+
+def _as_object(df):
+    """문자열 컬럼·인덱스를 object dtype 으로 (pandas 2 에서 read_csv 가 돌려주는 형태)"""
+    df = df.astype({col: object for col in df.columns if pd.api.types.is_string_dtype(df[col].dtype)})
+    if pd.api.types.is_string_dtype(df.index.dtype):
+        df.index = df.index.astype(object)
+    return df
+
+
+def measure():
+    """(자식 프로세스) 데이터셋별 {'default': 바이트, 'app': 바이트, 'objects': {이름: 바이트}}"""
+    import logging
+
+    logging.disable(logging.WARNING)  # 스크립트 실행(bare mode) 경고 숨김
+
+    from shared import endangered, mbti, population, ridership, subway
+    from shared.memory import _tracked, nbytes
+
+    result = {name: {"default": nbytes(frame)} for name, frame in default_frames().items()}
+
+    subway.sync_subway_store()
+    subway.load_subway_index()
+    subway.load_subway_series()
+    population.load_population()
+    endangered.load_endangered_index()
+    mbti.load_mbti()
+    mbti.load_mbti_similarity()
+    ridership.load_poi_ridership()
+
+    for (dataset, name), ref in list(_tracked.items()):
+        obj = ref()
+        if obj is None:
+            continue
+        entry = result.setdefault(dataset, {"default": None})
+        seen = entry.setdefault("_seen", set())
+        size = nbytes(obj, seen)  # 같은 데이터셋 안에서 이미 센 객체(공유 프레임 등)는 빼고 셈
+        entry.setdefault("objects", {})[name] = size
+        entry["app"] = entry.get("app", 0) + size
+        if name.startswith(BASE_OBJECTS.get(dataset, "\0")):
+            entry["base"] = max(entry.get("base", 0), nbytes(obj))  # 여러 범위가 있으면 가장 큰 것
+    for entry in result.values():
+        entry.pop("_seen", None)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, help="bench.pages 합성 데이터 배율 (생략 시 저장소의 CSV)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(), ensure_ascii=False))
+        return
+
+    root = ROOT
+    if args.scale:
+        from bench.pages import make_sandbox
+
+        root, _ = make_sandbox(args.scale)
+    env = dict(os.environ, PYTHONPATH=str(root), APP_WARMUP="0")
+    completed = subprocess.run(
+        [sys.executable, "-m", "bench.memory", "--child"], cwd=root, env=env, capture_output=True, text=True, check=False,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr[-2000:])
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    mb = 2**20
+    print(f"{'데이터셋':<12} {'기본 dtype':>11} {'앱 데이터':>10} {'줄어든 배율':>8} {'앱 전체':>10}  객체별")
+    for dataset, entry in sorted(result.items()):
+        default, base, app = entry.get("default"), entry.get("base"), entry.get("app", 0)
+        ratio = f"{default / base:6.1f}×" if default and base else "-"
+        objects = ", ".join(f"{name} {size / mb:.2f}" for name, size in entry.get("objects", {}).items())
+        print(
+            f"{dataset:<12} {'-' if default is None else f'{default / mb:9.2f}MB':>11} "
+            f"{'-' if base is None else f'{base / mb:8.2f}MB':>10} {ratio:>8} {app / mb:8.2f}MB  {objects}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
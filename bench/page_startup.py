@@ -0,0 +1,110 @@
+"""
+페이지별 콜드 스타트(import 시간·첫 화면 표시) 벤치마크
+- 페이지마다 새 파이썬 프로세스를 `python -X importtime` 으로 띄워 streamlit.testing 의 AppTest 로 한 번 실행하고,
+  페이지 실행 중에 새로 import 된 모듈 시간(상위 모듈 누적 합계와 가장 오래 걸린 모듈)과
+  첫 화면 요소가 나오기까지 시간(first paint), 첫 실행 전체 시간, 다시 실행(rerun) 시간을 표로 보여줍니다.
+- 결과를 JSON 으로 저장해 두면 다음 측정과 비교해 콜드 스타트가 느려졌는지 확인할 수 있습니다.
+
+실행: python -m bench.page_startup [--pages pages/04_MBTI.py ...] [--top 5] [--json startup.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from shared.paths import ROOT
+
+MARKER = "-- page run start --"
+
+# 자식 프로세스에서 실행할 코드: 준비 import 를 끝낸 뒤 표시를 찍고 페이지를 실행합니다.
+DRIVER = f"""
+import json, sys, time
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.testing.v1 import AppTest
+
+first_delta = []
+_enqueue = ForwardMsgQueue.enqueue
+def enqueue(self, msg):
+    if not first_delta and msg.WhichOneof("type") == "delta":
+        first_delta.append(time.perf_counter())
+    return _enqueue(self, msg)
+ForwardMsgQueue.enqueue = enqueue
+
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+run_start = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300).run()
+first_run = time.perf_counter() - run_start
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+print(json.dumps({{
+    "first_paint_ms": (first_delta[0] - run_start) * 1000 if first_delta else float("nan"),
+    "first_run_ms": first_run * 1000,
+    "rerun_ms": rerun * 1000,
+    "exceptions": [e.message for e in at.exception],
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """MARKER 이후의 -X importtime 출력 → [(모듈, 누적 us, 최상위 여부)]"""
+    _, _, after = stderr.partition(MARKER)
+    rows = []
+    for line in after.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # 머리말 줄
+        top_level = not name[1:].startswith(" ")
+        rows.append((name.strip(), int(cumulative), top_level))
+    return rows
+
+
+def measure(page):
+    env = dict(os.environ, PYTHONPATH=str(ROOT), APP_WARMUP="0")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", DRIVER, str(page)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=False,
+    )
+    result_line = next((line for line in reversed(completed.stdout.splitlines()) if line.startswith("{")), None)
+    if result_line is None:
+        raise RuntimeError(f"{page} 실행 실패:\n{completed.stderr[-2000:]}")
+    result = json.loads(result_line)
+    imports = parse_importtime(completed.stderr)
+    result["import_ms"] = sum(us for _, us, top in imports if top) / 1000
+    result["imports"] = sorted(((name, us / 1000) for name, us, top in imports if top), key=lambda x: -x[1])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", nargs="*", help="측정할 페이지 (기본: main.py 와 pages/*.py)")
+    parser.add_argument("--top", type=int, default=3, help="페이지마다 보여줄 오래 걸린 import 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    pages = [Path(p).resolve() for p in args.pages] if args.pages else [ROOT / "main.py", *sorted((ROOT / "pages").glob("*.py"))]
+    report = {}
+    print(f"{'페이지':<28} {'import':>9} {'첫 화면':>9} {'첫 실행':>9} {'재실행':>9}  오래 걸린 import")
+    for page in pages:
+        result = measure(page)
+        report[page.name] = result
+        slowest = ", ".join(f"{name} {ms:.0f}" for name, ms in result["imports"][:args.top])
+        print(
+            f"{page.name:<28} {result['import_ms']:8.0f}ms {result['first_paint_ms']:8.0f}ms "
+            f"{result['first_run_ms']:8.0f}ms {result['rerun_ms']:8.0f}ms  {slowest}"
+        )
+        if result["exceptions"]:
+            print(f"  ⚠ 예외: {result['exceptions']}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
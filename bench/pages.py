@@ -0,0 +1,406 @@
+"""
+페이지 벤치마크 (합성 데이터 1× / 10× / 100×)
+- 배포된 CSV 를 배율만큼 키운 합성 데이터로 앱 사본(.cache/bench/x<배율>)을 만들고,
+  페이지마다 새 파이썬 프로세스에서 streamlit.testing 의 AppTest 로 실행합니다. (브라우저·네트워크 없음)
+- 첫 실행(콜드 스타트) 시간, 정해 둔 위젯 조작(SCENARIOS)마다 다시 실행(rerun) 시간, 프로세스 최대 메모리(peak RSS)를 잽니다.
+- 합성 데이터 (1× 는 배포 파일 그대로)
+  subway: 배율만큼의 달 (10× ≈ 1년, 100× ≈ 8년) — 달마다 파일 하나, 승객 수는 조금씩 흔듦
+  population: 구마다 가상 읍면동 행을 붙여 행 수를 배율만큼 (100× ≈ 전국 읍면동 수)
+  endangered / mbti / places: 행을 배율만큼 복제하고 이름·값을 조금씩 바꿈 (stations 는 그대로)
+- 페이지를 재기 전에 저장소 반영·파일 변환(디스크 캐시)을 한 번 끝내 두고 그 시간은 prepare_ms 로 따로 기록합니다.
+- 결과는 JSON 으로 저장합니다. --baseline 으로 이전 커밋의 결과를 주면 느려지거나 메모리가 늘어난 항목을 표시하고
+  종료 코드 1 을 돌려줍니다.
+
+실행: python -m bench.pages [--scales 1 10 100] [--pages 04 06] [--repeat 3] [--json pages.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from shared.paths import CACHE_DIR, ROOT
+
+BENCH_DIR = CACHE_DIR / "bench"
+
+# 앱 사본에 복사할 코드 (데이터는 합성해서 씀)
+CODE_DIRS = ["shared", "pages", "bench"]
+CODE_FILES = ["main.py", "requirements.txt"]
+
+DEFAULT_SCALES = [1, 10, 100]
+TIMEOUT_SECONDS = 600
+
+# 이전 결과 대비 이만큼 이상 커지면 느려진 것으로 표시 (작은 값은 흔들림이 커서 MIN_DELTA_MS 보다 작은 차이는 무시)
+REGRESSION_RATIO = 0.2
+MIN_DELTA_MS = 20
+
+
+# ---------------- 합성 데이터 -----------------
+def _shift_month(dates, months):
+    """YYYYMMDD 정수 배열을 months 달만큼 옮깁니다. (그 달에 없는 날짜는 NaT)"""
+    days = pd.to_datetime(dates.astype(str), format="%Y%m%d").to_numpy(dtype="datetime64[D]")
+    month = days.astype("datetime64[M]")
+    target = month + months
+    shifted = target.astype("datetime64[D]") + (days - month.astype("datetime64[D]"))
+    return pd.Series(np.where(shifted.astype("datetime64[M]") == target, shifted, np.datetime64("NaT")), index=dates.index)
+
+
+def make_subway(target, scale, rng):
+    """배포된 한 달을 기준으로 지난 scale-1 달을 만들어 달마다 subway_YYYYMM.csv 로 씁니다."""
+    shutil.copy(ROOT / "subway.csv", target / "subway.csv")
+    base = pd.read_csv(ROOT / "subway.csv", encoding="cp949")
+    counts = ["승차총승객수", "하차총승객수"]
+    rows = len(base)
+    for offset in range(1, scale):
+        dates = _shift_month(base["사용일자"], -offset)
+        keep = dates.notna().to_numpy()
+        df = base[keep].copy()
+        df["사용일자"] = dates[keep].dt.strftime("%Y%m%d").astype(int)
+        noise = rng.lognormal(0, 0.1, size=(len(df), len(counts)))
+        df[counts] = np.rint(df[counts].to_numpy() * noise).astype(np.int64)
+        df.to_csv(target / f"subway_{df['사용일자'].iloc[0] // 100}.csv", index=False, encoding="cp949")
+        rows += len(df)
+    return rows
+
+
+def make_population(target, scale, rng):
+    """구마다 가상 읍면동 행(구 인구를 무작위 비율로 나눔)을 붙여 행 수를 약 scale 배로 만듭니다."""
+    if scale == 1:
+        shutil.copy(ROOT / "population.csv", target / "population.csv")
+        return sum(1 for _ in open(ROOT / "population.csv", encoding="utf-8")) - 1
+    base = pd.read_csv(ROOT / "population.csv", dtype=str)
+    values = base.columns[1:]
+    numbers = base[values].apply(lambda col: col.str.replace(",", "").astype(np.int64)).to_numpy()
+    is_gu = base["행정구역"].str.split().str.len() > 2
+    n_dongs = (len(base) * scale - len(base)) // max(1, int(is_gu.sum()))
+
+    rows = [base]
+    for i in np.flatnonzero(is_gu.to_numpy()):
+        name, code = base["행정구역"].iloc[i].rsplit(" (", 1)
+        share = rng.dirichlet(np.ones(n_dongs))
+        dongs = np.rint(share[:, None] * numbers[i]).astype(np.int64)
+        names = [f"{name} 가상{j + 1}동 ({code[:5]}{j + 1:03d}00)" for j in range(n_dongs)]
+        block = pd.DataFrame(dongs, columns=values).map(lambda v: f"{v:,}")
+        block.insert(0, "행정구역", names)
+        rows.append(block)
+    df = pd.concat(rows, ignore_index=True)
+    df.to_csv(target / "population.csv", index=False, encoding="utf-8")
+    return len(df)
+
+
+def make_endangered(target, scale, rng):
+    base = pd.read_csv(ROOT / "endangered.csv", encoding="cp949", dtype=str)
+    copies = [base]
+    for i in range(1, scale):
+        copy = base.copy()
+        copy["국명"] = copy["국명"] + f" {i}"
+        copy["학명"] = copy["학명"] + f" var. {i}"
+        copies.append(copy)
+    df = pd.concat(copies, ignore_index=True)
+    df.to_csv(target / "endangered.csv", index=False, encoding="cp949")
+    return len(df)
+
+
+def make_mbti(target, scale, rng):
+    base = pd.read_csv(ROOT / "countriesMBTI_16types.csv", encoding="utf-8")
+    types = base.columns[1:]
+    copies = [base]
+    for i in range(1, scale):
+        copy = base.copy()
+        copy["Country"] = copy["Country"] + f" {i + 1}"
+        shares = copy[types].to_numpy() * rng.lognormal(0, 0.1, size=(len(copy), len(types)))
+        copy[types] = shares / shares.sum(axis=1, keepdims=True)
+        copies.append(copy)
+    df = pd.concat(copies, ignore_index=True)
+    df.to_csv(target / "countriesMBTI_16types.csv", index=False, encoding="utf-8")
+    return len(df)
+
+
+def make_places(target, scale, rng):
+    base = pd.read_csv(ROOT / "places.csv", encoding="utf-8")
+    copies = [base]
+    for i in range(1, scale):
+        copy = base.copy()
+        copy["name"] = copy["name"] + f" #{i + 1}"
+        copy["lat"] = copy["lat"] + rng.uniform(-0.03, 0.03, len(copy))
+        copy["lon"] = copy["lon"] + rng.uniform(-0.03, 0.03, len(copy))
+        copies.append(copy)
+    df = pd.concat(copies, ignore_index=True)
+    df["rank"] = np.arange(1, len(df) + 1)
+    df.to_csv(target / "places.csv", index=False, encoding="utf-8")
+    shutil.copy(ROOT / "stations.csv", target / "stations.csv")
+    return len(df)
+
+
+GENERATORS = {
+    "subway": make_subway,
+    "population": make_population,
+    "endangered": make_endangered,
+    "mbti": make_mbti,
+    "places": make_places,
+}
+
+
+def make_sandbox(scale, seed=0, fresh=False):
+    """
+    scale 배 합성 데이터와 현재 코드로 앱 사본을 만듭니다. 코드는 매번 새로 복사하고,
+    데이터는 없을 때(또는 fresh)만 만듭니다. → (사본 폴더, 데이터셋별 행 수)
+    """
+    target = BENCH_DIR / f"x{scale}"
+    if fresh and target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True, exist_ok=True)
+    for name in CODE_DIRS:
+        shutil.rmtree(target / name, ignore_errors=True)
+        shutil.copytree(ROOT / name, target / name, ignore=shutil.ignore_patterns("__pycache__"))
+    for name in CODE_FILES:
+        shutil.copy(ROOT / name, target / name)
+
+    rows_file = target / "rows.json"
+    if not rows_file.exists():
+        rng = np.random.default_rng(seed)
+        rows = {name: make(target, scale, rng) for name, make in GENERATORS.items()}
+        rows_file.write_text(json.dumps(rows), encoding="utf-8")
+    return target, json.loads(rows_file.read_text(encoding="utf-8"))
+
+
+# ---------------- 위젯 조작 시나리오 -----------------
+def _find(elements, label):
+    return next(element for element in elements if element.label == label)
+
+
+SCENARIOS = {
+    "03": [
+        ("관광지 개수 최대", lambda at: _find(at.slider, "표시할 관광지 개수").set_value(_find(at.slider, "표시할 관광지 개수").max)),
+        ("지도 높이", lambda at: _find(at.slider, "지도 높이 (px)").set_value(800)),
+        ("관광지 개수 3", lambda at: _find(at.slider, "표시할 관광지 개수").set_value(3)),
+    ],
+    "04": [
+        ("유형 변경", lambda at: _find(at.selectbox, "MBTI 유형을 선택하세요:").select("ENTJ")),
+        ("국가 수 최대", lambda at: _find(at.slider, "막대로 표시할 국가 수 (나머지는 평균 막대 하나로)").set_value(
+            _find(at.slider, "막대로 표시할 국가 수 (나머지는 평균 막대 하나로)").max)),
+        ("여러 유형 비교", lambda at: _find(at.radio, "보기 방식").set_value("여러 유형 비교")),
+        ("비교 유형 추가", lambda at: _find(at.multiselect, "비교할 MBTI 유형을 선택하세요:").select("ISTJ")),
+        ("비슷한 나라", lambda at: _find(at.radio, "보기 방식").set_value("비슷한 나라")),
+        ("거리 기준 변경", lambda at: _find(at.radio, "거리 기준").set_value("cosine")),
+    ],
+    "05": [
+        ("저장된 파일 불러오기", lambda at: _find(at.button, "저장된 population.csv 불러오기").click()),
+        ("하위 행정구역", lambda at: _find(at.selectbox, "하위 행정구역 선택 (1단계 아래)").select_index(1)),
+        ("연령대 변경", lambda at: _find(at.selectbox, "연령대를 선택하세요").select("30대")),
+        ("비율로 보기", lambda at: _find(at.checkbox, "전체 인구 대비 비율(%)로 순위 보기").check()),
+    ],
+    "06": [
+        ("첫 달 선택", lambda at: _find(at.selectbox, "🗓 월 선택").select_index(0)),
+        ("전체 호선", lambda at: _find(at.selectbox, "🚉 호선 선택").select_index(0)),
+        ("표시 역 수 최대", lambda at: _find(at.slider, "📏 그래프에 표시할 역 수 (나머지는 '기타'로 합침)").set_value(60)),
+        ("기간 추이", lambda at: _find(at.radio, "보기 방식").set_value("기간 추이")),
+        ("노선 단위", lambda at: _find(at.radio, "단위").set_value("노선")),
+        ("역 단위", lambda at: _find(at.radio, "단위").set_value("역")),
+    ],
+    "07": [
+        ("등급 하나", lambda at: at.sidebar.multiselect[0].set_value(at.sidebar.multiselect[0].options[:1])),
+        ("등급 전체", lambda at: at.sidebar.multiselect[0].set_value(at.sidebar.multiselect[0].options)),
+        ("분류군 하나", lambda at: at.main.multiselect[0].set_value(at.main.multiselect[0].options[:1])),
+    ],
+}
+SCENARIOS["08"] = SCENARIOS["07"]
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)  # Linux 는 KB, macOS 는 바이트
+
+
+def run_page(page):
+    """(자식 프로세스) 페이지 한 개를 첫 실행 + 시나리오대로 조작하며 잰 결과 dict"""
+    from streamlit.testing.v1 import AppTest
+
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    at = AppTest.from_file(str(Path(page).resolve()), default_timeout=TIMEOUT_SECONDS).run()
+    cold = time.perf_counter() - start
+    exceptions = [e.message for e in at.exception]
+
+    reruns = []
+    for label, action in SCENARIOS.get(Path(page).name[:2], []):
+        if exceptions:
+            break
+        try:
+            action(at)
+        except (StopIteration, IndexError, ValueError) as e:
+            reruns.append({"action": label, "ms": None, "error": f"위젯을 찾지 못함: {e!r}"})
+            continue
+        start = time.perf_counter()
+        at.run()
+        reruns.append({"action": label, "ms": (time.perf_counter() - start) * 1000})
+        exceptions = [e.message for e in at.exception]
+    start = time.perf_counter()
+    at.run()  # 아무것도 바꾸지 않은 재실행
+    idle = time.perf_counter() - start
+
+    return {
+        "cold_ms": cold * 1000,
+        "idle_rerun_ms": idle * 1000,
+        "reruns": reruns,
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": _peak_rss_mb(),
+        "exceptions": exceptions,
+    }
+
+
+PREPARE = """
+import time
+start = time.perf_counter()
+from shared import endangered, mbti, places, population, subway
+subway.sync_subway_store()
+subway.load_subway_index(months=subway.subway_months()[-1:])
+endangered.load_endangered_index()
+mbti.load_mbti()
+places.load_places()
+population.load_population()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _child(sandbox, args):
+    env = dict(os.environ, PYTHONPATH=str(sandbox), APP_WARMUP="0", APP_PROFILE="0")
+    completed = subprocess.run(
+        [sys.executable, *args], cwd=sandbox, env=env, capture_output=True, text=True, check=False,
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(f"{' '.join(args[-2:])} 실행 실패:\n{completed.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def measure(sandbox, page, repeat=1):
+    """페이지를 새 프로세스에서 repeat 번 실행해 각 값의 중앙값(조작별 rerun 포함)을 돌려줍니다."""
+    runs = [_child(sandbox, ["-m", "bench.pages", "--child", page]) for _ in range(repeat)]
+    result = dict(runs[-1])
+    for key in ["cold_ms", "idle_rerun_ms", "rss_before_mb", "peak_rss_mb"]:
+        result[key] = statistics.median(run[key] for run in runs)
+    for i, rerun in enumerate(result["reruns"]):
+        times = [run["reruns"][i]["ms"] for run in runs if i < len(run["reruns"]) and run["reruns"][i]["ms"] is not None]
+        rerun["ms"] = statistics.median(times) if times else None
+    times = [rerun["ms"] for rerun in result["reruns"] if rerun["ms"] is not None]
+    result["rerun_p50_ms"] = statistics.median(times) if times else None
+    result["rerun_max_ms"] = max(times) if times else None
+    return result
+
+
+# ---------------- 결과 비교 -----------------
+def flatten(report):
+    """결과 JSON → {'x10/06_지하철분석.py/cold_ms': 값, ...} (비교할 숫자만)"""
+    flat = {}
+    for scale, result in report["results"].items():
+        flat[f"{scale}/prepare_ms"] = result["prepare_ms"]
+        for page, page_result in result["pages"].items():
+            if "error" in page_result:
+                continue
+            for key in ["cold_ms", "idle_rerun_ms", "rerun_p50_ms", "rerun_max_ms", "peak_rss_mb"]:
+                flat[f"{scale}/{page}/{key}"] = page_result[key]
+            for rerun in page_result["reruns"]:
+                flat[f"{scale}/{page}/rerun:{rerun['action']}"] = rerun["ms"]
+    return {key: value for key, value in flat.items() if value is not None}
+
+
+def compare(report, baseline, ratio=REGRESSION_RATIO):
+    """baseline 보다 ratio 이상 커진 항목 [(이름, 이전, 현재)] (시간은 MIN_DELTA_MS 미만 차이 무시)"""
+    old, new = flatten(baseline), flatten(report)
+    worse = []
+    for key, value in new.items():
+        before = old.get(key)
+        if before is None or before <= 0:
+            continue
+        if value > before * (1 + ratio) and (key.endswith("_mb") or value - before >= MIN_DELTA_MS):
+            worse.append((key, before, value))
+    return worse
+
+
+def _git_commit():
+    completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return completed.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", nargs="*", type=int, default=DEFAULT_SCALES, help="데이터 배율 (기본: 1 10 100)")
+    parser.add_argument("--pages", nargs="*", help="측정할 페이지 (파일 이름 앞부분, 예: 04 06 — 기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=1, help="페이지마다 새 프로세스로 실행할 횟수 (중앙값 사용)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 seed")
+    parser.add_argument("--fresh", action="store_true", help="합성 데이터와 디스크 캐시를 새로 만들기")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_page(args.child), ensure_ascii=False))
+        return 0
+
+    pages = sorted(p.name for p in (ROOT / "pages").glob("*.py"))
+    if args.pages:
+        pages = [page for page in pages if any(page.startswith(prefix) for prefix in args.pages)]
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for scale in args.scales:
+        sandbox, rows = make_sandbox(scale, seed=args.seed, fresh=args.fresh)
+        prepare_ms = _child(sandbox, ["-c", PREPARE])
+        print(f"\n[x{scale}] 행 수 {rows} · 준비 {prepare_ms:,.0f}ms")
+        print(f"{'페이지':<24} {'첫 실행':>9} {'재실행 p50':>10} {'재실행 max':>10} {'peak RSS':>9}")
+        result = report["results"][f"x{scale}"] = {"rows": rows, "prepare_ms": prepare_ms, "pages": {}}
+        for page in pages:
+            try:
+                page_result = result["pages"][page] = measure(sandbox, f"pages/{page}", args.repeat)
+            except RuntimeError as e:
+                result["pages"][page] = {"error": str(e)}
+                print(f"{page:<24} ⚠ {str(e).splitlines()[-1]}")
+                continue
+            p50, worst = page_result["rerun_p50_ms"], page_result["rerun_max_ms"]
+            print(
+                f"{page:<24} {page_result['cold_ms']:8.0f}ms "
+                f"{'-' if p50 is None else f'{p50:,.0f}ms':>10} {'-' if worst is None else f'{worst:,.0f}ms':>10} "
+                f"{page_result['peak_rss_mb']:7.0f}MB"
+            )
+            for rerun in page_result["reruns"]:
+                if rerun.get("error"):
+                    print(f"  ⚠ {rerun['action']}: {rerun['error']}")
+            if page_result["exceptions"]:
+                print(f"  ⚠ 예외: {page_result['exceptions']}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        worse = compare(report, baseline)
+        print(f"\n이전 결과({baseline['meta'].get('commit')}) 대비 {REGRESSION_RATIO:.0%} 이상 나빠진 항목: {len(worse)}개")
+        for key, before, value in worse:
+            print(f"  {key}: {before:,.1f} → {value:,.1f}")
+        return 1 if worse else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
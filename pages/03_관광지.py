@@ -1,8 +1,18 @@
 # app.py
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
-from folium.plugins import MarkerCluster
+
+from shared.figures import cached_figure
+from shared.lazy import go, lazy
+from shared.profiling import begin_page, span
+from shared.warmup import start_warmup
+
+# folium·pandas 등은 지도/데이터를 처음 쓸 때 불러옵니다.
+charts = lazy("shared.charts")
+folium_map = lazy("shared.folium_map")
+places_data = lazy("shared.places")
+places_index = lazy("shared.places_index")
+ridership_data = lazy("shared.ridership")
+tourist_map = lazy("shared.tourist_map")
 
 # ------------------------------------------------
 # 기본 설정
@@ -13,164 +23,57 @@ st.markdown("""
 서울을 방문하는 외국인들이 가장 많이 찾는 명소들을 **Folium 지도**로 시각화했습니다.  
 지도에서 관광지를 클릭하면 하단에 자세한 정보가 표시됩니다.
 """)
+start_warmup()
+begin_page("03_관광지")
 
 # ------------------------------------------------
-# 데이터 정의
+# 데이터 불러오기 (places.csv, 역 좌표 stations.csv)
 # ------------------------------------------------
-places = [
-    {
-        "rank": 1,
-        "name": "Gyeongbokgung Palace (경복궁)",
-        "lat": 37.579617, "lon": 126.977041,
-        "desc": "조선의 법궁으로, 근정전과 경회루 등 고궁 건축의 정수를 보여줍니다.",
-        "reason": "한국 전통 궁궐 문화와 역사를 대표하며, 외국인들이 한복 체험과 함께 즐겨 방문합니다.",
-        "station": "경복궁역 (3호선)",
-        "url": "https://en.wikipedia.org/wiki/Gyeongbokgung"
-    },
-    {
-        "rank": 2,
-        "name": "Bukchon Hanok Village (북촌한옥마을)",
-        "lat": 37.582604, "lon": 126.983029,
-        "desc": "조선시대 양반가 한옥이 보존된 전통마을입니다.",
-        "reason": "전통 한옥 거리와 함께 인스타그램 인기 명소로 알려져 있습니다.",
-        "station": "안국역 (3호선)",
-        "url": "https://en.wikipedia.org/wiki/Bukchon_Hanok_Village"
-    },
-    {
-        "rank": 3,
-        "name": "Myeongdong (명동 쇼핑거리)",
-        "lat": 37.563756, "lon": 126.982389,
-        "desc": "서울의 대표적인 쇼핑 거리로 화장품, 의류, 음식이 가득합니다.",
-        "reason": "한류 화장품 브랜드와 길거리 음식으로 외국인 쇼핑 명소로 유명합니다.",
-        "station": "명동역 (4호선)",
-        "url": "https://en.wikipedia.org/wiki/Myeongdong"
-    },
-    {
-        "rank": 4,
-        "name": "N Seoul Tower (N서울타워)",
-        "lat": 37.5511694, "lon": 126.9882266,
-        "desc": "남산 정상에 위치한 서울의 랜드마크 전망탑입니다.",
-        "reason": "서울 전경을 한눈에 볼 수 있고 ‘사랑의 자물쇠’ 명소로 유명합니다.",
-        "station": "명동역 (4호선) / 충무로역 (3·4호선)",
-        "url": "https://en.wikipedia.org/wiki/N_Seoul_Tower"
-    },
-    {
-        "rank": 5,
-        "name": "Hongdae (홍대)",
-        "lat": 37.556230, "lon": 126.923587,
-        "desc": "홍익대학교 인근 예술 거리로 젊음과 자유분위기로 가득합니다.",
-        "reason": "라이브 클럽, 스트리트 공연, 개성 있는 카페 문화로 외국인에게 인기입니다.",
-        "station": "홍대입구역 (2호선·공항철도)",
-        "url": "https://en.wikipedia.org/wiki/Hongdae"
-    },
-    {
-        "rank": 6,
-        "name": "Insadong (인사동)",
-        "lat": 37.574025, "lon": 126.986152,
-        "desc": "전통 찻집, 공예품점이 많은 한국문화 거리입니다.",
-        "reason": "전통과 현대가 공존하며, 외국인들이 한국적인 기념품을 구매하기 좋습니다.",
-        "station": "안국역 (3호선)",
-        "url": "https://en.wikipedia.org/wiki/Insadong"
-    },
-    {
-        "rank": 7,
-        "name": "Dongdaemun Design Plaza (DDP)",
-        "lat": 37.566295, "lon": 127.009121,
-        "desc": "자하 하디드가 설계한 미래형 디자인 랜드마크입니다.",
-        "reason": "패션쇼, 전시, 야경 명소로 외국인 사진 명소로도 인기가 많습니다.",
-        "station": "동대문역사문화공원역 (2·4·5호선)",
-        "url": "https://en.wikipedia.org/wiki/Dongdaemun_Design_Plaza"
-    },
-    {
-        "rank": 8,
-        "name": "Lotte World Tower (롯데월드타워)",
-        "lat": 37.513078, "lon": 127.102663,
-        "desc": "123층 초고층 건물로 서울 스카이 전망대가 유명합니다.",
-        "reason": "세계 5위 높이의 타워로 서울의 스카이라인을 대표합니다.",
-        "station": "잠실역 (2호선·8호선)",
-        "url": "https://en.wikipedia.org/wiki/Lotte_World_Tower"
-    },
-    {
-        "rank": 9,
-        "name": "Changdeokgung Palace (창덕궁)",
-        "lat": 37.579517, "lon": 126.991024,
-        "desc": "유네스코 세계유산으로 지정된 아름다운 궁궐입니다.",
-        "reason": "자연과 조화된 후원(비원)으로 유명하며 외국인 가이드 투어 명소입니다.",
-        "station": "안국역 (3호선)",
-        "url": "https://en.wikipedia.org/wiki/Changdeokgung"
-    },
-    {
-        "rank": 10,
-        "name": "Itaewon (이태원)",
-        "lat": 37.534866, "lon": 126.994750,
-        "desc": "다국적 문화가 공존하는 서울의 대표 외국인 거리입니다.",
-        "reason": "세계 각국의 음식과 바, 클럽으로 외국인 친화적인 분위기입니다.",
-        "station": "이태원역 (6호선)",
-        "url": "https://en.wikipedia.org/wiki/Itaewon"
-    },
-]
+try:
+    with span("load", "places"):
+        places = places_data.load_places()
+except (OSError, ValueError) as e:
+    st.error(f"❌ 관광지 데이터를 불러오지 못했습니다: {e}")
+    st.stop()
+
+# 관광지별 지하철 승하차 인원 (승하차 데이터가 없으면 건너뜀)
+try:
+    with span("load", "poi_ridership"):
+        ridership = ridership_data.load_poi_ridership()
+except (OSError, ValueError):
+    ridership = None
 
 # ------------------------------------------------
 # 사이드바 옵션
 # ------------------------------------------------
 st.sidebar.header("🗺 지도 옵션")
-max_display = st.sidebar.slider("표시할 관광지 개수", 3, len(places), 10)
+max_display = st.sidebar.slider("표시할 관광지 개수", 3, len(places), min(10, len(places)))
 map_height = st.sidebar.slider("지도 높이 (px)", 400, 1000, 650)
 
 # ------------------------------------------------
-# 지도 생성
+# 지도 생성 / 출력
+# - 기본 지도는 데이터 버전마다 한 번만 렌더링 (높이 슬라이더만 바꾸면 다시 만들지 않음)
+# - 마커는 현재 지도 범위(격자 칸 단위로 넓힌 범위) 안의 상위 관광지만 레이어로 보냄
 # ------------------------------------------------
-m = folium.Map(location=[37.5665, 126.9780], zoom_start=12, control_scale=True)
-cluster = MarkerCluster().add_to(m)
-
-def marker_icon_html(rank):
-    colors = ["#E63946", "#F4A261", "#2A9D8F", "#1D3557", "#8ECAE6"]
-    color = colors[(rank - 1) % len(colors)]
-    return f"""
-    <div style="
-        width:36px; height:36px; line-height:36px;
-        border-radius:18px;
-        background:{color};
-        color:white; font-weight:bold; text-align:center;
-        font-size:16px; box-shadow:0 0 5px rgba(0,0,0,0.4);
-        ">{rank}</div>
-    """
-
-# 마커 추가
-for p in places[:max_display]:
-    popup_html = f"<b>{p['rank']}. {p['name']}</b>"
-    folium.Marker(
-        location=[p["lat"], p["lon"]],
-        popup=popup_html,
-        tooltip=p["name"],
-        icon=folium.DivIcon(html=marker_icon_html(p["rank"]))
-    ).add_to(cluster)
+def marker_layer(bounds):
+    with span("transform", "places.within"):
+        box = places_index.snap_box(bounds, places.grid.cell)
+        visible = places.within(box, limit=max_display)
+    ridership_version = ridership.version if ridership is not None else None
+    return (max_display, box, ridership_version), lambda: tourist_map.build_marker_layer(visible, ridership)
 
-# 타일 추가
-folium.TileLayer("OpenStreetMap").add_to(m)
-folium.TileLayer(
-    tiles="https://stamen-tiles.a.ssl.fastly.net/terrain/{z}/{x}/{y}.jpg",
-    attr="Map tiles by Stamen Design (CC BY 3.0) — Data © OpenStreetMap contributors",
-    name="Stamen Terrain"
-).add_to(m)
-folium.LayerControl().add_to(m)
-
-# ------------------------------------------------
-# Streamlit 지도 출력
-# ------------------------------------------------
 st.markdown("### 🗺 관광지 지도 (마커를 클릭해보세요)")
-map_data = st_folium(m, width="100%", height=map_height)
+map_data = folium_map.show_map(
+    "tourist", places.version, None, tourist_map.build_base_map,
+    height=map_height, width="100%", layer=marker_layer,
+)
 
 # ------------------------------------------------
-# 마커 클릭 시 하단 정보 표시
+# 마커 클릭 시 하단 정보 표시 (툴팁 = 관광지 이름 → 사전에서 바로 찾기)
 # ------------------------------------------------
 clicked_info = None
-if map_data and map_data.get("last_object_clicked_popup"):
-    clicked_text = map_data["last_object_clicked_popup"]
-    for p in places:
-        if p["name"] in clicked_text:
-            clicked_info = p
-            break
+if map_data and map_data.get("last_object_clicked_tooltip"):
+    clicked_info = places.get(map_data["last_object_clicked_tooltip"].strip())
 
 st.markdown("---")
 if clicked_info:
@@ -178,7 +81,27 @@ if clicked_info:
     st.markdown(f"🏛 {clicked_info['desc']}")
     st.markdown(f"⭐ {clicked_info['reason']}")
     st.markdown(f"🚇 가장 가까운 지하철역: **{clicked_info['station']}**")
+    if clicked_info.get("nearest_station"):
+        st.caption(f"좌표 기준 가장 가까운 역: {clicked_info['nearest_station']}역 (약 {clicked_info['nearest_station_m']:,.0f} m)")
     st.markdown(f"[🔗 자세히 보기]({clicked_info['url']})")
+
+    series = ridership.series(clicked_info["name"]) if ridership is not None else None
+    if series is not None:
+        def build_ridership_figure():
+            # 기간이 길어져도 점 수를 제한하고 WebGL 로 그립니다.
+            fig = go.Figure(charts.time_series_trace(
+                series.index, series.to_numpy(), mode="lines+markers" if len(series) <= 62 else "lines",
+            ))
+            fig.update_layout(
+                title=f"🚇 {', '.join(ridership.stations[clicked_info['name']])}역 일별 승하차 인원",
+                xaxis_title="날짜", yaxis_title="승하차 인원",
+                template="plotly_white", height=320,
+            )
+            return fig
+
+        fig = cached_figure("tourist_ridership", ridership.version, clicked_info["name"], build_ridership_figure)
+        with span("render", "tourist_ridership"):
+            st.plotly_chart(fig, use_container_width=True)
 else:
     st.info("👆 지도의 마커를 클릭하면 해당 관광지의 상세 설명이 여기에 표시됩니다.")
 
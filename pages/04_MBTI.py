@@ -6,8 +6,16 @@ MBTI Type by Country Visualizer
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
+
+from shared.figures import cached_figure
+from shared.lazy import go, lazy
+from shared.profiling import begin_page, span
+from shared.warmup import start_warmup
+
+# numpy·pandas 를 쓰는 데이터 모듈은 처음 쓸 때 불러옵니다.
+mbti = lazy("shared.mbti")
+mbti_matrix = lazy("shared.mbti_matrix")
+mbti_similarity = lazy("shared.mbti_similarity")
 
 # -----------------------------
 # Streamlit 기본 설정
@@ -15,70 +23,207 @@ import plotly.graph_objects as go
 st.set_page_config(page_title="MBTI Type by Country", layout="wide")
 st.title("🌍 MBTI Type by Country Visualizer")
 st.markdown("**MBTI 유형을 선택하면 전 세계 국가별 비율을 비교할 수 있습니다.**")
+start_warmup()
+begin_page("04_MBTI")
 
 # -----------------------------
-# 데이터 불러오기
+# 데이터 불러오기 (유형별 순위·라벨·색상은 읽을 때 한 번만 계산)
 # -----------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_csv("countriesMBTI_16types.csv")
-    df.columns = [c.strip() for c in df.columns]
-    return df
+with span("load", "mbti"):
+    matrix = mbti.load_mbti()
 
-df = load_data()
+mbti_types = matrix.types
+mode = st.radio("보기 방식", ["단일 유형", "여러 유형 비교", "비슷한 나라"], horizontal=True)
 
-# -----------------------------
-# MBTI 유형 선택
-# -----------------------------
-mbti_types = [col for col in df.columns if col != "Country"]
-selected_type = st.selectbox("MBTI 유형을 선택하세요:", mbti_types, index=mbti_types.index("INFP") if "INFP" in mbti_types else 0)
+if mode == "단일 유형":
+    # -----------------------------
+    # MBTI 유형 선택
+    # -----------------------------
+    selected_type = st.selectbox("MBTI 유형을 선택하세요:", mbti_types, index=mbti_types.index("INFP") if "INFP" in mbti_types else 0)
+    show_n = st.slider("막대로 표시할 국가 수 (나머지는 평균 막대 하나로)", 10, len(matrix), min(40, len(matrix)))
 
-# -----------------------------
-# 선택된 유형 기준으로 정렬
-# -----------------------------
-df_sorted = df.sort_values(by=selected_type, ascending=False).reset_index(drop=True)
+    def build_figure():
+        # 미리 정렬해 둔 순서로 상위 국가(+ 한국)의 비율·라벨·색상을 모으고, 나머지는 평균 막대 하나로 합칩니다.
+        countries, values, labels, colors, others, n_others = matrix.ranked_top(selected_type, show_n)
+        if others is not None:
+            countries = [*countries, f"나머지 {n_others}개국 평균"]
+            values = [*values, others]
+            labels = [*labels, f"{others:.3f}"]
+            colors = [*colors, mbti_matrix.OTHER_COLOR]
 
-# -----------------------------
-# 색상 설정
-# -----------------------------
-colors = []
-max_country = df_sorted.loc[0, "Country"]
-
-for country in df_sorted["Country"]:
-    if country.lower() in ["south korea", "korea, republic of", "korea"]:
-        colors.append("rgba(0, 102, 255, 0.9)")  # 한국: 파란색
-    elif country == max_country:
-        colors.append("rgba(255, 215, 0, 1)")    # 1등: 노랑색
+        # -----------------------------
+        # Plotly 그래프 생성
+        # -----------------------------
+        fig = go.Figure(
+            data=[
+                go.Bar(
+                    x=countries,
+                    y=values,
+                    marker_color=colors,
+                    text=labels,
+                    textposition="outside",
+                    hovertemplate="국가: %{x}<br>비율: %{y:.3f}<extra></extra>",
+                )
+            ]
+        )
+
+        fig.update_layout(
+            title=f"🌐 {selected_type} 비율이 높은 국가 순위",
+            xaxis_title="국가",
+            yaxis_title="비율",
+            template="plotly_white",
+            height=650,
+            showlegend=False,
+            xaxis_tickangle=-45,
+        )
+        return fig
+
+    # 같은 데이터·유형이면 이전에 만든 그래프를 재사용
+    fig = cached_figure("mbti", matrix.version, (selected_type, show_n), build_figure)
+
+    with span("render", "mbti"):
+        st.plotly_chart(fig, use_container_width=True)
+
+elif mode == "여러 유형 비교":
+    # -----------------------------
+    # 여러 유형 비교 (같은 행렬에서 열만 골라 사용)
+    # -----------------------------
+    default_types = [t for t in ["INFP", "ENFP", "INFJ", "ISFJ"] if t in mbti_types] or mbti_types[:2]
+    compare_types = st.multiselect("비교할 MBTI 유형을 선택하세요:", mbti_types, default=default_types)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        top_n = st.slider("표시할 국가 수", 5, len(matrix), min(20, len(matrix)))
+    with col2:
+        barmode = st.radio("막대 모양", ["누적", "묶음"], horizontal=True)
+    with col3:
+        sort_by = st.selectbox("정렬 기준", ["선택 유형 합계"] + compare_types)
+
+    if not compare_types:
+        st.info("비교할 유형을 하나 이상 선택하세요.")
     else:
-        colors.append("rgba(150,150,150,0.6)")   # 나머지: 회색
+        def build_compare_figure():
+            table = matrix.compare(
+                compare_types, top_n=top_n, sort_by=None if sort_by == "선택 유형 합계" else sort_by
+            )
+            fig = go.Figure(
+                data=[
+                    go.Bar(
+                        name=mbti_type,
+                        x=table.index,
+                        y=table[mbti_type],
+                        hovertemplate=f"국가: %{{x}}<br>{mbti_type}: %{{y:.3f}}<extra></extra>",
+                    )
+                    for mbti_type in compare_types
+                ]
+            )
+            fig.update_layout(
+                title=f"🌐 {', '.join(compare_types)} 비율 비교 (상위 {top_n}개국)",
+                xaxis_title="국가",
+                yaxis_title="비율",
+                barmode="stack" if barmode == "누적" else "group",
+                template="plotly_white",
+                height=650,
+                xaxis_tickangle=-45,
+            )
+            return fig
 
-# -----------------------------
-# Plotly 그래프 생성
-# -----------------------------
-fig = go.Figure(
-    data=[
-        go.Bar(
-            x=df_sorted["Country"],
-            y=df_sorted[selected_type],
-            marker_color=colors,
-            text=[f"{v:.3f}" for v in df_sorted[selected_type]],
-            textposition="outside",
-            hovertemplate="국가: %{x}<br>비율: %{y:.3f}<extra></extra>",
+        fig = cached_figure(
+            "mbti_compare",
+            matrix.version,
+            {"types": compare_types, "top_n": top_n, "barmode": barmode, "sort_by": sort_by},
+            build_compare_figure,
+        )
+        with span("render", "mbti_compare"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    # -----------------------------
+    # 국가별 16유형 분포
+    # -----------------------------
+    countries = list(matrix.countries)
+    korea = [c for c, is_korea in zip(countries, matrix.korea) if is_korea]
+    selected_country = st.selectbox(
+        "유형 분포를 볼 국가를 선택하세요:", countries, index=countries.index(korea[0]) if korea else 0
+    )
+
+    def build_profile_figure():
+        profile = matrix.profile(selected_country)
+        fig = go.Figure(
+            data=[
+                go.Bar(
+                    x=mbti_types,
+                    y=profile,
+                    text=matrix.labels(selected_country),
+                    textposition="outside",
+                    hovertemplate="유형: %{x}<br>비율: %{y:.3f}<extra></extra>",
+                )
+            ]
+        )
+        fig.update_layout(
+            title=f"🧭 {selected_country} 의 MBTI 유형 분포",
+            xaxis_title="MBTI 유형",
+            yaxis_title="비율",
+            template="plotly_white",
+            height=450,
+            showlegend=False,
+        )
+        return fig
+
+    fig = cached_figure("mbti_profile", matrix.version, selected_country, build_profile_figure)
+    with span("render", "mbti_profile"):
+        st.plotly_chart(fig, use_container_width=True)
+
+else:
+    # -----------------------------
+    # 유형 분포가 비슷한 나라 / 같은 군집 (거리·군집은 데이터 버전마다 한 번만 계산)
+    # -----------------------------
+    with span("load", "mbti_similarity"):
+        similarity = mbti.load_mbti_similarity()
+    countries = list(matrix.countries)
+    korea = [c for c, is_korea in zip(countries, matrix.korea) if is_korea]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        base_country = st.selectbox("기준 국가", countries, index=countries.index(korea[0]) if korea else 0)
+    with col2:
+        metrics = mbti_similarity.METRICS
+        metric = st.radio("거리 기준", list(metrics), format_func=metrics.get, horizontal=True)
+    with col3:
+        top_k = st.slider("비슷한 나라 수", 3, 20, 10)
+
+    with span("transform", "mbti.most_similar"):
+        similar = similarity.most_similar(base_country, k=top_k, metric=metric)
+
+    def build_similar_figure():
+        fig = go.Figure(
+            data=[
+                go.Bar(
+                    x=similar["거리"],
+                    y=similar["Country"],
+                    orientation="h",
+                    hovertemplate="국가: %{y}<br>거리: %{x:.4f}<extra></extra>",
+                )
+            ]
         )
-    ]
-)
-
-fig.update_layout(
-    title=f"🌐 {selected_type} 비율이 높은 국가 순위",
-    xaxis_title="국가",
-    yaxis_title="비율",
-    template="plotly_white",
-    height=650,
-    showlegend=False,
-    xaxis_tickangle=-45,
-)
-
-st.plotly_chart(fig, use_container_width=True)
+        fig.update_layout(
+            title=f"🤝 {base_country} 와 MBTI 분포가 비슷한 나라 ({metrics[metric]} 거리)",
+            xaxis_title="거리 (작을수록 비슷함)",
+            yaxis=dict(autorange="reversed"),
+            template="plotly_white",
+            height=450,
+            showlegend=False,
+        )
+        return fig
+
+    fig = cached_figure("mbti_similar", similarity.version, (base_country, metric, top_k), build_similar_figure)
+    with span("render", "mbti_similar"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    cluster_methods = mbti_similarity.CLUSTER_METHODS
+    methods = [m for m in cluster_methods if m in similarity.clusters]
+    method = st.radio("군집 방법", methods, format_func=cluster_methods.get, horizontal=True)
+    with span("transform", "mbti.cluster_of"):
+        members = similarity.cluster_of(base_country, method=method)
+    st.markdown(f"**{base_country}** 와 같은 군집의 나라 ({len(members)}개국)")
+    st.write(", ".join(members))
 
 # -----------------------------
 # 데이터 테이블 표시
@@ -1,80 +1,63 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import re
-from io import StringIO
-import numpy as np
+
+from shared.figures import cached_figure
+from shared.lazy import go, lazy
+from shared.profiling import begin_page, span
+from shared.warmup import start_warmup
+
+# pandas·pyarrow 를 쓰는 데이터 모듈은 처음 쓸 때 불러옵니다.
+population = lazy("shared.population")
+regions = lazy("shared.regions")
 
 st.set_page_config(page_title="행정구역별 연령 인구 분석", layout="wide")
 
 st.title("📊 행정구역별 인구 데이터 분석 대시보드")
+start_warmup()
+begin_page("05_인구통계")
 
 # 파일 업로드
 uploaded_file = st.file_uploader("CSV 파일 업로드 (UTF-8 권장)", type=["csv"])
 
-# 데모 데이터 생성 버튼
+# 데모 데이터 생성 / 저장된 파일 불러오기 버튼 (선택을 세션에 기억해 다른 위젯을 바꿔도 유지됨)
 if uploaded_file is None:
-    if st.button("데모 데이터 생성하기"):
-        regions = ["종로구", "중구", "강남구", "송파구", "은평구", "노원구", "광진구"]
-        rows = []
-        for region in regions:
-            row = {"행정구역": region}
-            for age in range(0, 101):
-                col = f"2025년10월_계_{age if age < 100 else '100세 이상'}세"
-                value = max(0, int(2000 * np.exp(-((age-40)/25)**2) + np.random.randint(-100,100)))
-                row[col] = value + regions.index(region)*50
-            rows.append(row)
-        demo_df = pd.DataFrame(rows)
-        csv_buf = StringIO()
-        demo_df.to_csv(csv_buf, index=False)
-        csv_buf.seek(0)
-        uploaded_file = csv_buf
+    col_demo, col_file = st.columns(2)
+    if col_demo.button("데모 데이터 생성하기"):
+        st.session_state["population_source"] = "demo"
+        st.session_state["demo_seed"] = population.DEMO_SEED
         st.success("데모 데이터 생성 완료! 아래 탭에서 확인하세요.")
-    else:
+    if col_file.button("저장된 population.csv 불러오기"):
+        st.session_state["population_source"] = "file"
+    if "population_source" not in st.session_state:
         st.info("CSV를 업로드하거나 '데모 데이터 생성하기' 버튼을 눌러주세요.")
         st.stop()
 
-# CSV 읽기
+# CSV 읽기 + 공통 데이터 정제 → [행정구역, 성별, 나이] 인구 배열(cube)
+# 같은 파일/같은 seed 면 캐시된 결과를 그대로 사용합니다. (저장된 파일은 내용이 바뀌면 다시 읽음)
 try:
-    df = pd.read_csv(uploaded_file, dtype=str)
+    with span("load", "population"):
+        if uploaded_file is not None:
+            cube = population.load_upload(uploaded_file)
+        elif st.session_state["population_source"] == "file":
+            cube = population.load_population()
+        else:
+            cube = population.load_demo(st.session_state["demo_seed"])
+
+    # 여러 달이 든 파일이면 기준 월을 고릅니다. (기본: 가장 최근 달 — 달을 합치면 인구가 부풀려지므로 한 달만 씀)
+    if len(cube.months) > 1:
+        month = st.selectbox("기준 월", cube.months[::-1], index=cube.months[::-1].index(cube.month))
+        if month != cube.month:
+            with span("load", "population.month"):
+                if uploaded_file is not None:
+                    cube = population.load_upload(uploaded_file, month)
+                else:
+                    cube = population.load_population(month=month)
+except ValueError as e:
+    st.error(f"❌ {e}")
+    st.stop()
 except Exception as e:
     st.error(f"CSV 읽기 오류: {e}")
     st.stop()
 
-if "행정구역" not in df.columns:
-    st.error("❌ '행정구역' 컬럼이 없습니다.")
-    st.stop()
-
-# === 공통 데이터 정제 로직 ===
-value_cols = [c for c in df.columns if c != "행정구역"]
-col_pattern = re.compile(r"(?P<year>\d{4})년?(?P<month>\d{1,2})?월?_?(?P<gender>남|여|계)?_?(?P<age>\d{1,3}|100세 이상)")
-
-parsed = []
-for c in value_cols:
-    m = col_pattern.search(c)
-    if m:
-        age = m.group("age")
-        if "100" in age:
-            age = "100"
-        else:
-            age = re.sub(r"세", "", age)
-        gender = m.group("gender") if m.group("gender") else "계"
-        parsed.append({"col": c, "age": int(age), "gender": gender})
-    else:
-        parsed.append({"col": c, "age": None, "gender": "계"})
-
-melted = []
-for p in parsed:
-    temp = df[["행정구역", p["col"]]].copy()
-    temp["나이"] = p["age"]
-    temp["성별"] = p["gender"]
-    temp["인구수"] = temp[p["col"]].replace(",", "", regex=True).astype(float)
-    melted.append(temp[["행정구역", "나이", "성별", "인구수"]])
-
-data = pd.concat(melted, ignore_index=True)
-data = data.dropna(subset=["나이"])
-data["나이"] = data["나이"].astype(int)
-
 # === Streamlit Tabs ===
 tab1, tab2 = st.tabs(["📈 연령별 꺾은선그래프", "🏙️ 연령대별 인구 TOP 구 분석"])
 
@@ -82,29 +65,48 @@ tab1, tab2 = st.tabs(["📈 연령별 꺾은선그래프", "🏙️ 연령대별
 with tab1:
     st.subheader("행정구별 연령 인구 꺾은선그래프")
 
-    region = st.selectbox("행정구를 선택하세요", sorted(data["행정구역"].unique()))
-    filtered = data[(data["행정구역"] == region) & (data["성별"] == "계")].groupby("나이")["인구수"].sum().reset_index()
-
-    fig = go.Figure()
-    fig.add_trace(
-        go.Scatter(
-            x=filtered["나이"],
-            y=filtered["인구수"],
-            mode="lines+markers",
-            line=dict(color="black", width=2),
-            marker=dict(size=6)
+    # 상위 → 하위 행정구역 순서로 내려가며 선택 (하위가 없으면 멈춤)
+    hierarchy = cube.hierarchy
+    region = st.selectbox("행정구를 선택하세요", sorted(hierarchy.roots()))
+    depth = 1
+    while hierarchy.children(region):
+        child = st.selectbox(
+            f"하위 행정구역 선택 ({depth}단계 아래)",
+            ["(전체)"] + hierarchy.children(region),
+            key=f"drill_{depth}",
         )
-    )
-    fig.update_layout(
-        title=f"{region} 연령별 인구 분포",
-        xaxis_title="나이 (세)",
-        yaxis_title="인구수 (명)",
-        plot_bgcolor="lightgray",
-        xaxis=dict(dtick=10, showgrid=True, gridcolor="white"),
-        yaxis=dict(dtick=100, showgrid=True, gridcolor="white"),
-        margin=dict(l=40, r=40, t=80, b=40)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+        if child == "(전체)":
+            break
+        region = child
+        depth += 1
+    with span("transform", "population.curve"):
+        curve = cube.curve(region, "계")
+
+    def build_curve_figure():
+        fig = go.Figure()
+        fig.add_trace(
+            go.Scatter(
+                x=cube.ages,
+                y=curve,
+                mode="lines+markers",
+                line=dict(color="black", width=2),
+                marker=dict(size=6)
+            )
+        )
+        fig.update_layout(
+            title=f"{region} 연령별 인구 분포",
+            xaxis_title="나이 (세)",
+            yaxis_title="인구수 (명)",
+            plot_bgcolor="lightgray",
+            xaxis=dict(dtick=10, showgrid=True, gridcolor="white"),
+            yaxis=dict(dtick=100, showgrid=True, gridcolor="white"),
+            margin=dict(l=40, r=40, t=80, b=40)
+        )
+        return fig
+
+    fig = cached_figure("population_curve", cube.version, region, build_curve_figure)
+    with span("render", "population_curve"):
+        st.plotly_chart(fig, use_container_width=True)
 
 # ---------------- TAB 2 -----------------
 with tab2:
@@ -115,32 +117,55 @@ with tab2:
     start_age = int(age_group.replace("대", ""))
     end_age = start_age + 9
 
-    # 선택된 연령대 인구 합산
-    age_filtered = data[
-        (data["성별"] == "계") &
-        (data["나이"].between(start_age, end_age))
-    ]
-    grouped = age_filtered.groupby("행정구역")["인구수"].sum().reset_index()
-    grouped = grouped.sort_values("인구수", ascending=False)
-
-    # 그래프
-    fig2 = go.Figure()
-    fig2.add_trace(
-        go.Bar(
-            x=grouped["행정구역"],
-            y=grouped["인구수"],
-            marker=dict(color="darkslategray"),
+    show_share = st.checkbox("전체 인구 대비 비율(%)로 순위 보기")
+
+    # 비교 범위: 첫 번째 탭에서 고른 행정구역의 하위 (하위가 없는 곳을 골랐으면 그 상위의 하위 = 같은 단계끼리)
+    scope = region if hierarchy.children(region) else hierarchy.parent_of(region)
+    if scope is not None and not st.checkbox(f"{scope} 안에서만 비교", value=True):
+        scope = None
+
+    # 비교 단위 선택 (시도/시군구/읍면동) — 상위 합계 행(예: 서울특별시 전체)이 하위 구와 함께 순위에 섞이지 않도록
+    levels = hierarchy.levels(within=scope)
+    compare_level = None
+    if len(levels) > 1:
+        compare_level = st.radio(
+            "비교 단위", levels, index=len(levels) - 1,
+            format_func=lambda level: regions.LEVEL_NAMES[level], horizontal=True,
         )
+
+    # 선택된 연령대 인구 합산 (누적합 뺄셈으로 모든 행정구를 한 번에 계산)
+    with span("transform", "population.ranking"):
+        grouped = cube.ranking(start_age, end_age, share=show_share, level=compare_level, within=scope)
+    value_col = "비율" if show_share else "인구수"
+
+    # 그래프 (같은 데이터·연령대·옵션이면 재사용)
+    def build_ranking_figure():
+        fig2 = go.Figure()
+        fig2.add_trace(
+            go.Bar(
+                x=grouped["행정구역"],
+                y=grouped[value_col],
+                marker=dict(color="darkslategray"),
+            )
+        )
+        fig2.update_layout(
+            title=(f"{scope} " if scope else "") + (
+                f"{age_group} 인구 비율이 가장 높은 행정구" if show_share else f"{age_group} 인구가 가장 많은 행정구"
+            ),
+            xaxis_title="행정구역",
+            yaxis_title="비율 (%)" if show_share else "인구수 (명)",
+            plot_bgcolor="lightgray",
+            yaxis=dict(dtick=None if show_share else 100, showgrid=True, gridcolor="white"),
+            xaxis=dict(showgrid=False),
+            margin=dict(l=40, r=40, t=80, b=80)
+        )
+        return fig2
+
+    fig2 = cached_figure(
+        "population_ranking", cube.version,
+        {"age_group": age_group, "share": show_share, "level": compare_level, "within": scope}, build_ranking_figure,
     )
-    fig2.update_layout(
-        title=f"{age_group} 인구가 가장 많은 행정구",
-        xaxis_title="행정구역",
-        yaxis_title="인구수 (명)",
-        plot_bgcolor="lightgray",
-        yaxis=dict(dtick=100, showgrid=True, gridcolor="white"),
-        xaxis=dict(showgrid=False),
-        margin=dict(l=40, r=40, t=80, b=80)
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+    with span("render", "population_ranking"):
+        st.plotly_chart(fig2, use_container_width=True)
 
     st.dataframe(grouped.head(10).rename(columns={"행정구역": "행정구", "인구수": "인구수"}))
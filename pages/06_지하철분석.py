@@ -1,64 +1,163 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
-st.title("🚇 2025년 서울 지하철 승하차 분석")
+from shared.figures import cached_figure
+from shared.lazy import go, lazy
+from shared.profiling import begin_page, span
+from shared.warmup import start_warmup
 
-# CSV 파일 읽기
+# pandas·pyarrow 를 쓰는 데이터 모듈은 처음 쓸 때 불러옵니다.
+subway = lazy("shared.subway")
+charts = lazy("shared.charts")
+
+ALL_LINES = "전체 호선"
+
+st.title("🚇 서울 지하철 승하차 분석")
+start_warmup()
+begin_page("06_지하철분석")
+
+# 저장소 동기화 (새로 들어온 일별 파일만 반영) → 데이터가 있는 월 목록 (파티션은 아직 읽지 않음)
 try:
-    df = pd.read_csv('../subway.csv', encoding='cp949')
+    with span("load", "subway.sync"):
+        rejected = subway.sync_subway_store()
+        months = subway.subway_months()
 except Exception as e:
-    st.error("❌ CSV 파일을 불러오지 못했습니다. 경로를 다시 확인하세요.")
+    st.error(f"❌ 지하철 데이터를 불러오지 못했습니다: {e}")
+    st.stop()
+for message in rejected.values():
+    st.warning(f"⚠ 반영하지 못한 파일: {message}")
+if not months:
+    st.error("❌ 지하철 데이터가 없습니다.")
     st.stop()
 
-# 날짜 선택 (2025년 10월만 필터링)
-df['날짜'] = pd.to_datetime(df['날짜'])
-df_oct = df[df['날짜'].dt.month == 10]
+view = st.radio("보기 방식", ["하루 역 순위", "기간 추이"], horizontal=True)
 
-select_date = st.date_input("📅 날짜 선택 (2025년 10월)", value=df_oct['날짜'].min())
-select_line = st.selectbox("🚉 호선 선택", sorted(df['호선'].unique()))
+# ---------------- 기간 추이 (역 × 날짜 행렬 + 누적합, 데이터 버전마다 한 번만 계산) -----------------
+if view == "기간 추이":
+    with span("load", "subway.series"):
+        stations, lines = subway.load_subway_series()
+    level = st.radio("단위", ["역", "노선"], horizontal=True)
+    matrix = stations if level == "역" else lines
+    keys = list(matrix.keys)
+    key = st.selectbox(f"{level} 선택", keys, index=keys.index("강남 (2호선)") if "강남 (2호선)" in keys else 0)
+    first, last = matrix.dates[0].date(), matrix.dates[-1].date()
+    start, end = st.slider("기간", first, last, (first, last), format="YYYY-MM-DD") if first < last else (first, last)
 
-# 선택된 조건 필터링
-filtered = df_oct[(df_oct['날짜'] == pd.to_datetime(select_date)) &
-                   (df_oct['호선'] == select_line)]
+    # 기간 합계·평균은 누적합 뺄셈이라 기간 길이와 상관없이 즉시 계산됩니다.
+    row = matrix.position(key)
+    with span("transform", "subway.series"):
+        series = matrix.series(key, start, end)
+        profile = matrix.weekday_profile(key, start, end)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("기간 합계", f"{matrix.window_totals(start, end)[row]:,}명")
+    col2.metric("일 평균", f"{matrix.window_means(start, end)[row]:,.0f}명")
+    col3.metric("평일 / 주말 평균", f"{profile.iloc[:5].mean():,.0f} / {profile.iloc[5:].mean():,.0f}")
+    col4.metric("이상치", f"{int(series['이상치'].sum())}일")
 
-if filtered.empty:
-    st.warning("⚠ 선택한 조건에 해당되는 데이터가 없습니다.")
+    def build_series_figure():
+        fig = go.Figure([
+            charts.time_series_trace(series.index, series["총승객"].to_numpy(), name="총승객", line=dict(color="#1f77b4")),
+            charts.time_series_trace(series.index, series["7일 평균"].to_numpy(), name="7일 평균", line=dict(color="orange")),
+        ])
+        anomalies = series[series["이상치"]]
+        fig.add_trace(go.Scatter(
+            x=anomalies.index, y=anomalies["총승객"], mode="markers", name="이상치",
+            marker=dict(color="red", size=9, symbol="x"),
+            customdata=anomalies["기대값"], hovertemplate="%{x|%Y-%m-%d}<br>%{y:,}명 (기대 %{customdata:,.0f}명)<extra></extra>",
+        ))
+        fig.update_layout(
+            title=f"📈 {key} 일별 승하차 인원",
+            xaxis_title="날짜", yaxis_title="총 승객수", template="simple_white", hovermode="x unified",
+        )
+        return fig
+
+    def build_profile_figure():
+        fig = go.Figure(go.Bar(
+            x=profile.index, y=profile.to_numpy(),
+            marker_color=["#87CEFA"] * 5 + ["#FFD700"] * 2,
+        ))
+        fig.update_layout(title=f"🗓 {key} 요일별 일 평균", yaxis_title="총 승객수", template="simple_white", height=350)
+        return fig
+
+    version = (matrix.version, level)
+    with span("render", "subway_series"):
+        st.plotly_chart(cached_figure("subway_series", version, (key, start, end), build_series_figure), use_container_width=True)
+    with span("render", "subway_weekday"):
+        st.plotly_chart(cached_figure("subway_weekday", version, (key, start, end), build_profile_figure), use_container_width=True)
+
+    # 기간 합계 상위 (모든 키의 합계를 한 번에 계산한 뒤 상위 K개만 정렬)
+    totals = matrix.window_totals(start, end)
+    top = charts.top_k_indices(totals, 10)
+    st.markdown(f"**기간 합계 상위 {level}**")
+    st.dataframe({level: matrix.keys[top], "기간 합계": totals[top]}, hide_index=True)
     st.stop()
 
-# 승하차 총합 계산
-filtered['총승객'] = filtered['승차총승객수'] + filtered['하차총승객수']
-
-# 승객수 높은 순 정렬
-filtered = filtered.sort_values('총승객', ascending=False)
-
-# 색상 처리 (1등 하늘색 / 나머지 노란 → 연한 노란 그라데이션)
-colors = ["#87CEFA"]  # 1등 하늘색
-yellow = 255
-step = 8
-
-for i in range(1, len(filtered)):
-    # 노란색을 점점 연하게
-    yellow_value = max(180, 255 - i * step)
-    color_hex = f'#FFFF{yellow_value:02X}'
-    colors.append(color_hex)
-
-# 인터랙티브 Plotly 그래프
-fig = px.bar(
-    filtered,
-    x="역명",
-    y="총승객",
-    title=f"📊 {select_date} {select_line} 승하차 총합 상위역",
+# ---------------- 하루 역 순위 -----------------
+
+# 월 선택 → 해당 월의 날짜 범위 안에서 날짜 선택 (데이터에 있는 월만 표시)
+select_month = st.selectbox(
+    "🗓 월 선택",
+    months,
+    index=len(months) - 1,
+    format_func=lambda m: f"{m.year}년 {m.month}월",
 )
 
-fig.update_traces(marker_color=colors)
+# 선택한 달의 파티션만 읽은 (날짜, 호선) 사전 집계 인덱스
+with span("load", "subway.index"):
+    index = subway.load_subway_index(months=[select_month])
+month_dates = index.dates_in(select_month)
 
-fig.update_layout(
-    xaxis_title="역명",
-    yaxis_title="총 승객수",
-    template="simple_white"
+select_date = st.date_input(
+    f"📅 날짜 선택 ({select_month.year}년 {select_month.month}월)",
+    value=month_dates[0],
+    min_value=month_dates[0],
+    max_value=month_dates[-1],
 )
+select_line = st.selectbox("🚉 호선 선택", [ALL_LINES, *index.lines], index=1 if index.lines else 0)
+top_k = st.slider("📏 그래프에 표시할 역 수 (나머지는 '기타'로 합침)", 5, 60, 20, step=5)
+
+# 선택된 조건 조회 (총승객 계산 + 노선 안 높은 순 정렬이 이미 되어 있음)
+all_lines = select_line == ALL_LINES
+with span("transform", "subway.lookup"):
+    filtered = index.lookup(select_date, None if all_lines else select_line)
+
+if filtered.empty:
+    st.warning("⚠ 선택한 조건에 해당되는 데이터가 없습니다.")
+    st.stop()
+
+def build_figure():
+    # 상위 K개 역만 막대로 그리고 나머지는 '기타' 하나로 (역 수가 많아도 그래프 크기 일정)
+    totals = filtered["총승객"].to_numpy()
+    positions, others, n_others = charts.top_k_split(totals, top_k)
+    names = filtered["역명"].to_numpy(dtype=object)[positions]
+    if all_lines:
+        # 여러 노선에 같은 이름의 역이 있어 노선명을 붙여 구분합니다.
+        names = names + " (" + filtered["노선명"].to_numpy(dtype=object)[positions] + ")"
+    values = totals[positions]
+
+    # 색상 처리 (1등 하늘색 / 나머지 노란 → 연한 노란 그라데이션)
+    colors = charts.gradient_colors(len(positions))
+    if others is not None:
+        names = [*names, f"기타 ({n_others}개 역)"]
+        values = [*values, others]
+        colors = [*colors, charts.OTHERS_COLOR]
+
+    # 인터랙티브 Plotly 그래프
+    fig = go.Figure(go.Bar(x=names, y=values, marker_color=colors))
+
+    fig.update_layout(
+        title=f"📊 {select_date} {select_line} 승하차 총합 상위역",
+        xaxis_title="역명",
+        yaxis_title="총 승객수",
+        template="simple_white"
+    )
+    return fig
 
-st.plotly_chart(fig, use_container_width=True)
+# 같은 데이터·날짜·호선이면 이전에 만든 그래프를 재사용
+fig = cached_figure("subway", index.version, (select_date, select_line, top_k), build_figure)
+with span("render", "subway_ranking"):
+    st.plotly_chart(fig, use_container_width=True)
 
-st.dataframe(filtered[['역명', '승차총승객수', '하차총승객수', '총승객']])
+if all_lines:
+    st.dataframe(filtered[['역명', '노선명', '승차총승객수', '하차총승객수', '총승객']].sort_values('총승객', ascending=False))
+else:
+    st.dataframe(filtered[['역명', '승차총승객수', '하차총승객수', '총승객']])
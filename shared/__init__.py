@@ -0,0 +1,4 @@
+"""
+여러 페이지가 함께 쓰는 데이터 로딩/가공 모듈 모음
+- pages/*.py 에서 `from shared.xxx import ...` 형태로 사용합니다.
+"""
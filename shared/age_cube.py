@@ -0,0 +1,78 @@
+"""
+행정구역 × 성별 × 나이 인구 배열(AgeCube)
+- 인구수를 int32 3차원 배열 [행정구역, 성별, 나이] 로 보관하고,
+  나이 축 누적합(prefix sum)을 미리 계산해 둡니다.
+- 한 지역의 연령 분포는 배열 슬라이스, 임의 연령대 합계는 모든 지역에 대해 뺄셈 한 번으로 구합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from shared.regions import RegionHierarchy
+
+GENDERS = ["계", "남", "여"]
+MAX_AGE = 100  # 100세 이상은 100 으로 묶습니다.
+AGES = np.arange(MAX_AGE + 1)
+
+
+class AgeCube:
+    """[행정구역, 성별(계/남/여), 나이(0~100)] int32 인구 배열 + 나이 축 누적합"""
+
+    def __init__(self, regions, counts, version=None, months=None, month=None):
+        # version: 원본 데이터 버전 (그래프 캐시 등 파생 결과의 키로 사용)
+        # months: 원본 파일에 들어 있는 달('YYYY-MM') 목록, month: 이 배열이 담은 달 (연월 표기가 없는 파일이면 None)
+        self.version = version
+        self.months = list(months or [])
+        self.month = month
+        self.regions = pd.Index(regions, name="행정구역")
+        counts = np.array(counts, dtype=np.int32, copy=True)  # 아래 '계' 채우기가 호출한 쪽 배열을 바꾸지 않도록
+        if counts.shape != (len(self.regions), len(GENDERS), len(AGES)):
+            raise ValueError(f"배열 모양이 맞지 않습니다: {counts.shape}")
+
+        # '계' 컬럼 없이 남/여만 있는 파일이면 남+여 로 채웁니다.
+        if not counts[:, 0].any() and counts[:, 1:].any():
+            counts[:, 0] = counts[:, 1] + counts[:, 2]
+        self.counts = counts
+
+        # prefix[r, g, a] = 0 ~ (a-1)세 인구 합계 → a~b세 합계 = prefix[..., b+1] - prefix[..., a]
+        # (한 지역의 인구 합계라 int32 로 충분합니다. 여러 지역을 합칠 때는 RegionHierarchy 가 int64 로 더함)
+        self.prefix = np.zeros(counts.shape[:2] + (len(AGES) + 1,), dtype=np.int32)
+        np.cumsum(counts, axis=2, out=self.prefix[:, :, 1:])
+
+        self._region_pos = {region: i for i, region in enumerate(self.regions)}
+        self.hierarchy = RegionHierarchy(self.regions)
+
+    @property
+    def ages(self):
+        return AGES
+
+    def curve(self, region, gender="계"):
+        """한 지역의 나이별 인구 (길이 101 배열, 배열 슬라이스라 복사 없음)"""
+        return self.counts[self._region_pos[region], GENDERS.index(gender)]
+
+    def band_totals(self, start_age, end_age, gender="계"):
+        """모든 지역의 start_age ~ end_age 세 인구 합계 (지역 순서 배열)"""
+        start = min(max(start_age, 0), MAX_AGE)
+        stop = min(max(end_age, start - 1), MAX_AGE) + 1
+        g = GENDERS.index(gender)
+        return self.prefix[:, g, stop] - self.prefix[:, g, start]
+
+    def totals(self, gender="계"):
+        """모든 지역의 전체 인구"""
+        return self.prefix[:, GENDERS.index(gender), -1]
+
+    def ranking(self, start_age, end_age, gender="계", share=False, level=None, within=None):
+        """
+        연령대 인구가 많은 순으로 정렬한 DataFrame(행정구역, 인구수[, 비율]) 을 반환합니다.
+        share=True 면 전체 인구 대비 비율(%) 순으로 정렬합니다.
+        level(1: 시도, 2: 시군구, 3: 읍면동) / within(상위 행정구역)으로 비교 대상을 좁힐 수 있습니다.
+        """
+        rows = self.hierarchy.mask(level, within)
+        band = self.band_totals(start_age, end_age, gender)[rows]
+        result = pd.DataFrame({"행정구역": self.regions[rows], "인구수": band})
+        if share:
+            totals = self.totals(gender)[rows]
+            result["비율"] = np.divide(band * 100.0, totals, out=np.zeros(len(band)), where=totals > 0)
+        key = "비율" if share else "인구수"
+        order = np.argsort(-result[key].to_numpy(), kind="stable")
+        return result.iloc[order].reset_index(drop=True)
@@ -0,0 +1,87 @@
+"""
+선택 결과가 커져도 크기가 일정한 그래프 만들기
+- 막대그래프: 값이 큰 K개만 막대로 그리고 나머지는 '기타' 막대 하나로 합칩니다.
+  (전체 정렬 대신 argpartition 으로 K개를 고른 뒤 그 K개만 정렬)
+- 막대 색상: 순위별 색 배열을 파이썬 반복 없이 numpy 로 한 번에 만듭니다.
+- 시계열: 점이 많으면 구간마다 최솟값·최댓값만 남겨 점 수를 제한하고, WebGL(Scattergl) 트레이스로 그립니다.
+→ 선택한 행이 몇 개든 브라우저로 보내는 그래프 크기와 그리기 시간이 거의 같습니다.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+TOP_K = 20
+OTHERS_COLOR = "#D3D3D3"
+
+# 이 개수 이상의 점은 WebGL 로 그립니다. (SVG 는 점 수에 비례해 느려짐)
+SCATTERGL_MIN_POINTS = 500
+# 시계열 한 줄에 남길 최대 점 수
+MAX_SERIES_POINTS = 2000
+
+
+def top_k_indices(values, k):
+    """values 가 큰 순서의 위치 k 개 (고른 k 개 안에서는 같은 값이면 앞 위치 먼저). 전체를 정렬하지 않습니다."""
+    values = np.asarray(values)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(values):
+        candidates = np.argpartition(-values, k - 1)[:k]
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+def top_k_split(values, k, keep=None, reduce="sum"):
+    """
+    큰 값 k 개 + 나머지 하나로 나눕니다.
+    - keep: 순위와 상관없이 막대로 남길 위치의 불리언 마스크 (예: 한국) — 순위 순서대로 뒤에 붙습니다.
+    - reduce: 나머지를 합칠 방법 ('sum' 또는 'mean')
+    반환: (막대로 그릴 위치 배열, 나머지 값, 나머지 개수). 나머지가 없으면 값은 None
+    """
+    values = np.asarray(values)
+    positions = top_k_indices(values, k)
+    if keep is not None:
+        extra = np.flatnonzero(keep)
+        extra = extra[~np.isin(extra, positions)]
+        positions = np.concatenate([positions, extra[top_k_indices(values[extra], len(extra))]])
+
+    rest = len(values) - len(positions)
+    if rest <= 0:
+        return positions, None, 0
+    rest_total = values.sum(dtype=np.float64) - values[positions].sum(dtype=np.float64)
+    return positions, (rest_total / rest if reduce == "mean" else rest_total), rest
+
+
+def gradient_colors(n, first="#87CEFA", start=255, stop=180, step=8):
+    """1등은 first, 나머지는 순위가 내려갈수록 연해지는 노란색(#FFFFxx) n 개 배열"""
+    yellow = np.maximum(stop, start - np.arange(n) * step)
+    colors = np.char.add("#FFFF", np.char.mod("%02X", yellow)).astype(object)
+    if n:
+        colors[0] = first
+    return colors
+
+
+def downsample_minmax(x, y, max_points=MAX_SERIES_POINTS):
+    """
+    점이 max_points 보다 많으면 같은 간격의 구간마다 최솟값·최댓값 점만 남깁니다.
+    (처음·끝 점 포함, 순서 유지) — 선 모양의 봉우리·골짜기는 그대로 보입니다.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    buckets = max(1, (max_points - 2) // 2)
+    bucket = np.arange(n) * buckets // n
+    order = np.lexsort((y, bucket))  # 구간 안에서 값 오름차순
+    starts = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1]])
+    stops = np.r_[starts[1:], n] - 1
+    keep = np.unique(np.concatenate([[0, n - 1], order[starts], order[stops]]))
+    return x[keep], y[keep]
+
+
+def time_series_trace(x, y, name=None, max_points=MAX_SERIES_POINTS, **kwargs):
+    """점 수를 제한한 시계열 선 트레이스 (점이 많으면 WebGL Scattergl)"""
+    x, y = downsample_minmax(x, y, max_points)
+    trace = go.Scattergl if len(y) >= SCATTERGL_MIN_POINTS else go.Scatter
+    return trace(x=x, y=y, name=name, mode=kwargs.pop("mode", "lines"), **kwargs)
@@ -0,0 +1,196 @@
+"""
+데이터셋 등록부(registry)와 버전 관리
+- 앱이 읽는 CSV 마다 경로(또는 glob 패턴), 인코딩, dtype, 파서를 한곳(DATASETS)에 선언합니다.
+- 버전은 (mtime, 크기, 내용 해시) 입니다. stat 은 매번 하지만 해시는 mtime/크기가 바뀐 경우에만 다시 계산하고,
+  내용이 같으면(파일만 다시 저장됨) 버전이 바뀌지 않습니다.
+- 버전이 바뀌면 그 데이터셋에서 만든 캐시(집계·인덱스·그래프·지도)를 비웁니다.
+  → 새 내보내기 파일을 os.replace 등으로 통째로 바꿔 넣으면 서버를 재시작하지 않아도 다음 실행부터 새 데이터를 씁니다.
+- 쓰는 도중인 파일(해시 계산 중 mtime/크기가 바뀜)은 잠시 뒤 다시 확인합니다.
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from shared.files import file_hash
+from shared.paths import ROOT
+
+FileVersion = namedtuple("FileVersion", ["path", "mtime_ns", "size", "digest"])
+
+# 해시 계산 중 파일이 바뀌면 다시 시도할 횟수와 간격
+HASH_RETRIES = 5
+HASH_RETRY_SECONDS = 0.2
+
+
+class Dataset:
+    """데이터셋 선언: 파일(또는 glob 패턴), 인코딩(None 이면 자동 판별), dtype, 파서('모듈:함수')"""
+
+    def __init__(self, name, filename=None, pattern=None, encoding=None, dtypes=None, parser=None, description=""):
+        self.name = name
+        self.filename = filename
+        self.pattern = pattern
+        self.encoding = encoding
+        self.dtypes = dtypes or {}
+        self.parser = parser
+        self.description = description
+
+    @property
+    def path(self):
+        return ROOT / self.filename if self.filename else None
+
+    def sources(self):
+        """데이터셋을 이루는 파일 목록 (패턴이면 이름순)"""
+        if self.pattern:
+            return sorted(ROOT.glob(self.pattern))
+        return [self.path]
+
+    def encoding_of(self, path):
+        if self.encoding:
+            return self.encoding
+        from shared.encoding import detect_encoding
+
+        return detect_encoding(path)
+
+    def read(self, path=None):
+        """
+        선언된 파서로 파일 하나를 읽습니다. 파서가 없으면 pandas.read_csv(encoding, dtype) 후
+        shared.memory.normalize 로 dtype 을 줄입니다. (반복 문자열 → category, 나머지 문자열 → string[pyarrow], 정수 → int32)
+        """
+        path = Path(path) if path is not None else self.path
+        encoding = self.encoding_of(path)
+        if self.parser:
+            module, function = self.parser.split(":")
+            return getattr(importlib.import_module(module), function)(path, encoding)
+        import pandas as pd
+
+        from shared.memory import normalize
+
+        return normalize(pd.read_csv(path, encoding=encoding, dtype=self.dtypes or None), self.dtypes)
+
+
+DATASETS = {
+    dataset.name: dataset
+    for dataset in [
+        Dataset(
+            "subway", pattern="subway*.csv", parser="shared.subway:build_subway_table",
+            description="서울 지하철 일별 역별 승하차 인원 (보통 cp949)",
+        ),
+        Dataset(
+            "subway_daily", pattern="subway_daily/*.csv", parser="shared.subway:build_subway_table",
+            description="하루 단위로 추가되는 승하차 파일 (shared.subway 가 월별 저장소에 반영)",
+        ),
+        Dataset(
+            "population", "population.csv",
+            description="행정안전부 주민등록 연령별 인구 (넓은 형태)",
+        ),
+        Dataset(
+            "endangered", "endangered.csv",
+            dtypes={col: "category" for col in ["분류군", "등급", "고유종", "국가적색목록", "세계자연보전연맹"]},
+            description="멸종위기 야생생물 목록",
+        ),
+        Dataset("mbti", "countriesMBTI_16types.csv", encoding="utf-8", description="국가별 MBTI 16유형 비율"),
+        Dataset("places", "places.csv", description="서울 관광지 목록"),
+        Dataset("stations", "stations.csv", description="지하철역 좌표"),
+    ]
+}
+
+_versions = {}          # 경로 → FileVersion (해시 재계산을 피하기 위한 메모)
+_last_seen = {}         # (데이터셋 이름, 경로) → 마지막으로 확인한 버전
+_derived = {}           # 데이터셋 이름 → 버전이 바뀌면 비울 함수 목록
+_lock = threading.Lock()
+
+
+def get_dataset(name):
+    return DATASETS[name]
+
+
+def file_version(path):
+    """파일의 (경로, mtime, 크기, 내용 해시). 해시는 mtime/크기가 바뀐 경우에만 다시 계산합니다."""
+    path = str(path)
+    for _ in range(HASH_RETRIES):
+        stat = os.stat(path)
+        cached = _versions.get(path)
+        if cached is not None and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+            return cached
+        digest = file_hash(path)
+        after = os.stat(path)
+        if (after.st_mtime_ns, after.st_size) == (stat.st_mtime_ns, stat.st_size):
+            version = FileVersion(path, stat.st_mtime_ns, stat.st_size, digest)
+            if cached is not None and cached.digest == digest:
+                version = cached._replace(mtime_ns=stat.st_mtime_ns)
+            _versions[path] = version
+            return version
+        time.sleep(HASH_RETRY_SECONDS)  # 아직 쓰는 중 — 잠시 뒤 다시 확인
+    raise OSError(f"{path} 파일이 계속 바뀌고 있어 버전을 확인할 수 없습니다.")
+
+
+def _files(version):
+    """FileVersion 하나 또는 (패턴 데이터셋의) FileVersion 튜플 → 목록"""
+    return [version] if isinstance(version, FileVersion) else list(version)
+
+
+def content_key(version):
+    """캐시 키로 쓸 값: (경로, 내용 해시). mtime 만 바뀐 경우에는 같은 값입니다. 패턴 데이터셋이면 파일별 튜플"""
+    if isinstance(version, FileVersion):
+        return (version.path, version.digest)
+    return tuple(content_key(v) for v in version)
+
+
+def dataset_version(name, path=None):
+    """
+    데이터셋(또는 지정한 path)의 현재 버전. 패턴 데이터셋이면 파일별 버전 튜플.
+    직전에 확인한 버전과 내용이 다르면 등록된 파생 캐시를 비웁니다.
+    """
+    dataset = DATASETS[name]
+    if path is not None and dataset.path is not None and Path(path) == dataset.path:
+        path = None
+    if path is not None:
+        version = file_version(path)
+    elif dataset.pattern:
+        version = tuple(file_version(p) for p in dataset.sources())
+    else:
+        version = file_version(dataset.path)
+
+    key = (name, str(path) if path is not None else None)
+    with _lock:
+        previous = _last_seen.get(key)
+        _last_seen[key] = version
+    if previous is not None and content_key(previous) != content_key(version):
+        invalidate(name, previous)
+    return version
+
+
+def register_derived(name, *clearables):
+    """
+    name 데이터셋이 바뀌면 비울 캐시를 등록합니다.
+    clearables: .clear() 가 있는 객체(st.cache_* 함수 등) 또는 "모듈:이름" 문자열
+    (문자열은 그 모듈이 이미 import 된 경우에만 비웁니다 — 무거운 모듈을 등록 때문에 불러오지 않도록)
+    """
+    with _lock:
+        registered = _derived.setdefault(name, [])
+        registered.extend(c for c in clearables if c not in registered)
+
+
+def _resolve(clearable):
+    if not isinstance(clearable, str):
+        return clearable
+    module, attr = clearable.split(":")
+    return getattr(sys.modules[module], attr) if module in sys.modules else None
+
+
+def invalidate(name, old_version=None):
+    """name 에서 파생된 캐시를 비웁니다. old_version 이 있으면 그 버전으로 만든 그래프도 지웁니다."""
+    from shared.figures import FIGURE_CACHE
+
+    with _lock:
+        clearables = list(_derived.get(name, []))
+    for clearable in clearables:
+        clearable = _resolve(clearable)
+        if clearable is not None:
+            clearable.clear()
+    if old_version is not None:
+        FIGURE_CACHE.discard_version(*(content_key(v) for v in _files(old_version)))
@@ -0,0 +1,41 @@
+"""
+CSV 인코딩 판별
+- 파일 전체를 여러 인코딩으로 반복해서 읽지 않고, 앞부분 일부 바이트만 보고 결정합니다.
+  1) 같은 이름의 .encoding 파일(예: endangered.csv.encoding)에 적힌 값
+  2) BOM (UTF-8/UTF-16)
+  3) 앞부분이 UTF-8 로 디코딩되면 utf-8, 아니면 cp949 (euc-kr 의 상위 호환)
+"""
+
+import codecs
+from pathlib import Path
+
+SNIFF_BYTES = 64 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def sniff_encoding(prefix):
+    """바이트 앞부분으로 인코딩을 추정합니다."""
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding
+    try:
+        # final=False: 잘린 마지막 멀티바이트 문자는 오류로 보지 않음
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+    except UnicodeDecodeError:
+        return "cp949"
+    return "utf-8"
+
+
+def detect_encoding(path, sample_size=SNIFF_BYTES):
+    """파일 인코딩을 반환합니다. (사이드카 .encoding 파일 → BOM → 앞부분 디코딩 순)"""
+    path = Path(path)
+    sidecar = path.with_name(path.name + ".encoding")
+    if sidecar.exists():
+        return sidecar.read_text(encoding="ascii").strip()
+    with open(path, "rb") as f:
+        return sniff_encoding(f.read(sample_size))
@@ -0,0 +1,62 @@
+"""
+멸종위기 야생생물 목록(endangered.csv) 로더
+- 경로·인코딩·dtype 은 데이터셋 등록부(shared.datasets)에 선언되어 있고, 파일 내용 버전마다 한 번만 읽습니다.
+- 반복되는 값이 많은 컬럼은 category 로 읽어 메모리를 줄입니다.
+- 프로세스 안의 모든 페이지·세션이 같은 프레임을 공유합니다.
+- 정리한 프레임과 (등급, 분류군) 집계·검색 인덱스는 shared.precompute 작업으로 함께 만들어,
+  파일이 바뀌면 프로세스 풀에서 새로 만드는 동안 이전 결과를 보여 줍니다.
+"""
+
+import streamlit as st
+
+from shared.datasets import content_key, dataset_version, get_dataset, register_derived
+from shared.endangered_index import EndangeredIndex
+from shared.memory import track
+from shared.precompute import build, register, serve
+
+DATASET = get_dataset("endangered")
+ENDANGERED_CSV = DATASET.path
+
+CATEGORY_COLS = list(DATASET.dtypes)
+
+
+def read_endangered(path):
+    """파일을 읽어 '등급', '분류군' 이 비어 있는 행을 빼고 쓰이지 않는 범주를 정리합니다."""
+    df = DATASET.read(path)
+    df = df.dropna(subset=["등급", "분류군"])
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].cat.remove_unused_categories()
+    return df.reset_index(drop=True)
+
+
+def compute_endangered_index(version):
+    # version: (경로, 내용 해시) — precompute 작업 함수 (인덱스가 프레임을 함께 담아 한 파일로 저장됨)
+    return EndangeredIndex(read_endangered(version[0]), version=version)
+
+
+register("endangered_index", "endangered", "shared.endangered:compute_endangered_index")
+
+
+@st.cache_resource(show_spinner=False)
+def _build_endangered_index(version):
+    # version: (경로, 내용 해시) — 캐시 키로 사용합니다. (파일 내용이 바뀌면 새로 읽음)
+    index = build("endangered_index", version)
+    track("endangered", "frame", index.frame)
+    return track("endangered", "index", index)
+
+
+register_derived("endangered", _build_endangered_index)
+
+
+def load_endangered(path=ENDANGERED_CSV):
+    """
+    멸종위기종 목록을 DataFrame 으로 반환합니다. ('등급', '분류군' 이 비어 있는 행은 제외)
+    반환된 프레임은 모든 페이지가 공유하므로 직접 수정하지 마세요.
+    """
+    return load_endangered_index(path).frame
+
+
+def load_endangered_index(path=ENDANGERED_CSV):
+    """(등급, 분류군) 집계·검색 인덱스(EndangeredIndex)를 반환합니다. 파일 버전마다 한 번만 만듭니다."""
+    return serve("endangered_index", content_key(dataset_version("endangered", path)), _build_endangered_index)
@@ -0,0 +1,95 @@
+"""
+멸종위기종 목록의 (등급, 분류군) 사전 집계 + 이름 검색 인덱스
+- 데이터를 읽을 때 한 번만 등급 × 분류군 개수 표와 (등급, 분류군) → 행 위치 목록을 만들어 둡니다.
+- 국명/학명 검색은 글자 2-gram 역색인으로 후보를 좁힌 뒤 부분 문자열을 확인합니다.
+  역색인은 gram → 행 위치 int32 정렬 배열, 검색용 이름은 Arrow 문자열 배열로 보관합니다. (파이썬 set/str 대비 수십 배 작음)
+"""
+
+from collections import defaultdict
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+SEARCH_COLS = ["국명", "학명"]
+# 국명·학명을 이을 때 쓰는 구분 문자. 검색어에서는 지우므로 두 이름에 걸친 부분 문자열은 찾지 않습니다.
+NAME_SEPARATOR = "\x1f"
+
+
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class EndangeredIndex:
+    """등급 × 분류군 개수, (등급, 분류군) → 행 위치, 국명/학명 n-gram 역색인"""
+
+    def __init__(self, df, version=None):
+        # version: 원본 데이터 버전 (그래프 캐시 등 파생 결과의 키로 사용)
+        self.version = version
+        self.frame = df
+        grade = df["등급"].astype("category")
+        taxon = df["분류군"].astype("category")
+        self.grades = list(grade.cat.categories)
+        self.taxa = list(taxon.cat.categories)
+
+        # 등급 × 분류군 개수 (bincount 한 번)
+        g_codes = grade.cat.codes.to_numpy().astype(np.int64)
+        t_codes = taxon.cat.codes.to_numpy().astype(np.int64)
+        cell = g_codes * len(self.taxa) + t_codes
+        counts = np.bincount(cell, minlength=len(self.grades) * len(self.taxa))
+        self.counts = pd.DataFrame(
+            counts.reshape(len(self.grades), len(self.taxa)), index=self.grades, columns=self.taxa
+        )
+
+        # (등급, 분류군) → 행 위치 (원래 행 순서 유지)
+        order = np.argsort(cell, kind="stable")
+        bounds = np.cumsum(np.r_[0, counts])
+        self._rows = {}
+        for g, grade_name in enumerate(self.grades):
+            for t, taxon_name in enumerate(self.taxa):
+                k = g * len(self.taxa) + t
+                if counts[k]:
+                    self._rows[(grade_name, taxon_name)] = order[bounds[k]:bounds[k + 1]]
+
+        # 검색용 소문자 이름(국명·학명을 NAME_SEPARATOR 로 이음)과 1-gram/2-gram 역색인
+        names = [
+            NAME_SEPARATOR.join(str(v).lower() for v in values if pd.notna(v))
+            for values in df[SEARCH_COLS].itertuples(index=False)
+        ]
+        grams = defaultdict(list)
+        for row, name in enumerate(names):
+            for gram in _grams(name, 1) | _grams(name, 2):
+                grams[gram].append(row)
+        self._names = pa.array(names, pa.string())
+        self._grams = {gram: np.array(rows, dtype=np.int32) for gram, rows in grams.items()}
+
+    def ranking(self, grades):
+        """선택한 등급들의 분류군별 개수 (많은 순, 0개 제외) → DataFrame(분류군, 개체수)"""
+        total = self.counts.loc[list(grades)].sum(axis=0)
+        total = total[total > 0].sort_values(ascending=False, kind="stable")
+        return pd.DataFrame({"분류군": total.index, "개체수": total.to_numpy()})
+
+    def search(self, query):
+        """국명 또는 학명에 query 가 들어 있는 행 위치 (대소문자 무시, 두 이름에 걸친 일치는 제외)"""
+        query = query.replace(NAME_SEPARATOR, "").strip().lower()
+        if not query:
+            return np.arange(len(self._names))
+        grams = _grams(query, 2) or _grams(query, 1)
+        # 짧은 목록부터 교집합 (행 위치는 오름차순이라 결과도 오름차순)
+        lists = sorted((self._grams.get(gram, _EMPTY) for gram in grams), key=len)
+        candidates = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), lists)
+        found = pc.match_substring(self._names.take(pa.array(candidates)), query).to_numpy(zero_copy_only=False)
+        return candidates[found].astype(np.int64)
+
+    def rows(self, grades, taxa, query=""):
+        """선택한 등급·분류군(여러 개 가능)과 검색어에 해당하는 행 (원래 순서)"""
+        parts = [self._rows[key] for key in ((g, t) for g in grades for t in taxa) if key in self._rows]
+        positions = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        if query.strip():
+            positions = np.intersect1d(positions, self.search(query), assume_unique=True)
+        return self.frame.iloc[positions]
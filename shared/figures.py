@@ -0,0 +1,145 @@
+"""
+Plotly 그래프 메모이제이션
+- (페이지, 데이터 버전, 선택값) 이 같으면 그래프를 다시 만들지 않고 저장해 둔 Figure 를 재사용합니다.
+- 프로세스 전체에서 하나의 캐시를 공유하며, 항목 수와 직렬화(JSON) 크기 합계 기준으로
+  가장 오래 쓰이지 않은 그래프부터 제거합니다(LRU).
+- 적중/미스/제거 횟수를 세어 stats() 로 확인할 수 있습니다.
+- 원본 파일이 바뀌면 shared.datasets 가 discard_version() 으로 이전 버전의 그래프를 지웁니다.
+
+Figure 객체 자체를 보관하는 이유: st.plotly_chart 는 dict/JSON 을 받으면 Figure 로 다시 검증(수십 ms)하지만,
+Figure 를 받으면 to_dict + to_json 만 하므로 재사용 시 비용이 가장 작습니다.
+크기는 직렬화하지 않고 trace·layout 값(배열은 nbytes)으로 어림합니다. (estimate_size)
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from shared.profiling import span
+
+MAX_FIGURES = 256
+MAX_FIGURE_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    """크기 제한이 있는 LRU 그래프 캐시 (여러 세션 스레드에서 동시에 사용 가능)"""
+
+    def __init__(self, max_entries=MAX_FIGURES, max_bytes=MAX_FIGURE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key → (figure, 바이트 수)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, build):
+        """key 에 해당하는 Figure 를 반환합니다. 없으면 build() 로 만들어 저장합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # 그래프 생성은 잠금 밖에서 (다른 세션을 막지 않도록)
+        figure = build()
+        size = estimate_size(figure)
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0]
+            if size <= self.max_bytes:
+                self._entries[key] = (figure, size)
+                self._bytes += size
+                self._evict()
+        return figure
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def discard_version(self, *versions):
+        """키의 데이터 버전에 versions 중 하나가 (중첩된 튜플 안에라도) 들어 있는 그래프를 지웁니다. 지운 개수를 반환"""
+        targets = set(versions)
+        with self._lock:
+            stale = [key for key in self._entries if _contains(key[1], targets)]
+            for key in stale:
+                _, size = self._entries.pop(key)
+                self._bytes -= size
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """적중/미스/제거 횟수와 현재 항목 수·용량"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+def estimate_size(figure):
+    """
+    그래프를 브라우저로 보낼 때의 대략적인 크기 (바이트). to_json 처럼 배열을 문자열로 바꾸지 않고
+    trace·layout 의 값만 훑습니다. (숫자 배열은 base64 로 보내므로 nbytes × 4/3)
+    """
+    parts = [trace.to_plotly_json() for trace in figure.data]
+    parts.append(figure.layout.to_plotly_json())
+    return sum(_value_size(part) for part in parts)
+
+
+def _value_size(value):
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return sum(_value_size(item) for item in value.ravel())
+        return value.nbytes * 4 // 3
+    if isinstance(value, dict):
+        return sum(len(key) + 4 + _value_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_value_size(item) + 1 for item in value) + 2
+    if isinstance(value, str):
+        return len(value.encode("utf-8")) + 2
+    return 8
+
+
+def _contains(version, targets):
+    try:
+        if version in targets:
+            return True
+    except TypeError:  # hash 할 수 없는 값
+        return False
+    return isinstance(version, tuple) and any(_contains(part, targets) for part in version)
+
+
+# 프로세스 전체에서 공유하는 캐시
+FIGURE_CACHE = FigureCache()
+
+
+def cached_figure(page, version, params, build):
+    """
+    (page, version, params) 키로 그래프를 메모이제이션합니다.
+    - version: 데이터 버전 (파일 mtime, 업로드 해시 등) — 데이터가 바뀌면 새로 만듭니다.
+    - params: 그래프 모양을 결정하는 선택값 (hash 가능한 값 또는 dict)
+    반환된 Figure 는 여러 세션이 공유하므로 수정하지 말고 그대로 st.plotly_chart 에 넘기세요.
+    """
+    if isinstance(params, dict):
+        params = tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value) for name, value in params.items()
+        ))
+    with span("figure", page):
+        return FIGURE_CACHE.get((page, version, params), build)
@@ -0,0 +1,47 @@
+"""
+파일 도우미
+- file_hash: 파일 내용 해시 (데이터셋 버전)
+- atomic_write / read_manifest / write_manifest: 임시 파일에 쓴 뒤 교체해, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 합니다.
+  (지하철 저장소 manifest, precompute 결과 파일)
+"""
+
+import hashlib
+import json
+import os
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """파일 내용의 blake2b 해시를 계산합니다."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def atomic_write(path, write):
+    """write(임시 경로) 로 임시 파일에 쓴 뒤 os.replace 로 path 를 교체합니다."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def read_manifest(path):
+    """JSON manifest (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(path, manifest):
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    atomic_write(path, write)
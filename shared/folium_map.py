@@ -0,0 +1,180 @@
+"""
+Folium 지도 렌더링 결과 캐시
+- st_folium 은 호출될 때마다 Map 전체를 jinja 템플릿으로 다시 렌더링해 HTML/JS 를 만듭니다.
+  (지도 높이 슬라이더만 바꿔도 마커·타일·레이어 컨트롤을 모두 다시 만들고 렌더링)
+- 여기서는 (이름, 데이터 버전, 선택값) 마다 지도를 한 번만 만들고 렌더링한 결과(MapArtefact)를 보관하고,
+  화면에는 같은 컴포넌트에 보관해 둔 문자열만 넘깁니다.
+- 지도 범위에 따라 바뀌는 마커는 별도 레이어(FeatureGroup)로 렌더링해 넘기므로,
+  지도를 움직여도 기본 지도는 다시 만들지 않고(화면 위치도 유지) 마커 레이어만 바뀝니다.
+- streamlit-folium 내부 함수를 사용하므로, 버전이 달라 찾을 수 없거나 호출이 실패하면 st_folium 으로 매번 렌더링합니다.
+"""
+
+import time
+
+import folium
+import streamlit as st
+import streamlit_folium
+from streamlit_folium import st_folium
+
+from shared.profiling import span
+
+# 프로세스 하나가 기억해 둘 지도 수 (가장 오래 쓰이지 않은 것부터 제거)
+MAX_CACHED_MAPS = 16
+
+_INTERNALS = (
+    "_component_func", "_get_html", "_get_header", "_get_map_string", "_get_feature_group_string",
+    "generate_js_hash", "get_full_id",
+)
+HAS_ARTEFACT_API = all(hasattr(streamlit_folium, name) for name in _INTERNALS)
+
+
+class MapArtefact:
+    """렌더링이 끝난 지도 조각(script/header/html)과 필요한 CSS·JS 링크, 생성 시간"""
+
+    def __init__(self, m):
+        m.get_root().render()
+        m.render()
+        # _get_map_string 이 지도 구조를 바꾸므로 html/header 를 먼저 만듭니다. (st_folium 과 같은 순서)
+        self.html = streamlit_folium._get_html(m)
+        self.header = streamlit_folium._get_header(m)
+        self.script = streamlit_folium._get_map_string(m)
+        self.map_id = streamlit_folium.get_full_id(m)
+
+        south_west, north_east = m.get_bounds()
+        self.bounds = {
+            "_southWest": {"lat": south_west[0], "lng": south_west[1]},
+            "_northEast": {"lat": north_east[0], "lng": north_east[1]},
+        }
+        self.zoom = m.options.get("zoom")
+
+        self.css_links, self.js_links = _links(m)
+
+        self.build_seconds = 0.0
+        self.render_seconds = 0.0
+
+    @property
+    def size(self):
+        """브라우저로 보내는 HTML/JS 문자열 크기 (바이트)"""
+        return sum(len(text.encode("utf-8")) for text in (self.script, self.header, self.html))
+
+
+def _walk(element):
+    if isinstance(element, folium.elements.JSCSSMixin):
+        yield element
+    for child in getattr(element, "_children", {}).values():
+        yield from _walk(child)
+
+
+def _links(element):
+    """element 와 하위 요소가 필요로 하는 (CSS 링크, JS 링크) 목록 (중복 제거, 순서 유지)"""
+    css_links, js_links = [], []
+    for child in _walk(element):
+        css_links.extend(href for _, href in getattr(child, "default_css", []))
+        js_links.extend(src for _, src in getattr(child, "default_js", []))
+    return list(dict.fromkeys(css_links)), list(dict.fromkeys(js_links))
+
+
+def render_map(build):
+    """build() 로 지도를 만들고 렌더링까지 끝낸 MapArtefact 를 반환합니다. (만들기·렌더링 시간을 기록)"""
+    start = time.perf_counter()
+    m = build()
+    built = time.perf_counter()
+    artefact = MapArtefact(m)
+    artefact.build_seconds = built - start
+    artefact.render_seconds = time.perf_counter() - built
+    return artefact
+
+
+@st.cache_resource(max_entries=MAX_CACHED_MAPS, show_spinner=False)
+def _cached_artefact(name, version, params, _build):
+    # (name, version, params) 만 캐시 키로 쓰고, 지도 생성 함수(_build)는 해시에서 제외합니다.
+    return render_map(_build)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_MAPS * 8, show_spinner=False)
+def _cached_layer(name, version, params, _build):
+    # 레이어 문자열만 필요하므로 임시 지도에 붙여 렌더링합니다. (보관된 기본 지도는 건드리지 않음)
+    group = _build()
+    script = streamlit_folium._get_feature_group_string(group, folium.Map(tiles=None))
+    css_links, js_links = _links(group)
+    return script, css_links, js_links
+
+
+def show_map(name, version, params, build, height=650, width=None, key=None, returned_objects=None, layer=None):
+    """
+    (name, version, params) 마다 한 번만 만든 지도를 화면에 표시하고 st_folium 과 같은 상호작용 결과를 반환합니다.
+    - version: 데이터 버전, params: 지도 내용을 결정하는 선택값 (높이 등 표시 옵션은 넣지 마세요)
+    - layer: 현재 지도 범위(st_folium 의 bounds dict, 처음에는 None)를 받아
+      (레이어 선택값, folium.FeatureGroup 을 만드는 함수) 를 돌려주는 함수. 레이어도 선택값마다 한 번만 렌더링합니다.
+    - streamlit-folium 내부 함수가 없거나 호출 방식이 달라 실패하면 st_folium 으로 그립니다.
+    """
+    if HAS_ARTEFACT_API:
+        try:
+            return _show_artefact(name, version, params, build, height, width, key, returned_objects, layer)
+        except Exception:  # 내부 함수의 인자·속성이 바뀐 버전 — 느리더라도 공개 API 로 그립니다.
+            pass
+    return _show_st_folium(name, build, height, width, key, returned_objects, layer)
+
+
+def _show_st_folium(name, build, height, width, key, returned_objects, layer):
+    """공개 API(st_folium)로 매번 지도를 만들고 렌더링합니다."""
+    with span("figure", name):
+        layer_group = layer(None)[1]() if layer is not None else None
+        m = build()
+    with span("render", name):
+        return st_folium(
+            m, key=key, height=height, width=width, returned_objects=returned_objects,
+            feature_group_to_add=layer_group,
+        )
+
+
+def _show_artefact(name, version, params, build, height, width, key, returned_objects, layer):
+    """캐시한 MapArtefact·레이어 문자열을 streamlit-folium 컴포넌트에 바로 넘깁니다. (내부 함수 사용)"""
+    with span("figure", name):
+        artefact = _cached_artefact(name, version, params, build)
+    component_key = streamlit_folium.generate_js_hash(artefact.script, key, False)
+    feature_group = None
+    css_links, js_links = artefact.css_links, artefact.js_links
+    if layer is not None:
+        # 직전 실행에서 브라우저가 보낸 지도 범위 (지도를 움직이면 그 범위로 다시 실행됩니다)
+        bounds = (st.session_state.get(component_key) or {}).get("bounds")
+        layer_params, build_layer = layer(bounds)
+        with span("figure", f"{name}.layer"):
+            feature_group, layer_css, layer_js = _cached_layer(name, version, (params, layer_params), build_layer)
+        css_links = list(dict.fromkeys(css_links + layer_css))
+        js_links = list(dict.fromkeys(js_links + layer_js))
+
+    defaults = {
+        "last_clicked": None,
+        "last_object_clicked": None,
+        "last_object_clicked_tooltip": None,
+        "last_object_clicked_popup": None,
+        "all_drawings": None,
+        "last_active_drawing": None,
+        "bounds": artefact.bounds,
+        "zoom": artefact.zoom,
+    }
+    if returned_objects is not None:
+        defaults = {k: v for k, v in defaults.items() if k in returned_objects}
+    with span("render", name):
+        return streamlit_folium._component_func(
+            script=artefact.script,
+            header=artefact.header,
+            html=artefact.html,
+            id=artefact.map_id,
+            key=component_key,
+            height=height,
+            width=width,
+            returned_objects=returned_objects,
+            default=defaults,
+            zoom=None,
+            center=None,
+            feature_group=feature_group,
+            return_on_hover=False,
+            layer_control=None,
+            pixelated=False,
+            css_links=css_links,
+            js_links=js_links,
+            wrap_longitude=False,
+        )
+
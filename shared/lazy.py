@@ -0,0 +1,66 @@
+"""
+무거운 라이브러리·데이터 모듈 지연 import
+- 페이지 맨 위에서 `from shared.lazy import px` 또는 `subway = lazy("shared.subway")` 처럼 가져오면
+  실제 import 는 처음 속성을 쓸 때 일어납니다. (제목·위젯이 먼저 화면에 그려지고 라이브러리 로딩은 그 뒤에)
+- 한 번 import 된 모듈은 sys.modules 에 남으므로, 다른 페이지로 이동하거나 다시 실행해도 비용이 없습니다.
+"""
+
+import importlib
+import sys
+import threading
+
+# 처음 import 에 수백 ms 이상 걸리는 라이브러리 (shared.warmup 이 미리 불러올 목록)
+HEAVY_MODULES = [
+    "numpy", "pandas", "pyarrow", "plotly.express", "plotly.graph_objects", "folium", "streamlit_folium",
+]
+
+
+class LazyModule:
+    """속성에 처음 접근할 때 import 하는 모듈 대리 객체"""
+
+    __slots__ = ("_name", "_module", "_lock")
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def loaded(self):
+        """이미 import 되었는지 (이 객체를 통하지 않고 import 된 경우 포함)"""
+        return self._module is not None or self._name in sys.modules
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+_modules = {}
+_modules_lock = threading.Lock()
+
+
+def lazy(name):
+    """name 모듈의 지연 import 대리 객체 (같은 이름이면 같은 객체)"""
+    with _modules_lock:
+        if name not in _modules:
+            _modules[name] = LazyModule(name)
+        return _modules[name]
+
+
+np = lazy("numpy")
+pd = lazy("pandas")
+px = lazy("plotly.express")
+go = lazy("plotly.graph_objects")
@@ -0,0 +1,58 @@
+"""
+국가별 MBTI 16유형 비율(countriesMBTI_16types.csv) 로더
+- 파일 내용 버전(shared.datasets)마다 한 번만 읽어 국가 × 유형 행렬(MbtiMatrix)로 만들고,
+  프로세스 안의 모든 세션이 같은 객체를 공유합니다.
+- 나라 간 거리·군집(MbtiSimilarity)도 파일 버전마다 한 번만 계산합니다.
+- 둘 다 shared.precompute 작업으로 등록되어, 파일이 바뀌면 프로세스 풀에서 새로 만드는 동안 이전 결과를 보여 줍니다.
+"""
+
+import streamlit as st
+
+from shared.datasets import content_key, dataset_version, get_dataset, register_derived
+from shared.mbti_matrix import MbtiMatrix
+from shared.mbti_similarity import MbtiSimilarity
+from shared.memory import track
+from shared.precompute import build, register, serve
+
+DATASET = get_dataset("mbti")
+MBTI_CSV = DATASET.path
+
+
+def compute_mbti_matrix(version):
+    # version: (경로, 내용 해시) — precompute 작업 함수 (자식 프로세스에서도 실행)
+    df = DATASET.read(version[0])
+    df.columns = [c.strip() for c in df.columns]
+    return MbtiMatrix(df, version=version)
+
+
+def compute_mbti_similarity(version):
+    matrix = build("mbti_matrix", version)
+    return MbtiSimilarity(matrix.countries, matrix.values, version=version)
+
+
+register("mbti_matrix", "mbti", "shared.mbti:compute_mbti_matrix")
+register("mbti_similarity", "mbti", "shared.mbti:compute_mbti_similarity")
+
+
+@st.cache_resource(show_spinner=False)
+def _build_mbti_matrix(version):
+    # version: (경로, 내용 해시) — 캐시 키로 사용합니다. (파일 내용이 바뀌면 새로 읽음)
+    return track("mbti", "matrix", build("mbti_matrix", version))
+
+
+@st.cache_resource(show_spinner="나라 간 거리를 계산하는 중...")
+def _build_mbti_similarity(version):
+    return track("mbti", "similarity", build("mbti_similarity", version))
+
+
+register_derived("mbti", _build_mbti_matrix, _build_mbti_similarity)
+
+
+def load_mbti(path=MBTI_CSV):
+    """국가 × 유형 비율 행렬(MbtiMatrix)을 반환합니다. 반환된 배열은 모든 세션이 공유하므로 수정하지 마세요."""
+    return serve("mbti_matrix", content_key(dataset_version("mbti", path)), _build_mbti_matrix)
+
+
+def load_mbti_similarity(path=MBTI_CSV):
+    """나라 간 거리·가까운 나라·군집(MbtiSimilarity)을 반환합니다. 파일 버전마다 한 번만 계산합니다."""
+    return serve("mbti_similarity", content_key(dataset_version("mbti", path)), _build_mbti_similarity)
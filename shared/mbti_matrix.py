@@ -0,0 +1,115 @@
+"""
+국가 × MBTI 16유형 비율 행렬(MbtiMatrix)
+- 비율을 float32 2차원 배열 [국가, 유형] 으로 보관하고,
+  유형별 내림차순 순위(argsort), 한국 위치, 막대 라벨·색상 배열을 읽을 때 한 번만 만들어 둡니다.
+  라벨은 천분율 int16, 색상은 팔레트 번호 uint8 로 보관하고 그릴 막대만 문자열로 바꿉니다.
+- 유형을 바꾸면 미리 만든 순위 배열로 값을 모으기(gather)만 하므로 정렬·파이썬 반복이 없습니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+COUNTRY_COL = "Country"
+KOREA_NAMES = {"south korea", "korea, republic of", "korea"}
+
+KOREA_COLOR = "rgba(0, 102, 255, 0.9)"  # 한국: 파란색
+TOP_COLOR = "rgba(255, 215, 0, 1)"      # 1등: 노랑색
+OTHER_COLOR = "rgba(150,150,150,0.6)"   # 나머지: 회색
+PALETTE = np.array([OTHER_COLOR, KOREA_COLOR, TOP_COLOR], dtype=object)
+
+MISSING_MILLI = np.iinfo(np.int16).min  # 비율이 비어 있는 칸의 천분율 (라벨은 빈 문자열)
+
+
+class MbtiMatrix:
+    """[국가, 유형] float32 비율 + 유형별 순위·라벨·색상 배열"""
+
+    def __init__(self, df, version=None):
+        # version: 원본 데이터 버전 (그래프 캐시 등 파생 결과의 키로 사용)
+        self.version = version
+        self.types = [col for col in df.columns if col != COUNTRY_COL]
+        self.countries = df[COUNTRY_COL].astype(str).to_numpy(dtype=object)
+        values = df[self.types].to_numpy(dtype=np.float64)
+        self.values = values.astype(np.float32)
+        self._type_pos = {name: i for i, name in enumerate(self.types)}
+        self._country_pos = {name: i for i, name in enumerate(self.countries)}
+
+        # 라벨은 원본(float64) 값의 '%.3f' 문자열을 천분율 정수로 보관합니다. (문자열로 되돌려도 같은 라벨, 빈 값은 MISSING_MILLI)
+        # 값 × 1000 을 반올림하면 이진 소수 오차와 짝수 반올림 때문에 '%.3f' 와 다른 라벨이 나옵니다.
+        missing = np.isnan(values)
+        text = np.char.mod("%.3f", np.where(missing, 0.0, values))
+        self.milli = np.char.replace(text, ".", "").astype(np.int16)
+        self.milli[missing] = MISSING_MILLI
+
+        # order[t] = t 유형 비율이 높은 순서의 국가 위치 (같은 값이면 파일 순서)
+        self.order = np.argsort(-values, axis=0, kind="stable").T.astype(np.int32)
+
+        self.korea = np.array([name.lower() in KOREA_NAMES for name in self.countries], dtype=bool)
+
+        # 순위 순서대로의 막대 색상 [유형, 순위] (한국 > 1등 > 나머지 순으로 우선)
+        colors = self.korea[self.order].astype(np.uint8)
+        top_not_korea = ~self.korea[self.order[:, 0]]
+        colors[top_not_korea, 0] = 2
+        self.color_codes = colors
+
+    @staticmethod
+    def format_labels(milli):
+        """천분율 정수 배열 → '0.123' 라벨 문자열 배열 (빈 값은 '')"""
+        milli = np.asarray(milli)
+        return np.where(milli == MISSING_MILLI, "", np.char.mod("%.3f", milli / 1000)).astype(object)
+
+    def labels(self, country):
+        """한 국가의 16유형 막대 라벨"""
+        return self.format_labels(self.milli[self._country_pos[country]])
+
+    def __len__(self):
+        return len(self.countries)
+
+    def type_index(self, mbti_type):
+        return self._type_pos[mbti_type]
+
+    def country_index(self, country):
+        return self._country_pos[country]
+
+    def ranked(self, mbti_type):
+        """
+        한 유형의 비율이 높은 순서 → (국가, 비율, 라벨, 색상) 배열.
+        미리 만든 순위 배열로 모으기만 하므로 정렬하지 않습니다.
+        """
+        t = self._type_pos[mbti_type]
+        order = self.order[t]
+        labels = self.format_labels(self.milli[order, t])
+        return self.countries[order], self.values[order, t], labels, PALETTE[self.color_codes[t]]
+
+    def ranked_top(self, mbti_type, k):
+        """
+        ranked() 의 상위 k 개 + (k 밖에 있으면) 한국, 나머지 국가의 평균 비율과 개수.
+        반환: (국가, 비율, 라벨, 색상, 나머지 평균 또는 None, 나머지 개수)
+        """
+        t = self._type_pos[mbti_type]
+        order = self.order[t]
+        ranks = np.arange(min(k, len(order)))
+        ranks = np.concatenate([ranks, k + np.flatnonzero(self.korea[order[k:]])])
+        rows = order[ranks]
+        rest = len(order) - len(rows)
+        others = (self.values[:, t].sum(dtype=np.float64) - self.values[rows, t].sum(dtype=np.float64)) / rest if rest else None
+        labels = self.format_labels(self.milli[rows, t])
+        return self.countries[rows], self.values[rows, t], labels, PALETTE[self.color_codes[t, ranks]], others, rest
+
+    def compare(self, types, top_n=None, sort_by=None):
+        """
+        여러 유형을 비교할 국가 × 유형 DataFrame.
+        sort_by 유형(기본: 선택한 유형 비율 합계)이 높은 순으로 top_n 개 국가만 남깁니다.
+        """
+        columns = [self._type_pos[name] for name in types]
+        block = self.values[:, columns]
+        if sort_by is not None:
+            order = self.order[self._type_pos[sort_by]]
+        else:
+            order = np.argsort(-block.sum(axis=1), kind="stable")
+        if top_n is not None:
+            order = order[:top_n]
+        return pd.DataFrame(block[order], index=pd.Index(self.countries[order], name=COUNTRY_COL), columns=list(types))
+
+    def profile(self, country):
+        """한 국가의 16유형 비율 (유형 순서 배열, 배열 슬라이스라 복사 없음)"""
+        return self.values[self._country_pos[country]]
@@ -0,0 +1,217 @@
+"""
+MBTI 유형 분포가 비슷한 나라 찾기 / 나라 묶기(군집)
+- 국가 × 16유형 비율을 행 합계 1 로 정규화한 float32 행렬을 만들고,
+  코사인 거리와 젠슨-섀넌(Jensen-Shannon) 거리를 데이터 버전마다 한 번만 계산합니다.
+- 행 수가 적으면(FULL_MATRIX_MAX 이하) N×N 거리 행렬을 통째로 보관하고,
+  많으면(지역 단위 등 수만 행) 행 묶음(block)별로 거리를 계산해 가까운 top-k 만 남깁니다.
+- 군집은 k-means(모든 크기)와 Ward 계층 군집(HIERARCHICAL_MAX 이하)을 미리 계산해 둡니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+METRICS = {"js": "젠슨-섀넌", "cosine": "코사인"}
+CLUSTER_METHODS = {"kmeans": "k-means", "hierarchical": "계층 군집"}
+
+TOP_K = 20                      # 나라마다 미리 저장해 둘 가까운 나라 수
+N_CLUSTERS = 6
+FULL_MATRIX_MAX = 4096          # 이 행 수까지는 N×N 거리 행렬을 보관
+HIERARCHICAL_MAX = 1000         # 계층 군집(O(N³))을 계산할 최대 행 수
+BLOCK_BYTES = 8 * 1024 * 1024   # 행 묶음 하나의 임시 배열 크기 상한
+KMEANS_SEED = 0
+
+
+def normalize_rows(values):
+    """각 행을 합계 1 인 분포로 맞춘 float32 배열 (음수는 0, 합계가 0 인 행은 그대로 0)"""
+    values = np.clip(np.asarray(values, dtype=np.float64), 0, None)
+    totals = values.sum(axis=1, keepdims=True)
+    return np.divide(values, totals, out=np.zeros_like(values), where=totals > 0).astype(np.float32)
+
+
+def _entropy(p):
+    """마지막 축 기준 엔트로피(밑 2). 0 log 0 = 0"""
+    logs = np.log2(np.maximum(p, np.finfo(p.dtype).tiny))
+    return -(p * logs).sum(axis=-1, dtype=np.float64)
+
+
+def cosine_distance(rows, matrix):
+    """rows(b, d) 와 matrix(n, d) 사이 코사인 거리 (b, n)"""
+    def unit(x):
+        norms = np.linalg.norm(x, axis=1, keepdims=True)
+        return np.divide(x, norms, out=np.zeros_like(x), where=norms > 0)
+
+    return np.clip(1.0 - unit(rows) @ unit(matrix).T, 0.0, 2.0)
+
+
+def js_distance(rows, matrix):
+    """
+    rows(b, d) 와 matrix(n, d) 분포 사이 젠슨-섀넌 거리 (b, n), 0~1
+    (b, n, d) 배열을 만들지 않고 유형(d)마다 (b, n) 배열에 제자리 연산으로 누적합니다.
+    (안쪽 축이 16 처럼 짧으면 브로드캐스트·합계가 매우 느리기 때문)
+    """
+    rows = np.asarray(rows, dtype=np.float32)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    tiny = np.finfo(np.float32).tiny
+    # 엔트로피 차이는 값이 비슷할수록 자릿수 손실이 커서 누적만 float64 로 합니다.
+    mix_entropy = np.zeros((len(rows), len(matrix)), dtype=np.float64)
+    mixture = np.empty((len(rows), len(matrix)), dtype=np.float32)
+    logs = np.empty_like(mixture)
+    for column in range(rows.shape[1]):
+        np.add.outer(rows[:, column], matrix[:, column], out=mixture)
+        mixture *= 0.5
+        np.maximum(mixture, tiny, out=logs)
+        np.log2(logs, out=logs)
+        logs *= mixture
+        mix_entropy -= logs
+    divergence = mix_entropy - 0.5 * (_entropy(rows)[:, None] + _entropy(matrix)[None, :])
+    return np.sqrt(np.clip(divergence, 0.0, 1.0))
+
+
+_DISTANCES = {"js": js_distance, "cosine": cosine_distance}
+
+
+def _block_rows(n):
+    """(b, n) float32 임시 배열 4개가 BLOCK_BYTES 를 넘지 않는 행 묶음 크기"""
+    return max(1, BLOCK_BYTES // max(1, n * 4 * 4))
+
+
+def pairwise_blocks(matrix, metric):
+    """행 묶음별 (시작 행, 거리 (b, n) float32) 를 차례로 돌려줍니다. 전체 N×N 을 한 번에 만들지 않습니다."""
+    distance = _DISTANCES[metric]
+    n = len(matrix)
+    step = _block_rows(n)
+    for start in range(0, n, step):
+        yield start, distance(matrix[start:start + step], matrix).astype(np.float32)
+
+
+def _top_k(block, start, k):
+    """거리 묶음에서 자기 자신을 뺀 가까운 k 개 (위치, 거리) — argpartition 후 k 개만 정렬"""
+    block = block.copy()
+    rows = np.arange(len(block))
+    block[rows, start + rows] = np.inf
+    k = min(k, block.shape[1] - 1)
+    if k <= 0:
+        return np.empty((len(block), 0), dtype=np.int32), np.empty((len(block), 0), dtype=np.float32)
+    part = np.argpartition(block, k - 1, axis=1)[:, :k]
+    part_dist = np.take_along_axis(block, part, axis=1)
+    order = np.argsort(part_dist, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1).astype(np.int32), np.take_along_axis(part_dist, order, axis=1)
+
+
+def kmeans(x, k, seed=KMEANS_SEED, iterations=100):
+    """k-means++ 로 시작하는 Lloyd k-means. 군집 번호(int32) 배열을 반환합니다."""
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    k = min(k, n)
+    rng = np.random.default_rng(seed)
+    squared = (x ** 2).sum(axis=1)
+
+    def sq_dist(centers):
+        return np.maximum(squared[:, None] - 2 * x @ centers.T + (centers ** 2).sum(axis=1)[None, :], 0)
+
+    centers = x[[rng.integers(n)]]
+    for _ in range(1, k):
+        nearest = sq_dist(centers).min(axis=1)
+        probs = nearest / nearest.sum() if nearest.sum() > 0 else None
+        centers = np.vstack([centers, x[rng.choice(n, p=probs)]])
+
+    labels = np.zeros(n, dtype=np.int32)
+    for step in range(iterations):
+        new_labels = sq_dist(centers).argmin(axis=1).astype(np.int32)
+        if step and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, x)
+        sizes = np.bincount(labels, minlength=k)[:, None]
+        centers = np.where(sizes > 0, sums / np.maximum(sizes, 1), centers)
+    return _relabel(labels)
+
+
+def ward_linkage(x, k):
+    """
+    Ward 계층 군집(군집 안 분산 증가가 가장 작은 두 군집부터 합침)으로 k 개가 될 때까지 합칩니다.
+    Lance-Williams 식으로 합친 군집의 거리를 갱신합니다. 군집 번호(int32) 배열을 반환합니다.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    squared = (x ** 2).sum(axis=1)
+    dist = np.maximum(squared[:, None] - 2 * x @ x.T + squared[None, :], 0)
+    np.fill_diagonal(dist, np.inf)
+    sizes = np.ones(n)
+    labels = np.arange(n)
+    for _ in range(n - min(k, n)):
+        i, j = np.unravel_index(np.argmin(dist), dist.shape)
+        i, j = min(i, j), max(i, j)
+        total = sizes[i] + sizes[j] + sizes
+        merged = ((sizes[i] + sizes) * dist[i] + (sizes[j] + sizes) * dist[j] - sizes * dist[i, j]) / total
+        dist[i, :] = dist[:, i] = merged
+        dist[i, i] = np.inf
+        dist[j, :] = dist[:, j] = np.inf
+        sizes[i] += sizes[j]
+        labels[labels == j] = i
+    return _relabel(labels)
+
+
+def _relabel(labels):
+    """군집 번호를 처음 나오는 순서대로 0, 1, 2 ... 로 바꿉니다."""
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.int32)
+    rank[np.argsort(first, kind="stable")] = np.arange(len(first), dtype=np.int32)
+    return rank[inverse]
+
+
+class MbtiSimilarity:
+    """국가 간 거리(코사인/젠슨-섀넌), 가까운 나라 top-k, 군집 결과"""
+
+    def __init__(self, countries, values, version=None, top_k=TOP_K, n_clusters=N_CLUSTERS):
+        # version: 원본 데이터 버전 (그래프 캐시 등 파생 결과의 키로 사용)
+        self.version = version
+        self.countries = np.asarray(countries, dtype=object)
+        self._position = {name: i for i, name in enumerate(self.countries)}
+        self.matrix = normalize_rows(values)
+        n = len(self.matrix)
+
+        # 행 묶음별로 거리를 계산해 top-k 만 남기고, 작은 데이터면 전체 행렬도 보관합니다.
+        self.distances = {}
+        self.neighbors = {}
+        for metric in METRICS:
+            full = np.empty((n, n), dtype=np.float32) if n <= FULL_MATRIX_MAX else None
+            index = np.empty((n, min(top_k, max(n - 1, 0))), dtype=np.int32)
+            dist = np.empty(index.shape, dtype=np.float32)
+            for start, block in pairwise_blocks(self.matrix, metric):
+                stop = start + len(block)
+                if full is not None:
+                    full[start:stop] = block
+                index[start:stop], dist[start:stop] = _top_k(block, start, top_k)
+            if full is not None:
+                self.distances[metric] = full
+            self.neighbors[metric] = (index, dist)
+
+        self.clusters = {"kmeans": kmeans(self.matrix, n_clusters)}
+        if n <= HIERARCHICAL_MAX:
+            self.clusters["hierarchical"] = ward_linkage(self.matrix, n_clusters)
+
+    def __len__(self):
+        return len(self.countries)
+
+    def most_similar(self, country, k=10, metric="js"):
+        """country 와 분포가 가까운 나라 k 개 → DataFrame(Country, 거리). 미리 계산한 결과만 사용합니다."""
+        i = self._position[country]
+        index, dist = self.neighbors[metric]
+        if k > index.shape[1] and metric in self.distances:
+            # 저장해 둔 top-k 보다 많이 원하면 전체 거리 행렬의 한 행을 정렬합니다.
+            row = self.distances[metric][i].copy()
+            row[i] = np.inf
+            order = np.argsort(row, kind="stable")[:min(k, len(row) - 1)]
+            return pd.DataFrame({"Country": self.countries[order], "거리": row[order]})
+        return pd.DataFrame({"Country": self.countries[index[i, :k]], "거리": dist[i, :k]})
+
+    def cluster_of(self, country, method="kmeans"):
+        """country 와 같은 군집에 속한 나라 목록 (파일 순서, 자기 자신 포함)"""
+        labels = self.clusters[method]
+        return list(self.countries[labels == labels[self._position[country]]])
+
+    def cluster_table(self, method="kmeans"):
+        """모든 나라의 군집 번호 DataFrame(Country, 군집)"""
+        return pd.DataFrame({"Country": self.countries, "군집": self.clusters[method] + 1})
@@ -0,0 +1,133 @@
+"""
+데이터 dtype 정리와 메모리 사용량 보고
+- normalize(df): 기본 dtype(object 문자열, int64)으로 읽힌 프레임을 작은 dtype 으로 바꿉니다.
+  반복되는 문자열 → category, 나머지 문자열 → string[pyarrow], 정수 → int32(값이 들어가면), 선언한 컬럼 → float32 등
+- nbytes(obj): 배열·프레임과 그것을 담은 객체(속성·dict·list·set)가 실제로 차지하는 바이트 (같은 객체는 한 번만 셈)
+- 로더가 track(데이터셋, 이름, 객체) 로 캐시에 올린 객체를 알려 두면 report() 가 데이터셋별 메모리 표를 만듭니다.
+  (약한 참조만 보관하므로 캐시에서 빠진 객체는 표에서도 사라집니다)
+"""
+
+import sys
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# 고유값 수가 행 수의 이 비율 이하인 문자열 컬럼은 category 로 바꿉니다.
+CATEGORY_MAX_RATIO = 0.5
+
+_tracked = {}   # (데이터셋, 이름) → weakref
+_lock = threading.Lock()
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+
+def normalize(df, dtypes=None):
+    """
+    df 의 컬럼 dtype 을 메모리가 작은 것으로 바꾼 새 프레임을 반환합니다. (값은 같음)
+    - dtypes 에 적힌 컬럼은 그 dtype 으로 (예: 비율 컬럼을 'float32' 로)
+    - 문자열: 고유값이 적으면(CATEGORY_MAX_RATIO) category, 아니면 string[pyarrow]
+    - 정수: 값이 들어가면 int32
+    - 실수는 좌표처럼 정밀도가 필요한 값일 수 있어 dtypes 에 적은 경우에만 바꿉니다.
+    """
+    dtypes = dtypes or {}
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col in dtypes:
+            columns[col] = series.astype(dtypes[col])
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            columns[col] = series
+        elif _is_text(series):
+            repeated = series.nunique() <= max(1, len(series) * CATEGORY_MAX_RATIO)
+            columns[col] = series.astype("category" if repeated else "string[pyarrow]")
+        elif pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            columns[col] = _narrow_int(series)
+        else:
+            columns[col] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _narrow_int(series):
+    """
+    값 범위가 맞으면 int32 로. (부호 없는 정수는 뺄셈에서 넘쳐 돌아가고,
+    int16 이하는 합산 때 넘치기 쉬워 쓰지 않습니다)
+    """
+    info = np.iinfo(np.int32)
+    if series.empty or (info.min <= series.min() and series.max() <= info.max):
+        return series.astype(np.int32)
+    return series
+
+
+def nbytes(obj, _seen=None):
+    """obj 와 obj 가 참조하는 배열·프레임·컨테이너의 메모리 (바이트, 같은 객체는 한 번만)"""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(obj, pd.Index):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        # view 는 원본 배열을 한 번만 셉니다. (pickle 에서 읽은 배열도 읽은 버퍼 배열의 view)
+        root = obj
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        size = 0
+        if root is obj or id(root) not in seen:
+            seen.add(id(root))
+            size = root.nbytes
+        if obj.dtype == object:
+            size += sum(nbytes(item, seen) for item in obj.ravel())
+        return size
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(obj)
+    if hasattr(obj, "nbytes") and not hasattr(obj, "__dict__"):
+        return int(obj.nbytes)  # pyarrow Table/Array 등
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(nbytes(k, seen) + nbytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(nbytes(item, seen) for item in obj)
+    else:
+        attrs = getattr(obj, "__dict__", None)
+        if attrs is not None:
+            size += nbytes(attrs, seen)
+        for name in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, name):
+                size += nbytes(getattr(obj, name), seen)
+    return size
+
+
+def track(dataset, name, obj):
+    """캐시에 올린 obj 를 dataset 의 메모리 보고에 포함시킵니다. obj 를 그대로 반환"""
+    try:
+        ref = weakref.ref(obj)
+    except TypeError:
+        return obj  # 약한 참조를 만들 수 없는 객체(tuple 등)는 건너뜀
+    with _lock:
+        _tracked[(dataset, name)] = ref
+    return obj
+
+
+def report():
+    """지금 메모리에 있는 (데이터셋, 이름)별 바이트 → [{'dataset', 'name', 'MB'}] (데이터셋 순, 큰 순)"""
+    with _lock:
+        items = list(_tracked.items())
+    rows = []
+    for (dataset, name), ref in items:
+        obj = ref()
+        if obj is None:
+            with _lock:
+                if _tracked.get((dataset, name)) is ref:
+                    del _tracked[(dataset, name)]
+            continue
+        rows.append({"dataset": dataset, "name": name, "MB": nbytes(obj) / 2**20})
+    return sorted(rows, key=lambda row: (row["dataset"], -row["MB"]))
@@ -0,0 +1,12 @@
+"""
+프로젝트 경로 설정
+- 페이지 스크립트가 어느 폴더에서 실행되든 같은 파일을 가리키도록 루트 기준 절대경로를 사용합니다.
+"""
+
+from pathlib import Path
+
+# 저장소 루트 (main.py 와 CSV 파일들이 있는 폴더)
+ROOT = Path(__file__).resolve().parent.parent
+
+# 변환된 컬럼형 파일 등을 저장하는 캐시 폴더
+CACHE_DIR = ROOT / ".cache"
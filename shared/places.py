@@ -0,0 +1,52 @@
+"""
+서울 관광지(places.csv)·지하철역 좌표(stations.csv) 로더
+- 파일 내용 버전(shared.datasets)마다 한 번만 읽어 관광지 인덱스(PlaceIndex)를 만들고,
+  프로세스 안의 모든 세션이 같은 객체를 공유합니다.
+- 두 파일 중 하나가 바뀌면 관광지 인덱스와 그것으로 만든 지도 캐시를 비웁니다.
+"""
+
+import os
+
+import streamlit as st
+
+from shared.datasets import content_key, dataset_version, get_dataset, register_derived
+from shared.memory import track
+from shared.places_index import PlaceIndex
+
+PLACES = get_dataset("places")
+STATIONS = get_dataset("stations")
+PLACES_CSV = PLACES.path
+STATIONS_CSV = STATIONS.path
+
+PLACE_COLUMNS = ["rank", "name", "lat", "lon", "desc", "reason", "station", "url"]
+
+
+@st.cache_resource(show_spinner=False)
+def _build_place_index(places_version, stations_version):
+    # (경로, 내용 해시) 는 캐시 키로만 사용합니다. (파일 내용이 바뀌면 새로 읽음)
+    df = PLACES.read(places_version[0])
+    missing = [col for col in PLACE_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"관광지 파일에 컬럼이 없습니다: {', '.join(missing)}")
+
+    stations = STATIONS.read(stations_version[0]) if stations_version[1] is not None else None
+    return track("places", "index", PlaceIndex(df, stations, version=(places_version, stations_version)))
+
+
+# 지도 캐시는 shared.folium_map 이 이미 import 된 경우에만 비웁니다.
+MAP_CACHES = ["shared.folium_map:_cached_artefact", "shared.folium_map:_cached_layer"]
+register_derived("places", _build_place_index, *MAP_CACHES)
+register_derived("stations", _build_place_index, *MAP_CACHES)
+
+
+def load_places(path=PLACES_CSV, stations_path=STATIONS_CSV):
+    """
+    관광지 인덱스(PlaceIndex)를 반환합니다. 역 좌표 파일이 없으면 가장 가까운 역은 계산하지 않습니다.
+    반환된 객체는 모든 세션이 공유하므로 수정하지 마세요.
+    """
+    places_version = content_key(dataset_version("places", path))
+    if os.path.exists(stations_path):
+        stations_version = content_key(dataset_version("stations", stations_path))
+    else:
+        stations_version = (str(stations_path), None)
+    return _build_place_index(places_version, stations_version)
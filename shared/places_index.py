@@ -0,0 +1,87 @@
+"""
+관광지(POI) 목록 인덱스
+- 이름 → 관광지 정보 dict 와 위도·경도 격자 인덱스를 한 번만 만들어 둡니다.
+  (마커 클릭 시 이름으로 바로 찾고, 지도 범위 안의 관광지만 골라 보냄)
+- 역 좌표가 있으면 관광지마다 가장 가까운 지하철역과 거리를 미리 계산합니다.
+"""
+
+import numpy as np
+
+from shared.spatial import GridIndex
+
+
+class StationLocator:
+    """역 좌표 목록 → 가장 가까운 역 찾기"""
+
+    def __init__(self, stations):
+        self.names = stations["역명"].astype(str).to_numpy(dtype=object)
+        self.grid = GridIndex(stations["위도"], stations["경도"])
+
+    def __len__(self):
+        return len(self.names)
+
+    def nearest(self, lat, lon):
+        """가장 가까운 역 (역명, 거리 m). 역이 없으면 (None, inf)"""
+        position, distance = self.grid.nearest(lat, lon)
+        return (self.names[position] if position >= 0 else None), distance
+
+
+class PlaceIndex:
+    """순위 순 관광지 목록 + 이름 사전 + 격자 인덱스 + 가장 가까운 역"""
+
+    def __init__(self, df, stations=None, version=None):
+        # version: 원본 데이터 버전 (지도 캐시 등 파생 결과의 키로 사용)
+        self.version = version
+        df = df.sort_values("rank", kind="stable").reset_index(drop=True)
+        self.records = df.to_dict("records")
+        self.names = [record["name"] for record in self.records]
+        self._by_name = {record["name"]: record for record in self.records}
+        self.grid = GridIndex(df["lat"], df["lon"])
+
+        self.stations = StationLocator(stations) if stations is not None else None
+        if self.stations is not None:
+            for record in self.records:
+                name, distance = self.stations.nearest(record["lat"], record["lon"])
+                record["nearest_station"] = name
+                record["nearest_station_m"] = distance
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, name):
+        """이름으로 관광지 정보 찾기 (없으면 None)"""
+        return self._by_name.get(name)
+
+    def within(self, box=None, limit=None):
+        """
+        상위 limit 개(순위 기준) 중 box=(남, 서, 북, 동) 범위 안의 관광지 목록 (순위 순).
+        box 가 None 이면 범위 제한 없이 상위 limit 개.
+        """
+        limit = len(self.records) if limit is None else limit
+        if box is None:
+            return self.records[:limit]
+        positions = self.grid.within(*box)
+        return [self.records[i] for i in positions[positions < limit]]
+
+    def nearest_station(self, lat, lon):
+        """임의 좌표에서 가장 가까운 역 (역명, 거리 m)"""
+        if self.stations is None:
+            return None, float("inf")
+        return self.stations.nearest(lat, lon)
+
+
+def snap_box(bounds, cell, pad=1):
+    """
+    st_folium 의 bounds dict 를 격자 칸 단위로 바깥쪽으로 넓힌 (남, 서, 북, 동) 으로 바꿉니다.
+    조금씩 움직여도 같은 값이 나오므로 마커 레이어 캐시를 다시 씁니다. 범위가 없으면 None
+    """
+    try:
+        south, west = bounds["_southWest"]["lat"], bounds["_southWest"]["lng"]
+        north, east = bounds["_northEast"]["lat"], bounds["_northEast"]["lng"]
+    except (KeyError, TypeError):
+        return None
+    if None in (south, west, north, east):
+        return None
+    lower = np.floor(np.array([south, west]) / cell) - pad
+    upper = np.ceil(np.array([north, east]) / cell) + pad
+    return tuple(round(float(v) * cell, 6) for v in (lower[0], lower[1], upper[0], upper[1]))
@@ -0,0 +1,311 @@
+"""
+행정안전부 주민등록 연령별 인구(population.csv) 가공
+- "2025년10월_남_35세" 같은 넓은(wide) 컬럼 이름을 한 번에 (월, 성별, 나이)로 해석하고,
+  숫자 변환·합산을 컬럼 반복 없이 벡터 연산 한 번으로 처리합니다.
+- 화면에서는 행정구역 × 성별 × 나이 배열(AgeCube)을 사용하고,
+  업로드 파일은 내용 해시를 키로, 데모 데이터는 seed 를 키로,
+  루트의 population.csv 는 데이터셋 등록부(shared.datasets)의 파일 버전을 키로 변환 결과를 캐싱합니다.
+- 여러 달이 든 내보내기는 한 달(기본: 가장 최근 달, 화면에서 고를 수 있음)만 씁니다. (select_month)
+- 파일은 CHUNK_BYTES 씩 나눠 읽으며 조각마다 바로 AgeCube 합계로 줄입니다. (stream_cube)
+  → 전국 읍면동 × 여러 달 × 남/여/계 처럼 큰 파일도 문자열 표 전체를 메모리에 올리지 않습니다.
+- population.csv 의 AgeCube 는 shared.precompute 작업으로 등록되어,
+  파일이 바뀌면 프로세스 풀에서 새로 만드는 동안 이전 결과를 보여 줍니다.
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import streamlit as st
+
+from shared.age_cube import AGES, GENDERS, MAX_AGE, AgeCube
+from shared.datasets import content_key, dataset_version, get_dataset, register_derived
+from shared.encoding import SNIFF_BYTES, sniff_encoding
+from shared.memory import track
+from shared.precompute import build, register, serve
+
+REGION_COL = "행정구역"
+
+DATASET = get_dataset("population")
+POPULATION_CSV = DATASET.path
+
+# 큰 파일을 나눠 읽을 때 한 조각의 크기. pyarrow 는 조각을 30여 개 미리 읽어 두므로
+# 읽는 동안의 최대 메모리는 파일 크기와 관계없이 대략 CHUNK_BYTES × 35 + 결과 배열입니다.
+CHUNK_BYTES = 2**20
+
+# 서버 프로세스 하나가 기억해 둘 업로드 파일 수 (가장 오래 쓰이지 않은 것부터 제거)
+MAX_CACHED_UPLOADS = 8
+
+DEMO_SEED = 42
+DEMO_REGIONS = ["종로구", "중구", "강남구", "송파구", "은평구", "노원구", "광진구"]
+
+# "2025년10월_계_35세", "2025년10월_여_100세 이상", "남_5세", "35세" 등
+# (총인구수/연령구간인구수 같은 합계 컬럼은 나이가 없으므로 제외됩니다)
+AGE_COLUMN_PATTERN = (
+    r"^(?:(?P<year>\d{4})년\s*(?P<month>\d{1,2})월_)?"
+    r"(?:(?P<gender>계|남|여)_)?"
+    r"(?P<age>\d{1,3})세"
+)
+
+
+def parse_age_columns(columns):
+    """
+    컬럼 이름 목록을 해석해 나이 컬럼만 담은 DataFrame(col, 월, 성별, 나이)을 반환합니다.
+    월은 'YYYY-MM' (이름에 연월이 없으면 None), 성별 표기가 없으면 '계'로 봅니다.
+    """
+    columns = pd.Index(columns, dtype=object)
+    parts = columns.str.extract(AGE_COLUMN_PATTERN)
+    parts["col"] = columns
+    parts = parts.dropna(subset=["age"])
+    has_month = parts["year"].notna() & parts["month"].notna()
+    month = parts["year"].str.cat(parts["month"].str.zfill(2), sep="-").where(has_month, None)
+    return pd.DataFrame({
+        "col": parts["col"].to_numpy(),
+        "월": month.to_numpy(dtype=object),
+        "성별": parts["gender"].fillna("계").to_numpy(),
+        "나이": parts["age"].astype(np.int16).to_numpy(),
+    })
+
+
+def select_month(parsed, month=None):
+    """
+    여러 달이 들어 있는 내보내기에서 한 달의 나이 컬럼만 고릅니다. → (고른 컬럼, 파일의 달 목록, 고른 달)
+    - 달마다 같은 (성별, 나이) 컬럼이 있으므로 달을 합치면 인구가 달 수만큼 부풀려집니다. 한 달만 씁니다.
+    - month('YYYY-MM')를 주지 않으면 가장 최근 달, 파일에 없는 달이면 ValueError
+    - 이름에 연월이 없는 파일은 그대로 씁니다. (달 목록은 빈 목록, 고른 달은 None)
+    """
+    months = sorted(m for m in parsed["월"].dropna().unique())
+    if not months:
+        return parsed, [], None
+    if month is None:
+        month = months[-1]
+    elif month not in months:
+        raise ValueError(f"{month} 자료가 없습니다. (파일의 달: {', '.join(months)})")
+    return parsed[parsed["월"] == month].reset_index(drop=True), months, month
+
+
+def to_numeric_block(df, columns):
+    """
+    여러 컬럼을 한 번에 숫자(int32)로 변환합니다.
+    문자열이면 "1,234" 의 쉼표 제거와 정수 변환을 컬럼별이 아니라 전체 값에 대해 Arrow 연산 한 번으로 처리합니다.
+    """
+    block = df[list(columns)]
+    if all(pd.api.types.is_numeric_dtype(dtype) for dtype in block.dtypes):
+        values = block.to_numpy(dtype=np.float64)
+        return np.nan_to_num(values, nan=0.0).astype(np.int32)
+
+    # 컬럼 순서대로 이어 붙인 1차원 문자열 배열 (pandas 문자열 컬럼은 복사 없이 Arrow 로 넘어갑니다)
+    table = pa.Table.from_pandas(block, preserve_index=False)
+    return _strings_to_int32([column.combine_chunks() for column in table.columns], block.shape[0])
+
+
+def _strings_to_int32(arrays, n_rows):
+    """Arrow 문자열 컬럼 목록 → (행, 컬럼) int32 배열. 쉼표 제거·정수 변환을 이어 붙인 전체 값에 한 번만"""
+    flat = pa.concat_arrays([array.cast(pa.string()) for array in arrays])
+    flat = pc.utf8_trim_whitespace(pc.replace_substring(flat, ",", ""))
+    flat = pc.if_else(pc.equal(flat, ""), pa.scalar(None, pa.string()), flat)
+    try:
+        numbers = pc.cast(flat, pa.int64())
+    except pa.ArrowInvalid:
+        # "-" 같은 숫자가 아닌 값이 섞여 있으면 느리더라도 안전한 방식으로 변환
+        numbers = pa.array(pd.to_numeric(flat.to_pandas(), errors="coerce"), pa.float64())
+    values = numbers.fill_null(0).to_numpy(zero_copy_only=False)
+    return values.astype(np.int32).reshape(len(arrays), n_rows).T
+
+
+def to_cube(df, version=None, month=None):
+    """
+    넓은 형태의 인구 표를 AgeCube 로 변환합니다.
+    여러 달이 있으면 select_month 로 한 달(기본: 최근 달)만 쓰고, 그 달 안에서 같은 성별·나이 컬럼이 여러 개면 합산
+    """
+    parsed, months, month = select_month(parse_age_columns([c for c in df.columns if c != REGION_COL]), month)
+    values = to_numeric_block(df, parsed["col"])  # shape: (지역 수, 나이 컬럼 수)
+
+    region_codes, region_names = pd.factorize(df[REGION_COL].astype(str).str.strip())
+    counts = _sum_by(_gender_age_totals(values, parsed), region_codes, len(region_names), axis=0)
+    counts = counts.reshape(len(region_names), len(GENDERS), len(AGES))
+    return AgeCube(region_names, counts, version=version, months=months, month=month)
+
+
+def _gender_age_totals(values, parsed):
+    """(행, 나이 컬럼) 값 → (행, 성별 × 나이) 합계. 성별·나이가 같은 컬럼(100세 이상 등)은 합칩니다."""
+    genders = pd.Categorical(parsed["성별"], categories=GENDERS).codes.astype(np.int64)
+    ages = np.minimum(parsed["나이"].to_numpy(), MAX_AGE)
+    return _sum_by(values.astype(np.int64), genders * len(AGES) + ages, len(GENDERS) * len(AGES), axis=1)
+
+
+def _read_header(source, encoding):
+    """CSV 의 컬럼 이름 목록. source 가 파일 객체면 읽은 뒤 원래 위치로 되돌립니다."""
+    if hasattr(source, "seek"):
+        position = source.tell()
+        try:
+            return list(pd.read_csv(source, nrows=0, encoding=encoding).columns)
+        finally:
+            source.seek(position)
+    return list(pd.read_csv(source, nrows=0, encoding=encoding).columns)
+
+
+def stream_cube(source, encoding="utf-8", version=None, month=None, chunk_bytes=CHUNK_BYTES, progress=None):
+    """
+    넓은 형태 CSV 를 chunk_bytes 씩 읽으면서(pyarrow 스트리밍 CSV) 조각마다 숫자로 바꾸고
+    (행정구역, 성별, 나이) 합계로 줄여 AgeCube 를 만듭니다. 결과는 to_cube(전체 표) 와 같습니다.
+    - 문자열 표 전체를 만들지 않으므로 최대 메모리는 파일 크기가 아니라 chunk_bytes 와 행정구역 수에 비례합니다.
+    - '행정구역' 과 고른 달(select_month, 기본: 최근 달)의 나이 컬럼만 읽습니다. (총인구수 등 합계 컬럼은 건너뜀)
+    - progress(지금까지 읽은 행 수) 는 조각을 하나 처리할 때마다 호출됩니다.
+    '행정구역' 컬럼이 없으면 ValueError
+    """
+    header = _read_header(source, encoding)
+    if REGION_COL not in header:
+        raise ValueError(f"'{REGION_COL}' 컬럼이 없습니다.")
+    parsed, months, month = select_month(parse_age_columns([c for c in header if c != REGION_COL]), month)
+    columns = [REGION_COL, *parsed["col"]]
+    # 한 줄(헤더 포함)은 조각 하나에 들어가야 하므로, 컬럼이 아주 많은 파일은 조각을 헤더 길이에 맞춰 키웁니다.
+    block_size = max(chunk_bytes, 2 * len(",".join(header).encode("utf-8")))
+    reader = pacsv.open_csv(
+        source,
+        # 미리 읽기는 조각 수로 제한되므로, 조각을 여러 스레드로 나눠 파싱하지 않고 차례로 읽습니다.
+        # 컬럼 이름은 pandas 가 읽은 헤더(중복 이름은 'x.1' 처럼 구분됨)로 주고 첫 줄은 건너뜁니다.
+        read_options=pacsv.ReadOptions(
+            encoding=encoding, block_size=block_size, use_threads=False, column_names=header, skip_rows=1,
+        ),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: pa.string() for col in columns}, include_columns=columns,
+        ),
+    )
+
+    positions = {}  # 행정구역 이름 → 결과 배열의 행 위치
+    totals = np.zeros((0, len(GENDERS) * len(AGES)), dtype=np.int64)
+    rows = 0
+    for batch in reader:
+        if not batch.num_rows:
+            continue
+        values = _strings_to_int32(batch.columns[1:], batch.num_rows)
+        counts = _gender_age_totals(values, parsed)
+
+        # 조각 안에서 행정구역별로 합친 뒤 결과 배열의 해당 행에만 더합니다. (처음 보는 이름은 뒤에 추가, 나온 순서 유지)
+        encoded = pc.dictionary_encode(pc.utf8_trim_whitespace(batch.column(0).fill_null("")))
+        codes = encoded.indices.to_numpy()
+        names = encoded.dictionary.to_pylist()
+        mapping = np.array([positions.setdefault(name, len(positions)) for name in names], dtype=np.int64)
+        if len(positions) > len(totals):  # 조각마다 복사하지 않도록 두 배씩 늘림
+            grown = np.zeros((max(len(positions), 2 * len(totals)), totals.shape[1]), dtype=totals.dtype)
+            grown[:len(totals)] = totals
+            totals = grown
+        totals[mapping] += _sum_by(counts, codes, len(names), axis=0)
+
+        rows += batch.num_rows
+        if progress is not None:
+            progress(rows)
+    regions = list(positions)
+    counts = totals[:len(regions)].reshape(len(regions), len(GENDERS), len(AGES))
+    return AgeCube(regions, counts, version=version, months=months, month=month)
+
+
+def _sum_by(values, keys, size, axis):
+    """axis 방향으로 keys 가 같은 줄끼리 합쳐 길이 size 로 만듭니다. (정렬 + reduceat, 파이썬 반복 없음)"""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    shape = list(values.shape)
+    shape[axis] = size
+    result = np.zeros(shape, dtype=values.dtype)
+    if len(keys):
+        sums = np.add.reduceat(np.take(values, order, axis=axis), starts, axis=axis)
+        index = [slice(None)] * values.ndim
+        index[axis] = sorted_keys[starts]
+        result[tuple(index)] = sums
+    return result
+
+
+@st.cache_resource(max_entries=MAX_CACHED_UPLOADS, show_spinner=False)
+def _cube_from_upload(digest, month, _file):
+    # (digest(내용 해시), month) 만 캐시 키로 쓰고, 업로드 파일 객체(_file)는 해시 계산에서 제외합니다.
+    # 진행 막대는 이 함수 안에서 만들고 지웁니다. (캐시된 결과를 쓸 때는 아무것도 보이지 않음)
+    size = max(_file.size, 1)
+    _file.seek(0)
+    encoding = sniff_encoding(_file.read(SNIFF_BYTES))
+    _file.seek(0)
+    bar = st.progress(0.0, text="업로드 파일을 읽는 중...")
+
+    def progress(rows):
+        done = min(_file.tell() / size, 1.0)
+        bar.progress(done, text=f"업로드 파일을 읽는 중... {rows:,}행 ({done:.0%})")
+
+    version = digest if month is None else (digest, month)
+    try:
+        cube = stream_cube(_file, encoding, version=version, month=month, progress=progress)
+    finally:
+        bar.empty()
+    return track("population", f"upload {digest[:8]} {month or ''}".strip(), cube)
+
+
+def load_upload(uploaded_file, month=None):
+    """
+    업로드 파일을 CHUNK_BYTES 씩 나눠 읽어 AgeCube 로 변환합니다. (읽는 동안 진행 막대 표시)
+    month('YYYY-MM'): 여러 달이 든 파일에서 쓸 달 (기본: 가장 최근 달)
+    같은 내용의 파일·같은 달이면 다시 읽지 않고 캐시된 결과를 반환합니다. (반환된 배열은 수정하지 마세요)
+    """
+    with uploaded_file.getbuffer() as view:  # 업로드 바이트를 복사하지 않고 해시
+        digest = hashlib.blake2b(view, digest_size=16).hexdigest()
+    return _cube_from_upload(digest, month, uploaded_file)
+
+
+def compute_population_cube(version):
+    # version: (경로, 내용 해시) — precompute 작업 함수 (자식 프로세스에서도 실행). 가장 최근 달을 씁니다.
+    path = version[0]
+    return stream_cube(path, DATASET.encoding_of(path), version=version)
+
+
+register("population_cube", "population", "shared.population:compute_population_cube")
+
+
+@st.cache_resource(show_spinner="인구 데이터를 정리하는 중...")
+def _cube_from_file(version):
+    # version: (경로, 내용 해시) — 캐시 키로 사용합니다. (파일 내용이 바뀌면 새로 읽음)
+    return track("population", "cube", build("population_cube", version))
+
+
+@st.cache_resource(max_entries=MAX_CACHED_UPLOADS, show_spinner="인구 데이터를 정리하는 중...")
+def _cube_from_file_month(version, month):
+    # 최근 달이 아닌 달을 고른 경우. 그래프 캐시 키가 달마다 다르도록 버전에 달을 붙입니다.
+    path = version[0]
+    cube = stream_cube(path, DATASET.encoding_of(path), version=(version, month), month=month)
+    return track("population", f"cube {month}", cube)
+
+
+register_derived("population", _cube_from_file, _cube_from_file_month)
+
+
+def load_population(path=POPULATION_CSV, month=None):
+    """
+    저장된 인구 파일(기본: 루트의 population.csv)을 AgeCube 로 변환합니다. 파일 버전·달마다 한 번만 읽습니다.
+    month('YYYY-MM'): 여러 달이 든 파일에서 쓸 달 (기본: 가장 최근 달 — 미리 계산된 결과를 씀)
+    """
+    cube = serve("population_cube", content_key(dataset_version("population", path)), _cube_from_file)
+    if month is None or month == cube.month:
+        return cube
+    return _cube_from_file_month(cube.version, month)
+
+
+def make_demo_wide(seed=DEMO_SEED):
+    """데모용 넓은 형태 인구 표 (구마다 40세 부근이 가장 많은 분포)"""
+    rng = np.random.default_rng(seed)
+    ages = np.arange(101)
+    base = 2000 * np.exp(-((ages - 40) / 25) ** 2)
+    noise = rng.integers(-100, 100, size=(len(DEMO_REGIONS), len(ages)))
+    offset = np.arange(len(DEMO_REGIONS))[:, None] * 50
+    values = np.maximum(0, (base + noise).astype(int)) + offset
+
+    columns = [f"2025년10월_계_{age}세" for age in ages[:-1]] + ["2025년10월_계_100세 이상"]
+    df = pd.DataFrame(values, columns=columns)
+    df.insert(0, REGION_COL, DEMO_REGIONS)
+    return df
+
+
+@st.cache_resource(max_entries=MAX_CACHED_UPLOADS, show_spinner=False)
+def load_demo(seed=DEMO_SEED):
+    """seed 별로 한 번만 만든 데모 AgeCube"""
+    return track("population", f"demo {seed}", to_cube(make_demo_wide(seed), version=f"demo-{seed}"))
@@ -0,0 +1,232 @@
+"""
+파생 데이터 미리 계산(precompute) — 프로세스 풀
+- 데이터셋 버전이 바뀌면 무거운 파생 구조(MBTI 행렬·나라 간 거리/군집, 인구 AgeCube, 멸종위기종 등급 × 분류군 인덱스)를
+  ProcessPoolExecutor 의 다른 프로세스에서 만들어 CACHE_DIR/precompute 에 pickle 로 원자적으로 저장합니다.
+  (같은 버전이면 다른 서버 프로세스나 재시작 후에도 파일만 읽음)
+  지하철은 월별 저장소(shared.subway_store) 반영과 그 일/월 집계 갱신을 같은 풀에서 실행합니다.
+- 화면에서는 serve() 로 불러오며, 같은 데이터셋의 새 버전 결과가 모두 준비될 때까지
+  직전에 보여 준 버전의 객체를 그대로 반환합니다. → 큰 파일이 갱신되는 동안에도 화면 응답 시간이 일정합니다.
+  (한 데이터셋의 결과는 같은 버전끼리만 함께 보여 줍니다)
+- 보여 준 적이 없으면(처음 실행) 풀에서 만드는 중인 작업을 기다리거나 바로 만듭니다.
+- 환경변수 APP_PRECOMPUTE=0 이면 풀을 쓰지 않고 모든 결과를 화면 실행 중에 바로 만듭니다.
+"""
+
+import hashlib
+import importlib
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from shared.files import atomic_write
+from shared.paths import CACHE_DIR
+
+PRECOMPUTE_ENV = "APP_PRECOMPUTE"
+PRECOMPUTE_DIR = CACHE_DIR / "precompute"
+
+# 풀의 프로세스 수와 작업마다 남겨 둘 결과 파일 수 (현재 + 직전)
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+KEEP_ARTEFACTS = 2
+
+# pickle 형식이나 파생 클래스 구조를 바꾸면 숫자를 올려 저장된 결과를 무효화합니다.
+FORMAT_VERSION = 3
+
+JOBS = {}       # 작업 이름 → (데이터셋, '모듈:함수') — 함수(version) 가 결과 객체를 만듭니다.
+
+_pool = None
+_pending = {}   # 작업 이름 → (인자, Future) — 작업마다 하나만 실행
+_shown = {}     # (데이터셋, 경로) → 화면에 보여 주는 버전
+_served = {}    # (작업, 경로) → (버전, 객체)
+_failed = {}    # 작업 이름 → 풀에서 실패한 인자(버전)
+_lock = threading.Lock()
+
+
+def enabled():
+    return os.environ.get(PRECOMPUTE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def register(job, dataset, function):
+    """dataset 이 바뀌면 풀에서 미리 만들 작업을 등록합니다. function: '모듈:함수' (자식 프로세스에서 import)"""
+    JOBS[job] = (dataset, function)
+
+
+def _call(function, *args):
+    module, attr = function.split(":")
+    return getattr(importlib.import_module(module), attr)(*args)
+
+
+# ---------------- 결과 파일 -----------------
+def artefact_path(job, version):
+    digest = hashlib.blake2b(repr((FORMAT_VERSION, version)).encode("utf-8"), digest_size=12).hexdigest()
+    return PRECOMPUTE_DIR / f"{job}-{digest}.pkl"
+
+
+def ready(job, version):
+    return artefact_path(job, version).exists()
+
+
+def _load(job, version):
+    """저장된 결과 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(artefact_path(job, version), "rb") as f:
+            saved_version, obj = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    return obj if saved_version == version else None
+
+
+def _save(job, version, obj):
+    PRECOMPUTE_DIR.mkdir(parents=True, exist_ok=True)
+
+    def write(tmp):
+        with open(tmp, "wb") as f:
+            pickle.dump((version, obj), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    atomic_write(artefact_path(job, version), write)
+    # 오래된 버전의 결과는 지웁니다. (직전 버전은 다른 프로세스가 읽는 중일 수 있어 남겨 둠)
+    old = sorted(PRECOMPUTE_DIR.glob(f"{job}-*.pkl"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for path in old[KEEP_ARTEFACTS:]:
+        path.unlink(missing_ok=True)
+
+
+def _run(job, function, version):
+    """(자식 프로세스) 결과를 만들어 저장합니다. 객체는 파일로만 넘깁니다."""
+    if not ready(job, version):
+        _save(job, version, _call(function, version))
+
+
+def build(job, version):
+    """
+    job 의 version 결과: 저장된 파일이 있으면 읽고, 풀에서 만드는 중이면 기다렸다가 읽고, 없으면 여기서 만들어 저장합니다.
+    """
+    obj = _load(job, version)
+    if obj is not None:
+        return obj
+    with _lock:
+        args, future = _pending.get(job, (None, None))
+    if future is not None and args == version:
+        try:
+            future.result()
+        except Exception:
+            pass  # 풀에서 실패했으면 여기서 다시 만듭니다. (같은 오류면 그대로 올라감)
+        obj = _load(job, version)
+        if obj is not None:
+            return obj
+    obj = _call(JOBS[job][1], version)
+    try:
+        _save(job, version, obj)
+    except OSError:
+        pass  # 읽기 전용 배포 등 — 저장하지 못해도 결과는 씁니다.
+    return obj
+
+
+# ---------------- 프로세스 풀 -----------------
+def _executor():
+    global _pool
+    if _pool is None:
+        # 서버는 여러 스레드가 도는 중이므로 fork 대신 새 인터프리터로 시작합니다.
+        _pool = ProcessPoolExecutor(MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def submit(key, function, *args, callback=None):
+    """
+    function('모듈:함수')(*args) 를 풀에서 실행하고 Future 를 반환합니다. (마지막 인자를 작업의 버전으로 봅니다)
+    같은 key 의 작업이 아직 돌고 있으면 새로 넣지 않고 그 Future 를 반환합니다. (끝난 뒤 다음 호출에서 다시 확인)
+    같은 버전으로 실패한 적이 있으면 넣지 않고 None 을 반환합니다.
+    callback(결과) 는 작업이 성공하면 풀의 스레드에서 호출됩니다.
+    """
+    global _pool
+    with _lock:
+        running = _pending.get(key)
+        if running is not None and not running[1].done():
+            return running[1]
+        version = args[-1] if args else None
+        if _failed.get(key) == version:
+            return None  # 같은 입력으로 다시 실패할 작업은 넣지 않습니다. (화면에서 바로 만들며 오류를 보여 줌)
+        try:
+            future = _executor().submit(_call, function, *args)
+        except BrokenProcessPool:
+            _pool = None
+            future = _executor().submit(_call, function, *args)
+        _pending[key] = (version, future)
+
+    def done(future):
+        failed = future.cancelled() or future.exception() is not None
+        with _lock:
+            if _pending.get(key, (None, None))[1] is future:
+                del _pending[key]
+            if failed:
+                _failed[key] = version
+        if callback is not None and not future.cancelled() and future.exception() is None:
+            callback(future.result())
+
+    future.add_done_callback(done)
+    return future
+
+
+def submit_job(job, version):
+    """등록된 작업의 version 결과를 풀에서 만듭니다. (이미 저장되어 있으면 아무것도 하지 않음)"""
+    if not ready(job, version):
+        submit(job, "shared.precompute:_run", job, JOBS[job][1], version)
+
+
+def running():
+    """풀에서 실행 중인 작업 이름 목록"""
+    with _lock:
+        return sorted(key for key, (_, future) in _pending.items() if not future.done())
+
+
+def precompute_all(versions):
+    """versions: 데이터셋 이름 → 현재 버전. 등록된 작업을 모두 풀에 넣습니다. (서버 시작 시 warm-up 에서 호출)"""
+    if not enabled():
+        return
+    for job, (dataset, _) in list(JOBS.items()):
+        if dataset in versions:
+            submit_job(job, versions[dataset])
+
+
+# ---------------- 화면에서 불러오기 -----------------
+def serve(job, version, load):
+    """
+    job 의 version 객체를 load(version) 으로 가져옵니다. (load: build 를 감싼 st.cache_resource 함수)
+    같은 데이터셋에서 직전에 보여 준 버전과 다르고 새 결과가 아직 다 준비되지 않았으면,
+    남은 작업을 풀에 넣고 직전 버전의 객체를 반환합니다.
+    """
+    dataset = JOBS[job][0]
+    slot = (dataset, version[0])
+    with _lock:
+        shown = _shown.get(slot)
+        previous = _served.get((job, version[0]))
+    if enabled() and shown is not None and shown != version:
+        jobs = [name for name, (owner, _) in JOBS.items() if owner == dataset]
+        missing = [name for name in jobs if not ready(name, version)]
+        for name in missing:
+            submit_job(name, version)
+        with _lock:
+            failed = any(_failed.get(name) == version for name in missing)
+        if missing and not failed and previous is not None and previous[0] == shown:
+            _notify_stale(dataset, version)
+            return previous[1]
+        # 이 작업을 보여 준 적이 없거나 풀에서 실패했으면 여기서 기다리거나 만듭니다. (실패하면 오류가 화면에 보임)
+
+    obj = load(version)
+    with _lock:
+        _shown[slot] = version
+        _served[(job, version[0])] = (version, obj)
+    return obj
+
+
+def _notify_stale(dataset, version):
+    """화면 실행 중이면 (세션, 새 버전)마다 한 번 '새 데이터 준비 중' 알림을 띄웁니다."""
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    if get_script_run_ctx() is None:
+        return
+    key = f"_precompute_notice_{artefact_path(dataset, version).stem}"
+    if not st.session_state.get(key):
+        st.session_state[key] = True
+        st.toast(f"새 {dataset} 데이터를 준비하는 중입니다. 준비될 때까지 이전 데이터를 보여 줍니다.", icon="⏳")
@@ -0,0 +1,207 @@
+"""
+페이지 단계별 실행 시간 계측 (load / transform / figure / render)
+- `with span("load", "subway.index"):` 또는 `@timed("load")` 로 구간을 표시하면
+  프로세스 안에서 (페이지, 단계, 이름)별 최근 MAX_SAMPLES 개 시간을 모아 p50/p95/p99 를 계산합니다.
+- 환경변수 APP_PROFILE=1 일 때만 기록합니다. 꺼져 있으면 span() 은 아무 일도 하지 않는 객체 하나를 돌려주므로
+  구간마다 함수 호출 한 번 정도의 비용만 듭니다.
+- APP_PROFILE_FILE=경로 를 주면 구간 기록을 JSON Lines 로 덧붙여 저장합니다. (오프라인 분석용)
+- 페이지 맨 위에서 begin_page() 를 부르면 사이드바에 단계별 통계 표와 JSONL 내려받기 버튼,
+  데이터셋별 캐시 메모리(shared.memory.report) 표가 나옵니다. (표에는 이전 실행까지의 기록이 보입니다)
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+PROFILE_ENV = "APP_PROFILE"
+EXPORT_ENV = "APP_PROFILE_FILE"
+
+STAGES = ["load", "transform", "figure", "render"]
+
+# (페이지, 단계, 이름)마다 보관할 최근 기록 수와, 내려받기용으로 보관할 전체 기록 수
+MAX_SAMPLES = 1000
+MAX_EVENTS = 10000
+# 파일로 내보낼 때 한 번에 쓸 기록 수
+FLUSH_EVERY = 100
+
+ENABLED = os.environ.get(PROFILE_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+EXPORT_PATH = os.environ.get(EXPORT_ENV) or None
+
+_samples = {}                       # (페이지, 단계, 이름) → 최근 시간(ms) deque
+_counts = {}                        # (페이지, 단계, 이름) → 전체 횟수
+_events = deque(maxlen=MAX_EVENTS)  # 최근 기록 (dict)
+_pending = []                       # 아직 파일에 쓰지 않은 기록
+_lock = threading.Lock()
+_local = threading.local()          # 세션 스레드별 현재 페이지
+
+
+class _Span:
+    __slots__ = ("stage", "name", "start")
+
+    def __init__(self, stage, name):
+        self.stage = stage
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.stage, self.name, (time.perf_counter() - self.start) * 1000, error=exc_type is not None)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(stage, name=""):
+    """stage(load/transform/figure/render) 구간의 시간을 재는 context manager. 꺼져 있으면 아무 일도 하지 않습니다."""
+    if not ENABLED:
+        return _NOOP
+    return _Span(stage, name)
+
+
+def timed(stage, name=None):
+    """함수 실행 시간을 stage 구간으로 기록하는 데코레이터 (이름 생략 시 함수 이름)"""
+
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with _Span(stage, label):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def enable(flag=True):
+    """기록을 켜거나 끕니다. (기본값은 APP_PROFILE 환경변수)"""
+    global ENABLED
+    ENABLED = flag
+
+
+def current_page():
+    return getattr(_local, "page", "")
+
+
+def record(stage, name, ms, error=False):
+    """구간 하나의 시간(ms)을 기록합니다."""
+    key = (current_page(), stage, name)
+    event = {"ts": time.time(), "page": key[0], "stage": stage, "name": name, "ms": round(ms, 3)}
+    if error:
+        event["error"] = True
+    with _lock:
+        samples = _samples.get(key)
+        if samples is None:
+            samples = _samples[key] = deque(maxlen=MAX_SAMPLES)
+        samples.append(ms)
+        _counts[key] = _counts.get(key, 0) + 1
+        _events.append(event)
+        if EXPORT_PATH:
+            _pending.append(event)
+            if len(_pending) >= FLUSH_EVERY:
+                _flush_locked()
+
+
+def percentile(values, q):
+    """정렬된 값 목록의 q(0~1) 분위수 (가까운 순위)"""
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, max(0, round(q * (len(values) - 1))))]
+
+
+def summary():
+    """(페이지, 단계, 이름)별 횟수와 최근 기록의 p50/p95/p99/최대(ms) — 단계 순, 같은 단계는 p95 큰 순"""
+    with _lock:
+        items = [(key, sorted(samples), _counts[key]) for key, samples in _samples.items()]
+    rows = [
+        {
+            "page": page, "stage": stage, "name": name, "count": count,
+            "p50": percentile(values, 0.50), "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99), "max": values[-1],
+        }
+        for (page, stage, name), values, count in items
+    ]
+    order = {stage: i for i, stage in enumerate(STAGES)}
+    return sorted(rows, key=lambda row: (row["page"], order.get(row["stage"], len(order)), -row["p95"]))
+
+
+def events_jsonl():
+    """최근 기록을 JSON Lines 문자열로"""
+    with _lock:
+        events = list(_events)
+    return "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+
+
+def _flush_locked():
+    with open(EXPORT_PATH, "a", encoding="utf-8") as f:
+        f.writelines(json.dumps(event, ensure_ascii=False) + "\n" for event in _pending)
+    _pending.clear()
+
+
+def flush():
+    """APP_PROFILE_FILE 로 아직 쓰지 않은 기록을 씁니다."""
+    with _lock:
+        if EXPORT_PATH and _pending:
+            _flush_locked()
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _counts.clear()
+        _events.clear()
+        _pending.clear()
+
+
+def begin_page(page):
+    """
+    이 스레드(세션)의 이후 기록을 page 로 묶고, 기록이 켜져 있으면 사이드바에 계측 패널을 그립니다.
+    꺼져 있으면 아무것도 하지 않습니다.
+    """
+    if not ENABLED:
+        return
+    _local.page = page
+    flush()
+
+    import streamlit as st
+
+    from shared.memory import report
+
+    with st.sidebar.expander("⏱ 성능 계측", expanded=False):
+        rows = summary()
+        if not rows:
+            st.caption("아직 기록이 없습니다. 화면을 조작하면 단계별 시간이 쌓입니다.")
+        else:
+            st.dataframe(
+                rows, hide_index=True,
+                column_config={q: st.column_config.NumberColumn(q, format="%.1f ms") for q in ["p50", "p95", "p99", "max"]},
+            )
+            st.download_button(
+                "JSONL 내려받기", data=events_jsonl(), file_name="profile.jsonl", mime="application/jsonl",
+            )
+            if st.button("기록 지우기"):
+                reset()
+
+        # 이 프로세스의 캐시에 올라 있는 데이터셋별 메모리 (모든 세션이 공유)
+        memory = report()
+        if memory:
+            st.dataframe(memory, hide_index=True, column_config={"MB": st.column_config.NumberColumn("MB", format="%.2f")})
@@ -0,0 +1,103 @@
+"""
+행정구역 코드 계층(시도 > 시군구 > 읍면동) 인덱스
+- population.csv 의 행정구역 이름에는 "서울특별시 종로구 (1111000000)" 처럼 10자리 행정기관코드가 들어 있습니다.
+  코드 자리수(시도 2 / 시군구 3 / 읍면동 3 / 리 2)로 단계와 상위 코드를 계산해
+  부모·자식 위치를 배열로 미리 만들어 둡니다.
+- 이름에 코드가 없는 데이터(데모 등)는 모두 최상위 단계로 취급합니다.
+"""
+
+import re
+
+import numpy as np
+
+LEVEL_NAMES = {1: "시도", 2: "시군구", 3: "읍면동"}
+
+_NAME_PATTERN = re.compile(r"^(?P<name>.*?)\s*\((?P<code>\d{10})\)\s*$")
+
+# 상위 코드를 찾을 때 뒤에서부터 0 으로 채울 자리 (읍면동 → 일반구가 있는 시 → 시군구 → 시도)
+_PARENT_PREFIX_LENGTHS = [8, 5, 4, 2]
+
+
+def parse_region(label):
+    """'서울특별시 종로구 (1111000000)' → ('서울특별시 종로구', '1111000000'). 코드가 없으면 (label, None)"""
+    match = _NAME_PATTERN.match(str(label))
+    if match is None:
+        return str(label).strip(), None
+    return match.group("name").strip(), match.group("code")
+
+
+def code_level(code):
+    """행정기관코드의 단계 (1: 시도, 2: 시군구, 3: 읍면동). 코드가 없으면 1"""
+    if code is None or code[2:] == "00000000":
+        return 1
+    if code[5:] == "00000":
+        return 2
+    return 3
+
+
+class RegionHierarchy:
+    """행정구역 목록(파일 행 순서)에 대한 단계·부모·자식 인덱스"""
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        parsed = [parse_region(label) for label in self.labels]
+        self.names = [name for name, _ in parsed]
+        self.codes = [code for _, code in parsed]
+        self.level = np.array([code_level(code) for code in self.codes], dtype=np.int8)
+
+        position = {code: i for i, code in enumerate(self.codes) if code is not None}
+        self.parent = np.full(len(self.labels), -1, dtype=np.int32)
+        for i, code in enumerate(self.codes):
+            if code is None:
+                continue
+            for length in _PARENT_PREFIX_LENGTHS:
+                candidate = code[:length].ljust(10, "0")
+                if candidate != code and candidate in position:
+                    self.parent[i] = position[candidate]
+                    break
+
+        self._children = [[] for _ in self.labels]
+        for i, parent in enumerate(self.parent):
+            if parent >= 0:
+                self._children[parent].append(i)
+
+        self._position = {label: i for i, label in enumerate(self.labels)}
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def has_codes(self):
+        return any(code is not None for code in self.codes)
+
+    def levels(self, within=None):
+        """데이터에 들어 있는 단계 목록 (within 을 주면 그 하위 행정구역의 단계만)"""
+        return sorted(set(self.level[self.mask(within=within)].tolist()))
+
+    def roots(self):
+        """부모가 없는 행정구역 (파일 행 순서)"""
+        return [self.labels[i] for i in np.flatnonzero(self.parent < 0)]
+
+    def parent_of(self, label):
+        """바로 위 단계 행정구역 (없으면 None)"""
+        parent = self.parent[self._position[label]]
+        return self.labels[parent] if parent >= 0 else None
+
+    def children(self, label):
+        """바로 아래 단계 행정구역 목록"""
+        return [self.labels[i] for i in self._children[self._position[label]]]
+
+    def mask(self, level=None, within=None):
+        """level 단계이면서 within 의 하위(자기 자신 제외)인 행의 bool 배열"""
+        mask = np.ones(len(self.labels), dtype=bool)
+        if level is not None:
+            mask &= self.level == level
+        if within is not None:
+            inside = np.zeros(len(self.labels), dtype=bool)
+            stack = list(self._children[self._position[within]])
+            while stack:
+                node = stack.pop()
+                inside[node] = True
+                stack.extend(self._children[node])
+            mask &= inside
+        return mask
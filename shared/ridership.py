@@ -0,0 +1,134 @@
+"""
+관광지 ↔ 지하철역 연결과 관광지별 일별 승하차 인원
+- 역 이름을 한 번만 표준 키로 바꿉니다. ("경복궁역 (3호선)", "경복궁(정부서울청사)" → "경복궁")
+- 관광지의 station 설명(예: "명동역 (4호선) / 충무로역 (3·4호선)")에서 역 키를 뽑아
+  관광지 → 역 연결을 만들고, 승하차 데이터에 없는 경우 좌표 기준 가장 가까운 역을 씁니다.
+- 최근 RIDERSHIP_MONTHS 달의 (역, 노선) 일별 행렬(shared.subway_series.DailyMatrix)을 역 키별로 합쳐
+  관광지별 일별 합계를 미리 계산해 둡니다. (같은 이름의 여러 노선 역은 하나의 역으로 합칩니다)
+  → 승하차 원본 행을 다시 읽거나 세지 않고, 저장소가 몇 년 치로 늘어나도 읽는 달 수는 같습니다.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from shared.datasets import register_derived
+from shared.memory import track
+from shared.places import load_places
+from shared.subway import STORE, load_subway_series
+
+_PARENTHESES = re.compile(r"\s*[(（][^)）]*[)）]")
+_SEPARATORS = re.compile(r"\s*(?:/|,|·|및)\s*")
+
+SPARKLINE_DAYS = 30
+# 관광지 그래프에 보여 줄 최근 달 수
+RIDERSHIP_MONTHS = 3
+
+
+def station_key(name):
+    """역 이름 → 표준 키 (괄호 부분·공백·끝의 '역' 제거). 비어 있으면 None"""
+    key = _PARENTHESES.sub("", str(name)).strip().replace(" ", "")
+    if key.endswith("역") and len(key) > 1:
+        key = key[:-1]
+    return key or None
+
+
+def station_keys_from_text(text):
+    """관광지 station 설명에서 역 키 목록 (순서 유지, 중복 제거)"""
+    if not isinstance(text, str):
+        return []
+    keys = (station_key(part) for part in _SEPARATORS.split(_PARENTHESES.sub("", text)))
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+class PoiRidership:
+    """관광지 → 역 키 연결, 역 × 날짜 합계 배열, 관광지 × 날짜 합계"""
+
+    def __init__(self, places, stations, version=None):
+        # stations: (역, 노선) DailyMatrix — 키 '역명 (노선명)' 을 역 키로 바꿔 노선을 합칩니다.
+        # version: (관광지 버전, 승하차 데이터 버전) — 그래프·지도 캐시 키로 사용
+        self.version = version
+        key_codes, self.station_keys = pd.factorize(pd.Index([station_key(key) for key in stations.keys]))
+        self._station_pos = {key: i for i, key in enumerate(self.station_keys)}
+
+        # 데이터가 있는 날만 씁니다. (달력상 빠진 날은 DailyMatrix 에서 0 으로 채워져 있음)
+        self.dates = stations.dates[stations.present]
+        station_daily = np.zeros((len(self.station_keys), len(self.dates)), dtype=np.int64)
+        np.add.at(station_daily, key_codes, stations.values[:, stations.present])
+        self.station_daily = station_daily.astype(np.int32)
+
+        # 관광지 → 역 키 (설명에 적힌 역 중 데이터에 있는 것, 없으면 가장 가까운 역)
+        self.stations = {}
+        for record in places.records:
+            keys = [key for key in station_keys_from_text(record.get("station")) if key in self._station_pos]
+            nearest = station_key(record["nearest_station"]) if record.get("nearest_station") else None
+            if not keys and nearest in self._station_pos:
+                keys = [nearest]
+            self.stations[record["name"]] = keys
+
+        # 관광지 × 날짜 합계 (연결된 역들의 합)
+        names = list(self.stations)
+        # (역 하루 승객 수는 int32 로 충분하고, 관광지 하나에 연결된 역 몇 개의 합도 마찬가지)
+        daily = np.zeros((len(names), len(self.dates)), dtype=np.int32)
+        for i, name in enumerate(names):
+            rows = [self._station_pos[key] for key in self.stations[name]]
+            if rows:
+                daily[i] = self.station_daily[rows].sum(axis=0)
+        self.daily = pd.DataFrame(daily.T, index=self.dates, columns=pd.Index(names, name="관광지"))
+        self.sparklines = {name: _sparkline_svg(daily[i, -SPARKLINE_DAYS:]) for i, name in enumerate(names)}
+
+    def series(self, name):
+        """관광지의 일별 승하차 합계 Series (연결된 역이 없으면 None)"""
+        if not self.stations.get(name):
+            return None
+        return self.daily[name]
+
+    def summary(self, name):
+        """관광지 팝업용 요약 dict (역 목록, 최근 일 평균, 최근 30일 스파크라인 SVG). 연결된 역이 없으면 None"""
+        if not self.stations.get(name):
+            return None
+        recent = self.daily[name].to_numpy()[-SPARKLINE_DAYS:]
+        return {
+            "stations": self.stations[name],
+            "daily_mean": float(recent.mean()) if len(recent) else 0.0,
+            "sparkline": self.sparklines[name],
+        }
+
+
+def _sparkline_svg(values, width=120, height=28):
+    """일별 값의 작은 꺾은선 SVG 문자열 (팝업용)"""
+    if len(values) < 2 or values.max() == values.min():
+        return ""
+    x = np.linspace(0, width, len(values))
+    y = height - (values - values.min()) / (values.max() - values.min()) * (height - 2) - 1
+    points = " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(x, y))
+    return (
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<polyline fill="none" stroke="#1f77b4" stroke-width="1.5" points="{points}"/></svg>'
+    )
+
+
+@st.cache_resource(show_spinner="관광지별 승하차 인원을 계산하는 중...")
+def _build_poi_ridership(places_version, subway_version, _places):
+    # 관광지 버전과 승하차 파티션 리비전만 캐시 키로 쓰고, _places 는 해시에서 제외합니다.
+    # 승하차 행렬은 캐시가 비었을 때만 읽습니다.
+    stations, _ = load_subway_series([month for month, _ in subway_version])
+    return track("places", "poi_ridership", PoiRidership(_places, stations, version=(places_version, stations.version)))
+
+
+register_derived("places", _build_poi_ridership)
+register_derived("stations", _build_poi_ridership)
+register_derived("subway", _build_poi_ridership)
+
+
+def load_poi_ridership():
+    """
+    관광지별 일별 승하차 인원(PoiRidership)을 반환합니다. 관광지·승하차 데이터 버전마다 한 번만 계산합니다.
+    승하차는 최근 RIDERSHIP_MONTHS 달의 파티션만 읽고, 저장소 manifest 의 (달, 리비전) 으로 캐시를 구분합니다.
+    저장소를 동기화하지 않으므로 화면 실행마다 불러도 파일을 다시 확인하지 않습니다. (반영은 지하철 페이지·warm-up 에서)
+    """
+    places = load_places()
+    partitions = STORE.partitions(STORE.months()[-RIDERSHIP_MONTHS:])
+    return _build_poi_ridership(places.version, partitions, places)
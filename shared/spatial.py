@@ -0,0 +1,106 @@
+"""
+위도·경도 격자(grid) 공간 인덱스
+- 점들을 CELL_DEG 크기 격자 칸으로 나눠 (행, 열) → 점 위치 배열을 미리 만들어 둡니다.
+- 지도 범위(bounding box) 조회는 겹치는 칸만, 가장 가까운 점 조회는 가까운 칸부터 고리 모양으로 넓혀 가며 확인합니다.
+  (서울 관광지·역 수천 개 규모에서 전체 점을 매번 훑지 않음)
+"""
+
+import numpy as np
+
+CELL_DEG = 0.01  # 서울 위도에서 약 1.1km(남북) × 0.9km(동서)
+EARTH_RADIUS_M = 6_371_000
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """두 좌표(배열 가능) 사이 거리 (미터)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+class GridIndex:
+    """위도·경도 점 목록에 대한 격자 인덱스 (점 위치는 입력 순서)"""
+
+    def __init__(self, lat, lon, cell=CELL_DEG):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.cell = cell
+        rows, cols = self._cell_of(self.lat, self.lon)
+
+        # (행, 열) 별로 정렬해 칸마다 연속 구간 → 점 위치 배열 (칸 안에서는 입력 순서 유지)
+        order = np.lexsort((np.arange(len(rows)), cols, rows))
+        keys = np.stack([rows[order], cols[order]], axis=1)
+        starts = np.flatnonzero(np.r_[True, (keys[1:] != keys[:-1]).any(axis=1)]) if len(keys) else np.empty(0, int)
+        bounds = np.r_[starts, len(order)]
+        self._cells = {
+            (int(keys[s, 0]), int(keys[s, 1])): order[s:e] for s, e in zip(bounds[:-1], bounds[1:])
+        }
+        if self._cells:
+            cell_keys = np.array(list(self._cells))
+            self._row_range = (cell_keys[:, 0].min(), cell_keys[:, 0].max())
+            self._col_range = (cell_keys[:, 1].min(), cell_keys[:, 1].max())
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _cell_of(self, lat, lon):
+        return (np.floor(np.asarray(lat) / self.cell).astype(np.int64),
+                np.floor(np.asarray(lon) / self.cell).astype(np.int64))
+
+    def _gather(self, row_range, col_range):
+        parts = [
+            self._cells[(r, c)]
+            for r in range(row_range[0], row_range[1] + 1)
+            for c in range(col_range[0], col_range[1] + 1)
+            if (r, c) in self._cells
+        ]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def _ring(self, row, col, ring):
+        """(row, col) 에서 체비쇼프 거리가 정확히 ring 인 칸들의 점 위치"""
+        if ring == 0:
+            return self._gather((row, row), (col, col))
+        parts = [
+            self._gather((row - ring, row - ring), (col - ring, col + ring)),
+            self._gather((row + ring, row + ring), (col - ring, col + ring)),
+            self._gather((row - ring + 1, row + ring - 1), (col - ring, col - ring)),
+            self._gather((row - ring + 1, row + ring - 1), (col + ring, col + ring)),
+        ]
+        return np.concatenate(parts)
+
+    def within(self, south, west, north, east):
+        """범위 안에 있는 점 위치 (입력 순서로 정렬)"""
+        if not self._cells:
+            return np.empty(0, dtype=np.int64)
+        (r0, r1), (c0, c1) = zip(self._cell_of(south, west), self._cell_of(north, east))
+        r0, r1 = max(r0, self._row_range[0]), min(r1, self._row_range[1])
+        c0, c1 = max(c0, self._col_range[0]), min(c1, self._col_range[1])
+        candidates = self._gather((r0, r1), (c0, c1))
+        inside = (
+            (self.lat[candidates] >= south) & (self.lat[candidates] <= north)
+            & (self.lon[candidates] >= west) & (self.lon[candidates] <= east)
+        )
+        return np.sort(candidates[inside])
+
+    def nearest(self, lat, lon):
+        """가장 가까운 점 (위치, 거리 m). 점이 없으면 (-1, inf)"""
+        if not self._cells:
+            return -1, float("inf")
+        row, col = (int(v) for v in self._cell_of(lat, lon))
+        # 격자 한 칸의 가장 짧은 변 길이(동서 방향) — 아직 보지 않은 칸까지의 거리 하한
+        cell_m = haversine_m(lat, 0.0, lat, self.cell) if abs(lat) < 89 else 0.0
+        max_ring = max(
+            abs(row - self._row_range[0]), abs(row - self._row_range[1]),
+            abs(col - self._col_range[0]), abs(col - self._col_range[1]),
+        )
+        best, best_dist = -1, float("inf")
+        for ring in range(max_ring + 1):
+            cells = self._ring(row, col, ring)
+            if len(cells):
+                dist = haversine_m(lat, lon, self.lat[cells], self.lon[cells])
+                i = int(np.argmin(dist))
+                if dist[i] < best_dist:
+                    best, best_dist = int(cells[i]), float(dist[i])
+            if best >= 0 and best_dist <= ring * cell_m:
+                break
+        return best, best_dist
@@ -0,0 +1,317 @@
+"""
+서울 지하철 승하차 데이터(subway*.csv) 로더
+- CSV(보통 cp949)를 한 번만 읽어 검증한 뒤 월별 파티션 저장소(shared.subway_store)에 추가합니다.
+  (사용일자: date32 / 노선명·역명: dictionary / 승하차 인원: int32)
+- 서울교통공사/열린데이터광장 내보내기마다 컬럼 이름이 조금씩 달라서
+  COLUMN_ALIASES 로 표준 컬럼명에 맞춘 뒤 저장합니다.
+- 루트 폴더의 subway*.csv 와 하루 단위로 추가되는 subway_daily/*.csv 를 파일 내용 해시(shared.datasets) 기준으로
+  새로 들어왔거나 바뀐 것만 반영합니다. (새 날짜는 추가, 이미 있는 날짜는 교체)
+- 이미 데이터가 있는 상태에서 파일이 바뀌면 반영은 프로세스 풀(shared.precompute)에서 하고, 그동안 화면은 이전 리비전을 씁니다.
+- 원본 파일 반영(sync_subway_store)은 저장소를 바꾸는 유일한 단계라 화면 실행마다 한 번만 명시적으로 호출하고,
+  달 목록·load_* 함수는 지금 manifest 만 읽습니다.
+- 화면에서는 선택한 달의 파티션만 읽고, 같은 리비전이면 프로세스 메모리의 프레임을 그대로 재사용합니다.
+  → 데이터가 몇 년 치로 늘어나도 한 달을 보는 비용은 같습니다.
+
+저장소에 직접 추가: python -m shared.subway 파일.csv [...]
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from shared import precompute
+from shared.datasets import dataset_version, file_version, get_dataset
+from shared.encoding import detect_encoding
+from shared.figures import FIGURE_CACHE
+from shared.memory import track
+from shared.paths import CACHE_DIR, ROOT
+from shared.subway_index import SubwayIndex
+from shared.subway_series import build_daily_matrices
+from shared.subway_store import COUNT_COLS, KEY_COLS, SubwayStore
+
+DATASET = get_dataset("subway")
+SUBWAY_GLOB = DATASET.pattern
+
+# 스키마를 바꾸면 숫자를 올려 기존 저장소를 무효화합니다. (원본 파일에서 다시 만듦)
+SCHEMA_VERSION = 3
+
+# 프로세스가 기억해 둘 월 파티션 수와 (여러 달을 합친) 프레임·인덱스 수
+MAX_CACHED_PARTITIONS = 36
+MAX_CACHED_RANGES = 8
+
+SUBWAY_SCHEMA = pa.schema([
+    ("사용일자", pa.date32()),
+    ("노선명", pa.dictionary(pa.int16(), pa.string())),
+    ("역명", pa.dictionary(pa.int16(), pa.string())),
+    ("승차총승객수", pa.int32()),
+    ("하차총승객수", pa.int32()),
+])
+
+# 표준 컬럼명 → 원본 파일에서 쓰일 수 있는 이름들 (앞에 있을수록 우선)
+COLUMN_ALIASES = {
+    "사용일자": ["사용일자", "날짜", "일자", "사용일"],
+    "노선명": ["노선명", "호선", "호선명", "노선"],
+    "역명": ["역명", "지하철역", "역이름"],
+    "승차총승객수": ["승차총승객수", "승차승객수", "승차인원"],
+    "하차총승객수": ["하차총승객수", "하차승객수", "하차인원"],
+}
+
+
+def resolve_columns(columns):
+    """원본 컬럼 목록에서 {원본 이름: 표준 이름} 매핑을 찾습니다. 빠진 컬럼이 있으면 ValueError"""
+    columns = [c.strip() for c in columns]
+    mapping = {}
+    missing = []
+    for standard, aliases in COLUMN_ALIASES.items():
+        found = next((alias for alias in aliases if alias in columns), None)
+        if found is None:
+            missing.append(standard)
+        else:
+            mapping[found] = standard
+    if missing:
+        raise ValueError(f"필수 컬럼을 찾을 수 없습니다: {', '.join(missing)} (파일 컬럼: {', '.join(columns)})")
+    return mapping
+
+
+def yyyymmdd_to_date(values):
+    """YYYYMMDD 정수 배열을 문자열 파싱 없이 datetime64[D] 배열로 변환합니다."""
+    values = np.asarray(values, dtype=np.int64)
+    years = (values // 10000 - 1970).astype("datetime64[Y]")
+    months = (values // 100 % 100 - 1).astype("timedelta64[M]")
+    days = (values % 100 - 1).astype("timedelta64[D]")
+    return (years.astype("datetime64[M]") + months).astype("datetime64[D]") + days
+
+
+def _date_values(series):
+    """숫자(YYYYMMDD) 또는 날짜 문자열 컬럼을 datetime64[D] 배열로 변환합니다."""
+    if pd.api.types.is_numeric_dtype(series):
+        return yyyymmdd_to_date(series.to_numpy())
+    # 일부 내보내기는 '2025-10-01' 형식이라 이 경우에만 문자열 파싱
+    return pd.to_datetime(series).to_numpy().astype("datetime64[D]")
+
+
+def build_subway_table(path, encoding=None):
+    """subway CSV 하나를 읽어 SUBWAY_SCHEMA 형태의 Arrow Table 로 변환합니다. (encoding 생략 시 자동 판별)"""
+    encoding = encoding or detect_encoding(path)
+    header = pd.read_csv(path, encoding=encoding, nrows=0).columns
+    mapping = resolve_columns(header)
+    raw = {c.strip(): c for c in header}
+    df = pd.read_csv(
+        path,
+        encoding=encoding,
+        usecols=[raw[src] for src in mapping],
+        dtype={raw[src]: "category" for src, std in mapping.items() if std in ("노선명", "역명")},
+    )
+    df.columns = [mapping[c.strip()] for c in df.columns]
+    return pa.table({
+        "사용일자": pa.array(_date_values(df["사용일자"])),
+        "노선명": pa.array(df["노선명"].cat.remove_unused_categories()),
+        "역명": pa.array(df["역명"].cat.remove_unused_categories()),
+        "승차총승객수": pa.array(df["승차총승객수"], pa.int32()),
+        "하차총승객수": pa.array(df["하차총승객수"], pa.int32()),
+    }).cast(SUBWAY_SCHEMA)
+
+
+def subway_sources(root=ROOT):
+    """루트 폴더의 subway*.csv 파일 목록 (파일 이름순)"""
+    return sorted(Path(root).glob(SUBWAY_GLOB))
+
+
+# ---------------- 월별 파티션 저장소 -----------------
+STORE = SubwayStore(CACHE_DIR / "subway", SUBWAY_SCHEMA, SCHEMA_VERSION)
+
+# 검증에 실패한 파일: 경로 → (내용 해시, 오류 메시지) — 파일이 바뀌기 전까지 다시 읽지 않습니다.
+REJECTED = {}
+
+
+def validate_subway_table(table):
+    """SUBWAY_SCHEMA 로 변환된 테이블을 검사합니다. 문제가 있으면 ValueError"""
+    problems = []
+    if table.num_rows == 0:
+        problems.append("행이 없습니다")
+    for name in table.column_names:
+        if table[name].null_count:
+            problems.append(f"'{name}' 에 빈 값 {table[name].null_count}개")
+    for name in COUNT_COLS:
+        if table.num_rows and pc.min(table[name]).as_py() < 0:
+            problems.append(f"'{name}' 에 음수 값")
+    duplicated = table.select(KEY_COLS).to_pandas().duplicated().sum()
+    if duplicated:
+        problems.append(f"(날짜, 노선, 역) 중복 {duplicated}행")
+    if problems:
+        raise ValueError("; ".join(problems))
+    return table
+
+
+def ingest_file(path, digest=None):
+    """
+    승하차 CSV 하나를 검증해 월별 저장소에 추가합니다. (이미 있는 날짜는 이 파일의 행으로 교체)
+    바뀐 달 → (이전 리비전, 새 리비전) 을 반환합니다. 컬럼·타입·값이 맞지 않으면 ValueError
+    """
+    digest = digest or file_version(path).digest
+    try:
+        table = DATASET.read(path)  # 등록부에 선언된 파서(build_subway_table)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise ValueError(f"{Path(path).name}: 타입 변환 실패 ({e})") from e
+    try:
+        validate_subway_table(table)
+    except ValueError as e:
+        raise ValueError(f"{Path(path).name}: {e}") from e
+    changed = STORE.append(table, source=path, digest=digest)
+    # 교체된 달의 이전 리비전으로 만든 그래프는 더 쓰이지 않습니다.
+    FIGURE_CACHE.discard_version(*((month, old) for month, (old, _) in changed.items() if old is not None))
+    return changed
+
+
+def ingest_sources(sources):
+    """
+    (path, digest) 목록을 쓰기 잠금 안에서 차례로 저장소에 반영합니다. (프로세스 풀에서도 실행, 이미 반영된 파일은 건너뜀)
+    → (거부된 파일: 경로 → (내용 해시, 오류 메시지), 반영된 파일 경로 목록, 교체된 (달, 이전 리비전) 목록)
+    """
+    rejected, accepted, replaced = {}, [], []
+    with STORE.writing():
+        for path, digest in sources:
+            if STORE.source_digest(path) == digest:
+                accepted.append(path)  # 다른 프로세스가 먼저 반영함
+                continue
+            try:
+                changed = ingest_file(path, digest=digest)
+            except (OSError, ValueError) as e:
+                rejected[path] = (digest, str(e))
+            else:
+                accepted.append(path)
+                replaced.extend((month, old) for month, (old, _) in changed.items() if old is not None)
+    return rejected, accepted, replaced
+
+
+def _apply_ingest(result):
+    rejected, accepted, replaced = result
+    for path in accepted:
+        REJECTED.pop(path, None)
+    REJECTED.update(rejected)
+    # 다른 프로세스가 교체한 달의 이전 리비전으로 만든 그래프도 지웁니다.
+    FIGURE_CACHE.discard_version(*replaced)
+
+
+def sync_subway_store():
+    """
+    등록된 승하차 파일(subway*.csv, subway_daily/*.csv) 중 아직 반영되지 않았거나 내용이 바뀐 것을 저장소에 추가합니다.
+    파일 이름순으로 반영하므로 같은 날짜가 여러 파일에 있으면 나중 파일이 이깁니다. 거부된 파일 목록을 반환
+    저장소에 이미 보여 줄 데이터가 있으면 반영(파일 읽기·검증·월 집계 갱신)은 shared.precompute 의 프로세스 풀에 맡기고,
+    끝날 때까지 지금 리비전을 그대로 씁니다. (끝나면 manifest 가 바뀌어 다음 실행부터 새 리비전을 읽음)
+    """
+    sources = [*dataset_version("subway"), *dataset_version("subway_daily")]
+    pending = [
+        (source.path, source.digest) for source in sources
+        if STORE.source_digest(source.path) != source.digest
+        and REJECTED.get(source.path, (None,))[0] != source.digest
+    ]
+    if pending:
+        future = None
+        if precompute.enabled() and STORE.months():
+            future = precompute.submit("subway_ingest", "shared.subway:ingest_sources", pending, callback=_apply_ingest)
+        if future is None:  # 풀을 쓰지 않거나, 같은 파일로 풀에서 실패함 → 여기서 반영 (오류가 화면에 보임)
+            _apply_ingest(ingest_sources(pending))
+    return {path: message for path, (_, message) in REJECTED.items()}
+
+
+def subway_months():
+    """
+    저장소에 데이터가 있는 달 목록(pd.Period, 오래된 순). manifest 만 보며 동기화·파티션 읽기는 하지 않습니다.
+    (원본 파일 반영은 sync_subway_store 를 화면 실행마다 한 번 호출해서 합니다)
+    """
+    return [pd.Period(month, "M") for month in STORE.months()]
+
+
+def _partitions(months):
+    """months(Period/'YYYY-MM' 목록, None 이면 전체)에 해당하는 ((달, 리비전), ...) — 동기화하지 않음"""
+    if months is not None:
+        months = [str(pd.Period(month, "M")) for month in months]
+    partitions = STORE.partitions(months)
+    if not partitions:
+        raise FileNotFoundError(f"{ROOT} 에서 {SUBWAY_GLOB} 파일을 찾을 수 없습니다.")
+    return partitions
+
+
+def _label(partitions):
+    """메모리 보고용 이름: 첫 달~마지막 달"""
+    first, last = partitions[0][0], partitions[-1][0]
+    return first if first == last else f"{first}~{last}"
+
+
+@st.cache_resource(max_entries=MAX_CACHED_PARTITIONS, show_spinner=False)
+def _read_partition(month, revision):
+    return STORE.read_rows(month, revision)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_RANGES, show_spinner=False)
+def _read_subway_frame(partitions):
+    # partitions: ((달, 리비전), ...) — 캐시 키로 사용 (새 데이터가 반영되면 리비전이 바뀜)
+    tables = [_read_partition(month, revision) for month, revision in partitions]
+    table = pa.concat_tables(tables).unify_dictionaries() if len(tables) > 1 else tables[0]
+    return track("subway", f"frame {_label(partitions)}", table.to_pandas(date_as_object=False))
+
+
+@st.cache_resource(max_entries=MAX_CACHED_RANGES, show_spinner=False)
+def _build_subway_index(partitions):
+    # 집계는 저장소에 달마다 저장해 둔 것을 이어 붙이기만 합니다.
+    daily = pd.concat([STORE.read_daily_line(month, revision) for month, revision in partitions])
+    station = pd.concat([
+        STORE.read_station(month, revision).assign(월=pd.Period(month, "M")) for month, revision in partitions
+    ])
+    index = SubwayIndex(
+        _read_subway_frame(partitions), version=partitions,
+        daily_line_totals=daily, station_monthly=station,
+    )
+    return track("subway", f"index {_label(partitions)}", index)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_RANGES, show_spinner="일별 시계열을 만드는 중...")
+def _build_daily_matrices(partitions):
+    stations, lines = build_daily_matrices(_read_subway_frame(partitions), version=partitions)
+    track("subway", f"station series {_label(partitions)}", stations)
+    track("subway", f"line series {_label(partitions)}", lines)
+    return stations, lines
+
+
+def load_subway(months=None):
+    """
+    지하철 승하차 데이터를 DataFrame 으로 반환합니다. (months 생략 시 전체, 주면 그 달의 파티션만 읽음)
+    반환된 프레임은 모든 세션이 공유하므로 직접 수정하지 말고 필요하면 복사해서 사용하세요.
+    """
+    return _read_subway_frame(_partitions(months))
+
+
+def load_subway_index(months=None):
+    """(날짜, 노선) 사전 집계 인덱스(SubwayIndex)를 반환합니다. 읽은 파티션 버전마다 한 번만 만듭니다."""
+    return _build_subway_index(_partitions(months))
+
+
+def warm_latest_subway_index():
+    """저장소를 한 번 동기화하고 가장 최근 달의 인덱스만 올려 둡니다. (warm-up 용 — 화면 첫 진입 시 기본으로 보는 달)"""
+    sync_subway_store()
+    months = subway_months()
+    return load_subway_index(months=months[-1:]) if months else None
+
+
+def load_subway_series(months=None):
+    """(역, 노선) 일별 시계열 행렬(DailyMatrix) 두 개를 반환합니다. (months 생략 시 전체 기간)"""
+    return _build_daily_matrices(_partitions(months))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="승하차 CSV 를 검증해 월별 저장소에 추가합니다.")
+    parser.add_argument("files", nargs="+", help="추가할 CSV 파일")
+    args = parser.parse_args()
+    for path in args.files:
+        for month, (old, new) in ingest_file(path).items():
+            print(f"{path}: {month} r{old or 0} → r{new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+지하철 승하차 데이터의 (날짜, 노선) 사전 집계 인덱스
+- 로딩 시 한 번만 (날짜, 노선, 총승객 내림차순)으로 정렬해 두고,
+  각 (날짜, 노선) 구간의 시작/끝 위치만 [날짜, 노선] int32 배열에 저장합니다.
+- 화면에서 날짜·노선을 바꿀 때는 전체 프레임을 훑지 않고 dict 조회 + 슬라이스만 합니다.
+- 월별 저장소(shared.subway_store)에 미리 저장된 집계를 넘기면 일·월 합계를 다시 계산하지 않습니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+COUNT_COLS = ["승차총승객수", "하차총승객수", "총승객"]
+
+
+class SubwayIndex:
+    """(사용일자, 노선명) → 총승객 내림차순으로 정렬된 역별 행"""
+
+    def __init__(self, df, version=None, daily_line_totals=None, station_monthly=None):
+        # version: 원본 데이터 버전 (그래프 캐시 등 파생 결과의 키로 사용)
+        # daily_line_totals: (사용일자, 노선명, 승차·하차) / station_monthly: (월, 노선명, 역명, 승차·하차) 미리 계산된 합계
+        self.version = version
+        df = df.assign(총승객=df["승차총승객수"].astype("int32") + df["하차총승객수"].astype("int32"))
+        df = df.sort_values(
+            ["사용일자", "노선명", "총승객"], ascending=[True, True, False], kind="stable"
+        ).reset_index(drop=True)
+        self.frame = df
+
+        # 정렬된 프레임에서 (날짜, 노선)이 바뀌는 지점 = 각 구간의 시작 위치
+        dates = df["사용일자"].to_numpy()
+        codes = df["노선명"].cat.codes.to_numpy()
+        changed = np.ones(len(df), dtype=bool)
+        changed[1:] = (dates[1:] != dates[:-1]) | (codes[1:] != codes[:-1])
+        starts = np.flatnonzero(changed)
+        stops = np.append(starts[1:], len(df))
+
+        # 구간 경계는 [날짜, 노선] int32 배열에 두고 dict 에는 날짜·노선 이름 → 위치만 둡니다.
+        # (구간마다 (date, 노선) 튜플 키를 만드는 것보다 수십 배 작음)
+        day_codes, days = pd.factorize(dates[starts], sort=True)
+        self.dates = list(pd.to_datetime(days).date)
+        self._date_pos = {date: i for i, date in enumerate(self.dates)}
+        categories = df["노선명"].cat.categories
+        used = np.unique(codes[starts])
+        self.lines = sorted(categories[used])
+        self._line_pos = {line: i for i, line in enumerate(categories)}
+        self._bounds = np.zeros((len(self.dates), len(categories), 2), dtype=np.int32)
+        self._bounds[day_codes, codes[starts]] = np.column_stack([starts, stops])
+
+        # 날짜별 전체 노선 구간: 날짜로 먼저 정렬되어 있어 한 날짜의 행은 연속됩니다.
+        self._day_bounds = np.zeros((len(self.dates), 2), dtype=np.int32)
+        first = np.flatnonzero(np.r_[True, day_codes[1:] != day_codes[:-1]])
+        self._day_bounds[day_codes[first]] = np.column_stack([starts[first], np.append(starts[first][1:], len(df))])
+        self.months = sorted({pd.Period(date, "M") for date in self.dates})
+
+        if daily_line_totals is not None:
+            self.daily_line_totals = _with_total(daily_line_totals, ["사용일자", "노선명"])
+        else:
+            # 노선별 일 합계: 정렬된 구간 경계 그대로 reduceat 한 번으로 계산
+            values = df[COUNT_COLS].to_numpy(dtype=np.int64)
+            sums = np.add.reduceat(values, starts, axis=0) if len(df) else np.empty((0, 3), dtype=np.int64)
+            keys = zip((self.dates[i] for i in day_codes), categories[codes[starts]])
+            self.daily_line_totals = pd.DataFrame(
+                sums,
+                index=pd.MultiIndex.from_tuples(list(keys), names=["사용일자", "노선명"]),
+                columns=COUNT_COLS,
+            )
+
+        if station_monthly is not None:
+            self.station_monthly = _with_total(station_monthly, ["월", "노선명", "역명"])
+        else:
+            # 역별 월 합계 (groupby 한 번)
+            month = df["사용일자"].dt.to_period("M").rename("월")
+            self.station_monthly = df.groupby(
+                [month, df["노선명"], df["역명"]], observed=True, sort=True
+            )[COUNT_COLS].sum()
+
+        # 노선별 월 합계는 역별 월 합계에서 다시 묶어 원본을 재조회하지 않습니다.
+        self.line_monthly = self.station_monthly.groupby(level=["월", "노선명"], observed=True).sum()
+
+    def dates_in(self, month):
+        """해당 월(Period 또는 'YYYY-MM')에 데이터가 있는 날짜 목록"""
+        month = pd.Period(month, "M")
+        return [date for date in self.dates if pd.Period(date, "M") == month]
+
+    def lookup(self, date, line=None):
+        """
+        선택한 날짜·노선의 역별 행(총승객 내림차순)을 반환합니다. 없으면 빈 프레임
+        line=None 이면 그 날짜의 모든 노선 행 (노선 순, 노선 안에서 총승객 내림차순)
+        """
+        day = self._date_pos.get(pd.Timestamp(date).date())
+        if day is None or (line is not None and line not in self._line_pos):
+            return self.frame.iloc[0:0]
+        start, stop = self._day_bounds[day] if line is None else self._bounds[day, self._line_pos[line]]
+        return self.frame.iloc[start:stop]
+
+
+def _with_total(df, keys):
+    """미리 계산된 승차·하차 합계 표 → keys 인덱스 + 총승객 컬럼을 더한 표 (직접 계산한 것과 같은 모양)"""
+    df = df.assign(총승객=df["승차총승객수"] + df["하차총승객수"])
+    if "사용일자" in keys:
+        df["사용일자"] = pd.to_datetime(df["사용일자"]).dt.date
+    return df.set_index(keys).sort_index()[COUNT_COLS]
@@ -0,0 +1,143 @@
+"""
+역·노선별 일별 승객 시계열 (역 × 날짜 행렬)
+- 로딩 시 한 번만 [키(역 또는 노선), 날짜] int32 총승객 행렬과 날짜 방향 누적합(int64)을 만들어 둡니다.
+  → 어떤 기간이든 키별 합계·평균은 누적합 두 값의 뺄셈(키마다 O(1))입니다.
+- 7일 이동평균, 요일별 평균(요일 프로필), 이상치 표시도 모든 키에 대해 한 번에 계산해 둡니다.
+  이상치: 직전 7일 평균에 요일 비율을 곱한 기대값에서 ANOMALY_THRESHOLD 이상 벗어난 날
+- 데이터가 없는 날(달력상 빠진 날)은 0 으로 채우고, 이동평균·이상치 계산에서는 제외합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+WINDOW = 7
+ANOMALY_THRESHOLD = 0.35   # 기대값 대비 ±35% 이상이면 이상치
+MIN_EXPECTED = 100         # 기대값이 너무 작은(한산한) 날은 비율이 크게 흔들려 표시하지 않음
+
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+def _cumsum(values):
+    """[키, 날짜] → 앞에 0 열을 붙인 날짜 방향 누적합 (int64, 폭 +1)"""
+    cumsum = np.zeros((values.shape[0], values.shape[1] + 1), dtype=np.int64)
+    np.cumsum(values, axis=1, out=cumsum[:, 1:])
+    return cumsum
+
+
+class DailyMatrix:
+    """키(역 또는 노선) × 날짜 int32 총승객 + 누적합·이동평균·요일 프로필·이상치"""
+
+    def __init__(self, keys, dates, values, present, version=None):
+        # keys: pd.Index (키 이름), dates: 하루 간격 DatetimeIndex, values: [키, 날짜] int32, present: 데이터가 있는 날
+        self.version = version
+        self.keys = keys
+        self.dates = dates
+        self.values = values
+        self.present = present
+        self._pos = {key: i for i, key in enumerate(keys)}
+        self.cumsum = _cumsum(values)
+        present_cumsum = np.concatenate([[0], np.cumsum(present)])
+
+        # 7일 이동평균 (그날 포함 직전 7일, 데이터가 있는 날만 평균) — 7일이 안 되는 앞부분은 NaN
+        n_days = len(dates)
+        end = np.arange(1, n_days + 1)
+        start = np.maximum(end - WINDOW, 0)
+        days = present_cumsum[end] - present_cumsum[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rolling = (self.cumsum[:, end] - self.cumsum[:, start]) / days
+        rolling[:, end < WINDOW] = np.nan
+        self.rolling = rolling.astype(np.float32)
+
+        # 요일 프로필: 요일별 평균 / 전체 평균 (데이터가 있는 날만)
+        weekday = dates.weekday.to_numpy()
+        onehot = np.zeros((n_days, 7), dtype=np.float64)
+        onehot[np.flatnonzero(present), weekday[present]] = 1.0
+        counts = onehot.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.weekday_means = (values @ onehot / counts).astype(np.float32)  # [키, 요일]
+            overall = values[:, present].mean(axis=1, keepdims=True) if present.any() else np.zeros((len(keys), 1))
+            factor = np.where(overall > 0, self.weekday_means / overall, 1.0)
+        self.weekday = weekday
+
+        # 이상치 기대값 = 직전 7일(그날 제외) 평균 ÷ 그 7일의 평균 요일 비율 × 그날의 요일 비율
+        # (요일이 섞인 평균을 '보통 날' 수준으로 맞춘 뒤 그날 요일의 비율을 곱함 → 주말이 매번 이상치가 되지 않음)
+        day_factor = factor[:, weekday] * present
+        factor_cumsum = np.zeros((len(keys), n_days + 1))
+        np.cumsum(day_factor, axis=1, out=factor_cumsum[:, 1:])
+        expected = np.full(values.shape, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            week_factor = (factor_cumsum[:, end[:-1]] - factor_cumsum[:, start[:-1]]) / days[:-1]
+            expected[:, 1:] = rolling[:, :-1] / week_factor * factor[:, weekday[1:]]
+            deviation = np.abs(values / expected - 1)
+        self.expected = expected.astype(np.float32)
+        self.anomaly = present & (expected >= MIN_EXPECTED) & (np.nan_to_num(deviation) >= ANOMALY_THRESHOLD)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def position(self, key):
+        return self._pos[key]
+
+    def day_range(self, start=None, end=None):
+        """날짜(포함) 범위 → 열 구간 [i, j) (범위 밖은 잘라냄)"""
+        i = 0 if start is None else int(self.dates.searchsorted(pd.Timestamp(start), side="left"))
+        j = len(self.dates) if end is None else int(self.dates.searchsorted(pd.Timestamp(end), side="right"))
+        return i, max(i, j)
+
+    def window_totals(self, start=None, end=None):
+        """기간 합계 (모든 키, 누적합 뺄셈 한 번)"""
+        i, j = self.day_range(start, end)
+        return self.cumsum[:, j] - self.cumsum[:, i]
+
+    def window_means(self, start=None, end=None):
+        """기간의 (데이터가 있는 날 기준) 일 평균 (모든 키)"""
+        i, j = self.day_range(start, end)
+        days = int(self.present[i:j].sum())
+        return (self.cumsum[:, j] - self.cumsum[:, i]) / days if days else np.full(len(self.keys), np.nan)
+
+    def series(self, key, start=None, end=None):
+        """한 키의 일별 표 (총승객, 7일 평균, 기대값, 이상치) — 데이터가 있는 날만"""
+        row = self._pos[key]
+        i, j = self.day_range(start, end)
+        present = self.present[i:j]
+        return pd.DataFrame({
+            "총승객": self.values[row, i:j],
+            "7일 평균": self.rolling[row, i:j],
+            "기대값": self.expected[row, i:j],
+            "이상치": self.anomaly[row, i:j],
+        }, index=self.dates[i:j])[present]
+
+    def weekday_profile(self, key, start=None, end=None):
+        """한 키의 기간 안 요일별 일 평균 (월~일 Series)"""
+        row = self._pos[key]
+        i, j = self.day_range(start, end)
+        present = self.present[i:j]
+        totals = np.bincount(self.weekday[i:j][present], weights=self.values[row, i:j][present], minlength=7)
+        counts = np.bincount(self.weekday[i:j][present], minlength=7)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.Series(totals / counts, index=pd.Index(WEEKDAYS, name="요일"), name="일 평균")
+
+
+def build_daily_matrices(frame, version=None):
+    """
+    승하차 프레임 → (역 DailyMatrix, 노선 DailyMatrix)
+    역 키는 '역명 (노선명)', 노선 키는 노선명. 날짜는 처음~마지막 날의 하루 간격 달력입니다.
+    """
+    first = frame["사용일자"].min()
+    dates = pd.date_range(first, frame["사용일자"].max(), freq="D", name="사용일자")
+    day = ((frame["사용일자"] - first) // pd.Timedelta(days=1)).to_numpy(dtype=np.int64)
+    present = np.zeros(len(dates), dtype=bool)
+    present[day] = True
+    totals = frame["승차총승객수"].to_numpy(dtype=np.int64) + frame["하차총승객수"].to_numpy(dtype=np.int64)
+
+    line = frame["노선명"].astype(str).to_numpy(dtype=object)
+    station = frame["역명"].astype(str).to_numpy(dtype=object)
+    station_codes, station_keys = pd.factorize(station + " (" + line + ")", sort=True)
+    line_codes, line_keys = pd.factorize(line, sort=True)
+
+    def matrix(codes, keys):
+        cells = np.bincount(codes * len(dates) + day, weights=totals, minlength=len(keys) * len(dates))
+        values = cells.reshape(len(keys), len(dates)).astype(np.int32)
+        return DailyMatrix(pd.Index(keys), dates, values, present, version=version)
+
+    return matrix(station_codes, station_keys), matrix(line_codes, line_keys)
@@ -0,0 +1,221 @@
+"""
+지하철 승하차 데이터의 월별 파티션 저장소
+- 행을 달마다 한 폴더(month=YYYY-MM)에 Parquet 로 나눠 저장하고, 화면에서는 필요한 달만 읽습니다.
+- 새 일별 파일이 들어오면 그 날짜가 속한 달만 다시 쓰고(이미 있는 날짜는 새 데이터로 교체),
+  (날짜, 노선) 일 합계와 (노선, 역) 월 합계는 들어온·교체된 날짜 분만 더하고 빼서 갱신합니다.
+- 파티션은 고쳐 쓰지 않고 새 리비전 폴더(r<번호>)에 쓴 뒤 manifest 를 원자적으로 교체합니다.
+  읽는 쪽은 항상 완성된 리비전만 보며, 직전 리비전은 다른 세션이 읽는 중일 수 있어 남겨 둡니다.
+- 쓰기는 writing() 안에서만 합니다. 스레드 간에는 RLock, 프로세스 간(서버 여러 개, precompute 풀)에는
+  저장소 폴더의 잠금 파일(flock)로 한 번에 하나만 쓰게 하고, 잠금을 얻은 뒤 manifest 를 다시 읽습니다.
+  → 두 프로세스가 같은 r<번호> 를 고르거나 _prune 이 다른 쪽이 막 쓴 리비전을 지우는 일이 없습니다.
+"""
+
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows — 프로세스 간 잠금 없이 스레드 잠금만 씁니다.
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from shared.files import read_manifest, write_manifest
+
+DATE_COL = "사용일자"
+KEY_COLS = ["사용일자", "노선명", "역명"]
+COUNT_COLS = ["승차총승객수", "하차총승객수"]
+
+ROWS_FILE = "rows.parquet"
+DAILY_LINE_FILE = "daily_line.parquet"
+STATION_FILE = "station_monthly.parquet"
+LOCK_FILE = ".lock"
+
+# 달마다 남겨 둘 리비전 수 (현재 + 직전)
+KEEP_REVISIONS = 2
+
+
+def month_of(dates):
+    """datetime64 배열 → 'YYYY-MM' 문자열 배열"""
+    return np.asarray(dates).astype("datetime64[M]").astype(str)
+
+
+def daily_line_totals(df):
+    """행 → (사용일자, 노선명) 일 합계 (키는 문자열, 합계는 int64)"""
+    keys = [df["사용일자"], df["노선명"].astype(str)]
+    return df[COUNT_COLS].astype("int64").groupby(keys).sum()
+
+
+def station_totals(df):
+    """행 → (노선명, 역명) 합계 (키는 문자열, 합계는 int64)"""
+    keys = [df["노선명"].astype(str), df["역명"].astype(str)]
+    return df[COUNT_COLS].astype("int64").groupby(keys).sum()
+
+
+class SubwayStore:
+    """manifest.json + month=YYYY-MM/r<리비전>/{rows, daily_line, station_monthly}.parquet"""
+
+    def __init__(self, root, schema, schema_version):
+        self.root = Path(root)
+        self.schema = schema
+        self.schema_version = schema_version
+        self._manifest_path = self.root / "manifest.json"
+        self._manifest = None
+        self._manifest_mtime = None
+        self.lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+
+    # ---------------- 읽기 -----------------
+    def manifest(self):
+        """현재 manifest (파일이 바뀐 경우에만 다시 읽음). 스키마 버전이 다르면 빈 저장소로 봅니다."""
+        try:
+            mtime = os.stat(self._manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self._manifest is None or mtime != self._manifest_mtime:
+            manifest = read_manifest(self._manifest_path) if mtime is not None else None
+            if manifest is None or manifest.get("schema_version") != self.schema_version:
+                manifest = {"schema_version": self.schema_version, "partitions": {}, "sources": {}}
+            self._manifest, self._manifest_mtime = manifest, mtime
+        return self._manifest
+
+    def months(self):
+        """데이터가 있는 달 목록 ('YYYY-MM', 오래된 순)"""
+        return sorted(self.manifest()["partitions"])
+
+    def partitions(self, months=None):
+        """((달, 리비전), ...) — 읽을 파티션 목록이자 캐시 키. months 를 주면 그 달 중 데이터가 있는 것만"""
+        partitions = self.manifest()["partitions"]
+        months = self.months() if months is None else sorted(set(months) & set(partitions))
+        return tuple((month, partitions[month]["revision"]) for month in months)
+
+    def source_digest(self, source):
+        """source 파일을 마지막으로 반영했을 때의 내용 해시 (반영한 적이 없으면 None)"""
+        return self.manifest()["sources"].get(str(source))
+
+    def partition_dir(self, month, revision):
+        return self.root / f"month={month}" / f"r{revision}"
+
+    def read_rows(self, month, revision):
+        return pq.read_table(self.partition_dir(month, revision) / ROWS_FILE)
+
+    def read_daily_line(self, month, revision):
+        return pd.read_parquet(self.partition_dir(month, revision) / DAILY_LINE_FILE)
+
+    def read_station(self, month, revision):
+        return pd.read_parquet(self.partition_dir(month, revision) / STATION_FILE)
+
+    # ---------------- 쓰기 -----------------
+    @contextmanager
+    def writing(self):
+        """
+        쓰기 잠금 (같은 프로세스 안에서는 겹쳐 써도 됨). 잠금을 얻을 때마다 manifest 를 디스크에서 다시 읽으므로
+        안에서 보는 manifest·리비전 번호는 다른 프로세스가 쓴 것까지 반영된 최신 상태입니다.
+        """
+        with self.lock:
+            if self._lock_depth == 0:
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._lock_file = open(self.root / LOCK_FILE, "a+b")
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX)  # 파일을 닫으면 풀림
+            self._lock_depth += 1
+            try:
+                self._manifest = None
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def append(self, table, source=None, digest=None):
+        """
+        검증된 Arrow Table 을 해당 달 파티션에 추가합니다. (이미 있는 날짜는 table 의 행으로 교체)
+        source/digest 를 주면 manifest 에 반영 기록을 남깁니다. 바뀐 달 → (이전 리비전, 새 리비전) 을 반환
+        """
+        table = table.cast(self.schema)
+        months = month_of(table[DATE_COL].to_numpy())
+        changed = {}
+        with self.writing():
+            manifest = self.manifest()
+            partitions = dict(manifest["partitions"])
+            for month in np.unique(months):
+                old = partitions.get(month)
+                old_revision = old["revision"] if old else None
+                new_revision = max([old_revision or 0, *self._revisions(month)]) + 1
+                entry = self._write_partition(
+                    month, old_revision, new_revision, table.filter(pa.array(months == month)),
+                )
+                partitions[month] = entry
+                changed[month] = (old_revision, new_revision)
+
+            manifest = {
+                "schema_version": self.schema_version,
+                "partitions": partitions,
+                "sources": {**manifest["sources"], **({str(source): digest} if source is not None else {})},
+            }
+            write_manifest(self._manifest_path, manifest)
+            self._manifest = None
+            for month in changed:
+                self._prune(month)
+        return changed
+
+    def _write_partition(self, month, old_revision, new_revision, new):
+        """한 달 파티션을 새 리비전 폴더에 씁니다. 집계는 교체된 날짜만 빼고 새 날짜만 더합니다."""
+        new_df = new.to_pandas(date_as_object=False)
+        new_dates = pa.array(np.unique(new[DATE_COL].to_numpy()))
+        if old_revision is None:
+            rows = new
+            daily = daily_line_totals(new_df)
+            station = station_totals(new_df)
+        else:
+            old = self.read_rows(month, old_revision)
+            replaced = pc.is_in(old[DATE_COL], value_set=new_dates)
+            removed_df = old.filter(replaced).to_pandas(date_as_object=False)
+            rows = pa.concat_tables([old.filter(pc.invert(replaced)), new]).unify_dictionaries()
+
+            daily = self.read_daily_line(month, old_revision).set_index(["사용일자", "노선명"])
+            kept_days = ~daily.index.get_level_values("사용일자").isin(pd.DatetimeIndex(np.asarray(new_dates)))
+            daily = pd.concat([daily[kept_days], daily_line_totals(new_df)])
+
+            station = self.read_station(month, old_revision).set_index(["노선명", "역명"])
+            station = station.sub(station_totals(removed_df), fill_value=0).add(station_totals(new_df), fill_value=0)
+            station = station[(station != 0).any(axis=1)].astype("int64")
+
+        order = pc.sort_indices(rows, sort_keys=[(DATE_COL, "ascending")])
+        rows = rows.take(order).combine_chunks()
+        daily = daily.sort_index()
+        station = station.sort_index()
+
+        target = self.partition_dir(month, new_revision)
+        target.mkdir(parents=True)
+        pq.write_table(rows, target / ROWS_FILE)
+        daily.reset_index().to_parquet(target / DAILY_LINE_FILE, index=False)
+        station.reset_index().to_parquet(target / STATION_FILE, index=False)
+
+        dates = rows[DATE_COL]
+        return {
+            "revision": new_revision,
+            "rows": rows.num_rows,
+            "first_date": str(pc.min(dates)),
+            "last_date": str(pc.max(dates)),
+        }
+
+    def _revisions(self, month):
+        """디스크에 있는 month 의 리비전 번호 (오름차순, 스키마가 바뀌기 전 것이나 실패한 쓰기 포함)"""
+        return sorted(
+            int(path.name[1:]) for path in (self.root / f"month={month}").glob("r*") if path.name[1:].isdigit()
+        )
+
+    def _prune(self, month):
+        """오래된 리비전 폴더를 지웁니다. (최근 KEEP_REVISIONS 개는 남김)"""
+        for revision in self._revisions(month)[:-KEEP_REVISIONS]:
+            shutil.rmtree(self.partition_dir(month, revision), ignore_errors=True)
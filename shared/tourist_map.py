@@ -0,0 +1,73 @@
+"""
+서울 관광지 Folium 지도 만들기
+- 순위 마커 모양은 CSS 클래스 하나(.rank-marker)로 지도 머리말에 한 번만 넣고,
+  마커마다 인라인 style 대신 클래스 이름만 붙여 브라우저로 보내는 HTML 을 줄입니다.
+- 기본 지도(타일·레이어 컨트롤)와 관광지 마커 레이어를 따로 만들어,
+  마커는 지도 범위 안의 것만 레이어로 보낼 수 있습니다. (shared.folium_map.show_map 의 layer)
+"""
+
+import folium
+from folium.plugins import MarkerCluster
+
+MAP_CENTER = [37.5665, 126.9780]
+MARKER_COLORS = ["#E63946", "#F4A261", "#2A9D8F", "#1D3557", "#8ECAE6"]
+
+MARKER_CSS = "<style>\n.rank-marker {width:36px; height:36px; line-height:36px; border-radius:18px; color:white; font-weight:bold; text-align:center; font-size:16px; box-shadow:0 0 5px rgba(0,0,0,0.4);}\n" + "".join(
+    f".rank-marker.c{i} {{background:{color};}}\n" for i, color in enumerate(MARKER_COLORS)
+) + "</style>"
+
+
+def marker_icon_html(rank):
+    return f'<div class="rank-marker c{(rank - 1) % len(MARKER_COLORS)}">{rank}</div>'
+
+
+def build_base_map():
+    """타일 레이어·레이어 컨트롤·마커 CSS 만 들어간 기본 folium.Map (마커는 build_marker_layer 로 따로 붙입니다)"""
+    # 기본 타일(OpenStreetMap)은 아래에서 레이어로 직접 추가하므로 tiles=None 으로 중복을 없앱니다.
+    m = folium.Map(location=MAP_CENTER, zoom_start=12, control_scale=True, tiles=None)
+    m.get_root().header.add_child(folium.Element(MARKER_CSS))
+
+    # 타일 추가
+    folium.TileLayer("OpenStreetMap").add_to(m)
+    folium.TileLayer(
+        tiles="https://stamen-tiles.a.ssl.fastly.net/terrain/{z}/{x}/{y}.jpg",
+        attr="Map tiles by Stamen Design (CC BY 3.0) — Data © OpenStreetMap contributors",
+        name="Stamen Terrain"
+    ).add_to(m)
+    folium.LayerControl().add_to(m)
+    return m
+
+
+def popup_html(p, ridership=None):
+    """마커 팝업 HTML (승하차 데이터가 있으면 역·최근 일 평균·30일 추이 스파크라인 포함)"""
+    html = f"<b>{p['rank']}. {p['name']}</b>"
+    summary = ridership.summary(p["name"]) if ridership is not None else None
+    if summary:
+        html += (
+            f"<br>🚇 {', '.join(summary['stations'])}역 하루 평균 {summary['daily_mean']:,.0f}명"
+            f"<br>{summary['sparkline']}"
+        )
+    return html
+
+
+def build_marker_layer(places, ridership=None):
+    """관광지 목록(순위 순)의 마커 클러스터가 들어간 folium.FeatureGroup"""
+    group = folium.FeatureGroup(name="관광지")
+    cluster = MarkerCluster().add_to(group)
+
+    # 마커 추가
+    for p in places:
+        folium.Marker(
+            location=[p["lat"], p["lon"]],
+            popup=folium.Popup(popup_html(p, ridership), max_width=260),
+            tooltip=p["name"],
+            icon=folium.DivIcon(html=marker_icon_html(p["rank"]))
+        ).add_to(cluster)
+    return group
+
+
+def build_tourist_map(places):
+    """관광지 목록(순위 순)으로 마커 클러스터·타일 레이어가 들어간 folium.Map 을 만듭니다. (한 번에 모두 그릴 때)"""
+    m = build_base_map()
+    build_marker_layer(places).add_to(m)
+    return m
@@ -0,0 +1,89 @@
+"""
+서버 시작 시 미리 불러오기(warm-up)
+- 환경변수 APP_WARMUP=1 이면 처음 실행되는 페이지에서 백그라운드 스레드를 하나 띄워
+  무거운 라이브러리를 import 하고 데이터셋을 공유 캐시(st.cache_resource)에 올려 둡니다.
+- 프로세스당 한 번만 실행되며, 화면 실행을 막지 않습니다. 실패한 데이터셋은 건너뜁니다.
+- 데이터셋을 불러오기 전에 파생 구조 작업(shared.precompute)을 프로세스 풀에 한꺼번에 넣어
+  여러 데이터셋을 동시에 만들고, 불러오기 단계에서는 만들어진 결과를 읽기만(또는 끝날 때까지 기다리기만) 합니다.
+- 진행 상황은 WARMUP_STATUS (이름 → 걸린 초 또는 오류 문자열) 로 확인할 수 있습니다.
+"""
+
+import importlib
+import os
+import threading
+import time
+
+from shared.lazy import HEAVY_MODULES
+
+WARMUP_ENV = "APP_WARMUP"
+
+# (이름, 모듈, 함수) — 함수 호출이 곧 공유 캐시 채우기
+WARMUP_DATASETS = [
+    ("mbti", "shared.mbti", "load_mbti"),
+    ("mbti_similarity", "shared.mbti", "load_mbti_similarity"),
+    ("population", "shared.population", "load_population"),
+    ("endangered", "shared.endangered", "load_endangered_index"),
+    ("subway", "shared.subway", "warm_latest_subway_index"),
+    ("places", "shared.places", "load_places"),
+    ("poi_ridership", "shared.ridership", "load_poi_ridership"),
+]
+
+WARMUP_STATUS = {}
+
+_thread = None
+_lock = threading.Lock()
+
+
+def warmup_enabled():
+    return os.environ.get(WARMUP_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def warm_up():
+    """라이브러리 import → 데이터셋 로딩을 차례로 실행합니다. (현재 스레드에서)"""
+    for name in HEAVY_MODULES:
+        _timed(f"import:{name}", importlib.import_module, name)
+    _timed("precompute", _precompute)
+    for name, module, function in WARMUP_DATASETS:
+        _timed(name, lambda: getattr(importlib.import_module(module), function)())
+
+
+def _precompute():
+    """작업을 등록하는 데이터셋 모듈을 불러오고, 등록된 작업을 현재 파일 버전으로 풀에 넣습니다."""
+    from shared import precompute
+    from shared.datasets import content_key, dataset_version
+
+    for module in dict.fromkeys(module for _, module, _ in WARMUP_DATASETS):
+        importlib.import_module(module)
+    versions = {}
+    for dataset in {dataset for dataset, _ in precompute.JOBS.values()}:
+        try:
+            versions[dataset] = content_key(dataset_version(dataset))
+        except OSError:
+            continue  # 파일이 없는 데이터셋 — 해당 페이지에서 오류를 보여줍니다.
+    precompute.precompute_all(versions)
+
+
+def _timed(name, fn, *args):
+    start = time.perf_counter()
+    try:
+        fn(*args)
+    except Exception as e:  # 데이터 파일이 없는 배포 등 — 해당 페이지에서 다시 시도하며 오류를 보여줍니다.
+        WARMUP_STATUS[name] = f"{type(e).__name__}: {e}"
+    else:
+        WARMUP_STATUS[name] = time.perf_counter() - start
+
+
+def start_warmup(force=False):
+    """
+    warm-up 스레드를 (프로세스당 한 번) 시작합니다.
+    APP_WARMUP 이 꺼져 있고 force=False 면 아무것도 하지 않습니다. 스레드를 시작했으면 True
+    """
+    global _thread
+    if not (force or warmup_enabled()):
+        return False
+    with _lock:
+        if _thread is not None:
+            return False
+        _thread = threading.Thread(target=warm_up, name="app-warmup", daemon=True)
+        _thread.start()
+    return True
@@ -0,0 +1,52 @@
+"""멸종위기종 인덱스: 등급 × 분류군 개수와 이름 검색을 pandas 로 직접 계산한 값과 비교"""
+
+import numpy as np
+import pandas as pd
+
+from shared.endangered_index import EndangeredIndex
+
+
+def make_frame():
+    return pd.DataFrame({
+        "국명": ["호랑이", "반달가슴곰", "수달", "산양", "황새", "저어새"],
+        "학명": ["Panthera tigris", "Ursus thibetanus", "Lutra lutra", "Naemorhedus caudatus", None, "Platalea minor"],
+        "분류군": ["포유류", "포유류", "포유류", "포유류", "조류", "조류"],
+        "등급": ["I급", "I급", "I급", "I급", "I급", "I급"],
+    }).assign(등급=lambda df: df["등급"].where(df.index % 2 == 0, "II급"))
+
+
+def test_counts_match_groupby():
+    df = make_frame()
+    index = EndangeredIndex(df)
+    expected = df.groupby(["등급", "분류군"]).size().unstack(fill_value=0)
+    pd.testing.assert_frame_equal(
+        index.counts.loc[expected.index, expected.columns], expected, check_names=False, check_dtype=False,
+    )
+    ranking = index.ranking(["I급", "II급"])
+    assert dict(zip(ranking["분류군"], ranking["개체수"])) == df["분류군"].value_counts().to_dict()
+
+
+def test_search_matches_each_name_separately():
+    df = make_frame()
+    index = EndangeredIndex(df)
+
+    def expected(query):
+        query = query.lower()
+        hits = df["국명"].str.lower().str.contains(query, regex=False) | \
+            df["학명"].fillna("").str.lower().str.contains(query, regex=False)
+        return np.flatnonzero(hits.to_numpy())
+
+    for query in ["호랑", "tigris", "LUTRA", "새", "a", "minor", "곰"]:
+        np.testing.assert_array_equal(index.search(query), expected(query))
+    # 국명 끝 + 학명 앞에 걸친 검색어는 어느 한 이름에도 없으므로 찾지 않습니다.
+    for query in ["이 p", "이p", "달lu", "곰 ursus"]:
+        assert len(index.search(query)) == 0
+    assert len(index.search("  ")) == len(df)
+
+
+def test_rows_filters_grade_taxon_and_query():
+    df = make_frame()
+    index = EndangeredIndex(df)
+    rows = index.rows(["I급"], ["포유류", "조류"], "a")
+    expected = df[(df["등급"] == "I급") & df["학명"].fillna("").str.lower().str.contains("a")]
+    pd.testing.assert_frame_equal(rows, expected)
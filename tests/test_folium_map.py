@@ -0,0 +1,73 @@
+"""shared.folium_map.show_map: 고정한 streamlit-folium 버전의 내부 함수로 지도·레이어를 그리는지, 실패하면 st_folium 으로 그리는지 (AppTest)"""
+
+from importlib.metadata import version
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from shared import folium_map
+
+
+def _page():
+    import folium
+    import streamlit as st
+
+    from shared.folium_map import show_map
+
+    def build():
+        m = folium.Map(location=[37.5665, 126.9780], zoom_start=12)
+        folium.Marker([37.5665, 126.9780], tooltip="서울시청").add_to(m)
+        return m
+
+    def layer(bounds):
+        def build_layer():
+            group = folium.FeatureGroup(name="역")
+            folium.CircleMarker([37.5547, 126.9707], radius=5, tooltip="서울역").add_to(group)
+            return group
+        return bounds is None, build_layer
+
+    data = show_map("test_map", "v1", {"n": 1}, build, height=300, key="map", layer=layer)
+    st.session_state["returned"] = sorted(data)
+
+
+def test_internals_exist():
+    # 고정 버전을 올릴 때 이 테스트가 깨지면 shared.folium_map 의 빠른 경로를 새 버전에 맞춰 고쳐야 합니다.
+    import streamlit_folium
+
+    missing = [name for name in folium_map._INTERNALS if not hasattr(streamlit_folium, name)]
+    assert not missing, f"streamlit-folium {version('streamlit-folium')} 에 없는 내부 함수: {missing}"
+
+
+def test_pinned_version_has_internals():
+    pinned = next(
+        line.split("==")[1].split()[0] for line in (Path(__file__).parents[1] / "requirements.txt").read_text(encoding="utf-8").splitlines()
+        if line.startswith("streamlit-folium==")
+    )
+    assert version("streamlit-folium") == pinned
+    assert folium_map.HAS_ARTEFACT_API
+
+
+def test_show_map_renders_under_apptest():
+    at = AppTest.from_function(_page, default_timeout=30).run()
+    assert not at.exception
+    assert {"bounds", "zoom", "last_clicked"} <= set(at.session_state["returned"])
+    # 다시 실행해도 캐시된 지도로 같은 결과
+    at.run()
+    assert not at.exception
+
+
+def test_show_map_falls_back_to_st_folium(monkeypatch):
+    # 내부 컴포넌트 호출 방식이 바뀐 버전 흉내: st_folium 이 넘기는 인자가 없으면 실패
+    import streamlit_folium
+
+    component_func = streamlit_folium._component_func
+
+    def strict(**kwargs):
+        if "on_change" not in kwargs:
+            raise TypeError("missing required keyword argument: 'on_change'")
+        return component_func(**kwargs)
+
+    monkeypatch.setattr(streamlit_folium, "_component_func", strict)
+    at = AppTest.from_function(_page, default_timeout=30).run()
+    assert not at.exception
+    assert {"bounds", "zoom", "last_clicked"} <= set(at.session_state["returned"])
@@ -0,0 +1,33 @@
+"""MBTI 행렬: 막대 라벨이 원본 값의 f"{v:.3f}" 와 같은지 (모든 유형 × 모든 국가)"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from shared.mbti import compute_mbti_matrix
+from shared.mbti_matrix import COUNTRY_COL, MbtiMatrix
+
+MBTI_CSV = Path(__file__).parents[1] / "countriesMBTI_16types.csv"
+
+
+def test_ranked_labels_match_format():
+    # 화면과 같은 경로(등록부의 dtype 정리 → MbtiMatrix)로 만든 라벨을 원본 CSV 값과 비교합니다.
+    df = pd.read_csv(MBTI_CSV, encoding="utf-8")
+    df.columns = [c.strip() for c in df.columns]
+    matrix = compute_mbti_matrix((str(MBTI_CSV), None))
+    by_country = df.set_index(COUNTRY_COL)
+    for mbti_type in matrix.types:
+        countries, _, labels, _ = matrix.ranked(mbti_type)
+        expected = [f"{v:.3f}" for v in by_country.loc[countries, mbti_type].to_numpy(dtype=np.float64)]
+        assert list(labels) == expected, mbti_type
+    country = matrix.countries[0]
+    assert list(matrix.labels(country)) == [f"{v:.3f}" for v in by_country.loc[country, matrix.types]]
+
+
+def test_missing_value_has_empty_label():
+    df = pd.DataFrame({COUNTRY_COL: ["A", "B"], "INFJ": [0.0935, np.nan], "INTJ": [0.0825, 0.1]})
+    matrix = MbtiMatrix(df)
+    countries, _, labels, _ = matrix.ranked("INFJ")
+    assert list(countries) == ["A", "B"] and list(labels) == ["0.093", ""]
+    assert list(matrix.labels("B")) == ["", "0.100"]
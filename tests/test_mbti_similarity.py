@@ -0,0 +1,87 @@
+"""MBTI 유사도: 블록 거리·top-k·군집을 한 쌍씩 직접 계산한 값과 비교"""
+
+import itertools
+
+import numpy as np
+
+from shared import mbti_similarity
+from shared.mbti_similarity import MbtiSimilarity, kmeans, normalize_rows, ward_linkage
+
+
+def _js(p, q):
+    m = (p + q) / 2
+
+    def kl(a, b):
+        mask = a > 0
+        return np.sum(a[mask] * np.log2(a[mask] / b[mask]))
+
+    return np.sqrt((kl(p, m) + kl(q, m)) / 2)
+
+
+def _cosine(p, q):
+    return 1 - p @ q / (np.linalg.norm(p) * np.linalg.norm(q))
+
+
+def _blobs(seed=0, sizes=(6, 5, 7)):
+    """서로 멀리 떨어진 분포 묶음 → (값, 정답 군집 번호)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.dirichlet(np.full(16, 0.3), size=len(sizes))
+    values = np.vstack([
+        np.clip(center + rng.normal(0, 0.002, (size, 16)), 0, None) for center, size in zip(centers, sizes)
+    ])
+    return values, np.repeat(np.arange(len(sizes)), sizes)
+
+
+def _same_partition(a, b):
+    pairs = np.stack([a, b], axis=1)
+    return len(np.unique(pairs, axis=0)) == len(np.unique(a)) == len(np.unique(b))
+
+
+def test_distances_and_neighbors_match_pairwise(monkeypatch):
+    monkeypatch.setattr(mbti_similarity, "BLOCK_BYTES", 256)  # 여러 행 묶음으로 나뉘도록
+    values = np.random.default_rng(1).dirichlet(np.ones(16), size=12)
+    values[3, :4] = 0  # 0 인 유형이 있는 나라
+    similarity = MbtiSimilarity([f"c{i}" for i in range(12)], values, top_k=4, n_clusters=3)
+    matrix = normalize_rows(values).astype(np.float64)
+
+    for metric, distance in (("js", _js), ("cosine", _cosine)):
+        expected = np.array([[distance(p, q) for q in matrix] for p in matrix])
+        np.testing.assert_allclose(similarity.distances[metric], expected, atol=2e-4)
+
+        np.fill_diagonal(expected, np.inf)
+        index, dist = similarity.neighbors[metric]
+        np.testing.assert_allclose(dist, np.sort(expected, axis=1)[:, :4], atol=2e-4)
+        np.testing.assert_allclose(np.take_along_axis(expected, index.astype(int), axis=1), dist, atol=2e-4)
+
+
+def test_clusters_recover_separated_groups():
+    values, truth = _blobs()
+    matrix = normalize_rows(values)
+    assert _same_partition(kmeans(matrix, 3), truth)
+    assert _same_partition(ward_linkage(matrix, 3), truth)
+
+
+def _naive_ward(x, k):
+    """매번 모든 군집 쌍의 제곱합 증가량을 새로 계산해 가장 작은 쌍을 합치는 Ward"""
+    clusters = [[i] for i in range(len(x))]
+
+    def sse(rows):
+        points = x[rows]
+        return ((points - points.mean(axis=0)) ** 2).sum()
+
+    while len(clusters) > k:
+        i, j = min(
+            itertools.combinations(range(len(clusters)), 2),
+            key=lambda pair: sse(clusters[pair[0]] + clusters[pair[1]]) - sse(clusters[pair[0]]) - sse(clusters[pair[1]]),
+        )
+        clusters[i] += clusters.pop(j)
+    labels = np.empty(len(x), dtype=int)
+    for number, rows in enumerate(clusters):
+        labels[rows] = number
+    return labels
+
+
+def test_ward_matches_naive_merge_order():
+    x = np.random.default_rng(2).random((14, 3))
+    for k in (2, 4, 7):
+        assert _same_partition(ward_linkage(x, k), _naive_ward(x, k))
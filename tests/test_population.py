@@ -0,0 +1,118 @@
+"""인구 AgeCube: 전체 표 변환(to_cube)과 나눠 읽기(stream_cube)가 같은 달·같은 합계를 만드는지"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared.age_cube import AGES, GENDERS, AgeCube
+from shared.population import (
+    REGION_COL, load_population, make_demo_wide, parse_age_columns, select_month, stream_cube, to_cube,
+)
+
+
+def _month_table(seed, year, month):
+    """데모 표(2025년10월)의 연월을 바꾼 한 달짜리 표"""
+    return make_demo_wide(seed).rename(columns=lambda c: c.replace("2025년10월", f"{year}년{month}월"))
+
+
+def _two_months():
+    """같은 지역·같은 나이 컬럼이 두 달(2025-09, 2025-10) 들어 있는 표 (두 달 값은 서로 다름)"""
+    september, october = _month_table(1, 2025, 9), _month_table(2, 2025, 10)
+    return september, october, pd.concat([september, october.drop(columns=REGION_COL)], axis=1)
+
+
+def _write(df, path):
+    df.to_csv(path, index=False, encoding="utf-8")
+    return path
+
+
+def test_stream_cube_matches_to_cube(tmp_path):
+    _, _, wide = _two_months()
+    path = _write(wide, tmp_path / "population.csv")
+    for month in (None, "2025-09", "2025-10"):
+        expected = to_cube(wide, month=month)
+        actual = stream_cube(path, month=month, chunk_bytes=4096)
+        assert list(actual.regions) == list(expected.regions)
+        assert (actual.months, actual.month) == (expected.months, expected.month)
+        np.testing.assert_array_equal(actual.counts, expected.counts)
+
+
+def test_two_month_file_gives_single_month_totals(tmp_path):
+    september, october, wide = _two_months()
+    path = _write(wide, tmp_path / "two.csv")
+
+    latest = stream_cube(path)
+    assert latest.months == ["2025-09", "2025-10"] and latest.month == "2025-10"
+    for month, table in (("2025-10", october), ("2025-09", september)):
+        single = stream_cube(_write(table, tmp_path / f"{month}.csv"))
+        np.testing.assert_array_equal(stream_cube(path, month=month).counts, single.counts)
+        np.testing.assert_array_equal(to_cube(wide, month=month).counts, single.counts)
+
+
+def test_select_month():
+    parsed = parse_age_columns(["2025년9월_남_0세", "2025년10월_남_0세", "2025년10월_여_0세", "총인구수"])
+    columns, months, month = select_month(parsed)
+    assert months == ["2025-09", "2025-10"] and month == "2025-10"
+    assert list(columns["col"]) == ["2025년10월_남_0세", "2025년10월_여_0세"]
+    with pytest.raises(ValueError):
+        select_month(parsed, "2024-01")
+
+    columns, months, month = select_month(parse_age_columns(["남_0세", "여_0세"]))
+    assert months == [] and month is None and len(columns) == 2
+
+
+def test_load_population_month(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_PRECOMPUTE", "0")
+    september, october, wide = _two_months()
+    path = _write(wide, tmp_path / "population.csv")
+
+    latest = load_population(path)
+    assert latest.month == "2025-10"
+    np.testing.assert_array_equal(latest.counts, to_cube(october).counts)
+    chosen = load_population(path, month="2025-09")
+    assert chosen.month == "2025-09" and chosen.version != latest.version
+    np.testing.assert_array_equal(chosen.counts, to_cube(september).counts)
+
+
+def _gender_table():
+    """계/남/여 × 0~100세 이상 + 합계 컬럼, 쉼표 숫자, 같은 구가 두 줄인 표"""
+    rng = np.random.default_rng(3)
+    ages = [f"{age}세" for age in range(100)] + ["100세 이상"]
+    columns = {REGION_COL: ["종로구", "중구", "종로구 ", "강남구"]}
+    for gender in ["계", "남", "여"]:
+        columns[f"2025년10월_{gender}_총인구수"] = ["1"] * 4
+        for age in ages:
+            columns[f"2025년10월_{gender}_{age}"] = [f"{v:,}" for v in rng.integers(0, 3000, 4)]
+    return pd.DataFrame(columns)
+
+
+def test_cube_matches_groupby():
+    wide = _gender_table()
+    cube = to_cube(wide)
+
+    long = wide.melt(id_vars=REGION_COL, var_name="col", value_name="인구수")
+    long = long[~long["col"].str.endswith("총인구수")]
+    long[REGION_COL] = long[REGION_COL].str.strip()
+    long["성별"] = long["col"].str.split("_").str[1]
+    long["나이"] = long["col"].str.extract(r"_(\d+)세")[0].astype(int)
+    long["인구수"] = long["인구수"].str.replace(",", "").astype(int)
+    expected = long.groupby([REGION_COL, "성별", "나이"])["인구수"].sum()
+
+    actual = pd.Series(
+        cube.counts.ravel(),
+        index=pd.MultiIndex.from_product([cube.regions, GENDERS, AGES], names=[REGION_COL, "성별", "나이"]),
+    )
+    pd.testing.assert_series_equal(actual.sort_index(), expected.sort_index(), check_dtype=False, check_names=False)
+
+    band = long[long["성별"] == "계"].query("20 <= 나이 <= 29").groupby(REGION_COL)["인구수"].sum()
+    ranking = cube.ranking(20, 29).set_index("행정구역")["인구수"]
+    pd.testing.assert_series_equal(ranking, band.sort_values(ascending=False), check_dtype=False, check_names=False)
+
+
+def test_cube_does_not_modify_counts():
+    counts = np.zeros((1, len(GENDERS), len(AGES)), dtype=np.int32)
+    counts[0, 1] = 1
+    counts[0, 2] = 2
+    cube = AgeCube(["종로구"], counts)
+    assert cube.curve("종로구").tolist() == [3] * len(AGES)
+    assert not counts[0, 0].any()
@@ -0,0 +1,51 @@
+"""행정구역 계층: 행정기관코드로 계산한 단계·상위 행정구역"""
+
+import numpy as np
+
+from shared.regions import RegionHierarchy, code_level, parse_region
+
+LABELS = [
+    "서울특별시  (1100000000)",
+    "서울특별시 종로구 (1111000000)",
+    "서울특별시 종로구 청운효자동(1111051500)",
+    "서울특별시 종로구 사직동(1111053000)",
+    "서울특별시 중구 (1114000000)",
+    "경기도  (4100000000)",
+    "경기도 수원시 (4111000000)",
+    "경기도 수원시 장안구 (4111100000)",
+    "경기도 수원시 장안구 파장동(4111112900)",
+    "경기도 가평군 (4182000000)",
+]
+
+# 행 → 바로 위 단계 행 (일반구가 있는 시: 동 → 일반구 → 시 → 도)
+PARENTS = {1: 0, 2: 1, 3: 1, 4: 0, 6: 5, 7: 6, 8: 7, 9: 5}
+
+
+def test_parse_and_level():
+    assert parse_region(LABELS[2]) == ("서울특별시 종로구 청운효자동", "1111051500")
+    assert parse_region("종로구") == ("종로구", None)
+    assert [code_level(parse_region(label)[1]) for label in LABELS] == [1, 2, 3, 3, 2, 1, 2, 2, 3, 2]
+
+
+def test_parents_children_and_mask():
+    hierarchy = RegionHierarchy(LABELS)
+    expected = np.full(len(LABELS), -1)
+    for row, parent in PARENTS.items():
+        expected[row] = parent
+    np.testing.assert_array_equal(hierarchy.parent, expected)
+    assert hierarchy.roots() == [LABELS[0], LABELS[5]]
+    assert hierarchy.children(LABELS[1]) == LABELS[2:4]
+    assert hierarchy.parent_of(LABELS[8]) == LABELS[7]
+    assert hierarchy.parent_of(LABELS[0]) is None
+
+    # 경기도 하위의 시군구 단계 → 수원시, 장안구(일반구도 코드상 시군구 단계), 가평군
+    inside = hierarchy.mask(level=2, within=LABELS[5])
+    assert [LABELS[i] for i in np.flatnonzero(inside)] == [LABELS[6], LABELS[7], LABELS[9]]
+    assert hierarchy.levels(within=LABELS[5]) == [2, 3]
+    assert hierarchy.levels(within=LABELS[4]) == []
+
+
+def test_labels_without_codes_are_roots():
+    hierarchy = RegionHierarchy(["종로구", "중구"])
+    assert not hierarchy.has_codes
+    assert hierarchy.roots() == ["종로구", "중구"] and hierarchy.levels() == [1]
@@ -0,0 +1,38 @@
+"""격자 공간 인덱스: 가장 가까운 점·범위 조회를 전체 점을 훑는 계산과 비교"""
+
+import numpy as np
+
+from shared.spatial import GridIndex, haversine_m
+
+
+def _points(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return 37.45 + rng.random(n) * 0.25, 126.8 + rng.random(n) * 0.35
+
+
+def test_nearest_matches_brute_force():
+    lat, lon = _points()
+    grid = GridIndex(lat, lon)
+    rng = np.random.default_rng(1)
+    # 점들 사이, 격자 가장자리, 격자 밖 멀리 떨어진 곳
+    queries = [(37.45 + rng.random() * 0.25, 126.8 + rng.random() * 0.35) for _ in range(200)]
+    queries += [(37.44, 126.79), (37.71, 127.16), (35.1, 129.0), (38.5, 126.0)]
+    for qlat, qlon in queries:
+        distances = haversine_m(qlat, qlon, lat, lon)
+        position, distance = grid.nearest(qlat, qlon)
+        assert distance == distances.min()
+        assert distances[position] == distances.min()
+
+
+def test_within_matches_brute_force():
+    lat, lon = _points()
+    grid = GridIndex(lat, lon)
+    for south, west, north, east in [(37.5, 126.9, 37.6, 127.0), (37.0, 126.0, 38.0, 128.0), (36.0, 126.0, 36.1, 126.1)]:
+        inside = np.flatnonzero((lat >= south) & (lat <= north) & (lon >= west) & (lon <= east))
+        np.testing.assert_array_equal(grid.within(south, west, north, east), inside)
+
+
+def test_empty_grid():
+    grid = GridIndex([], [])
+    assert grid.nearest(37.5, 127.0) == (-1, float("inf"))
+    assert len(grid.within(37.0, 126.0, 38.0, 128.0)) == 0
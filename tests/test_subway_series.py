@@ -0,0 +1,71 @@
+"""역·노선 일별 행렬(DailyMatrix): 합계·이동평균·요일 프로필·이상치를 pandas 로 직접 계산한 값과 비교"""
+
+import numpy as np
+import pandas as pd
+
+from shared.subway_series import ANOMALY_THRESHOLD, MIN_EXPECTED, WINDOW, build_daily_matrices
+
+
+def make_frame(seed=0):
+    """2개 노선 × 3개 역, 6주 (20일은 데이터 없음, 30일 시청역은 평소의 3배)"""
+    rng = np.random.default_rng(seed)
+    days = [day for day in pd.date_range("2025-01-01", "2025-02-11") if day.day != 20 or day.month != 1]
+    stations = [("1호선", "시청"), ("1호선", "서울역"), ("2호선", "시청")]
+    rows = []
+    for day in days:
+        weekend = day.weekday() >= 5
+        for line, station in stations:
+            base = 2000 if not weekend else 1200
+            boarding = int(base + rng.integers(-100, 100))
+            if day == pd.Timestamp("2025-01-30") and station == "시청" and line == "1호선":
+                boarding *= 3
+            rows.append((day, line, station, boarding, int(boarding * 0.9)))
+    return pd.DataFrame(rows, columns=["사용일자", "노선명", "역명", "승차총승객수", "하차총승객수"])
+
+
+def _daily(frame, key):
+    """키 × 달력 날짜 총승객 (빠진 날은 NaN) — pandas groupby + pivot"""
+    totals = frame.assign(총승객=frame["승차총승객수"] + frame["하차총승객수"]).groupby([key, "사용일자"])["총승객"].sum()
+    dates = pd.date_range(frame["사용일자"].min(), frame["사용일자"].max(), name="사용일자")
+    return totals.unstack(key).reindex(dates)
+
+
+def _reference(daily):
+    """DailyMatrix 와 같은 규칙을 pandas 로: 7일 이동평균, 요일 비율, 기대값, 이상치"""
+    rolling = daily.rolling(WINDOW, min_periods=1).mean()
+    rolling.iloc[:WINDOW - 1] = np.nan
+    weekday = daily.index.weekday
+    factor = daily.groupby(weekday).mean() / daily.mean()
+    day_factor = pd.DataFrame(factor.loc[weekday].to_numpy(), index=daily.index, columns=daily.columns)
+    day_factor = day_factor.where(daily.notna())
+    week_factor = day_factor.rolling(WINDOW, min_periods=1).mean()
+    expected = (rolling / week_factor).shift(1) * factor.loc[weekday].to_numpy()
+    anomaly = daily.notna() & (expected >= MIN_EXPECTED) & ((daily / expected - 1).abs() >= ANOMALY_THRESHOLD)
+    return rolling, expected, anomaly
+
+
+def test_station_and_line_matrices_match_pandas():
+    frame = make_frame()
+    stations, lines = build_daily_matrices(frame)
+    for matrix, key in ((stations, "키"), (lines, "노선명")):
+        source = frame.assign(키=frame["역명"] + " (" + frame["노선명"] + ")")
+        daily = _daily(source, key)
+        assert list(matrix.keys) == list(daily.columns)
+        np.testing.assert_array_equal(matrix.present, daily.notna().all(axis=1).to_numpy())
+        np.testing.assert_array_equal(matrix.values, daily.fillna(0).to_numpy().T)
+
+        rolling, expected, anomaly = _reference(daily)
+        np.testing.assert_allclose(matrix.rolling, rolling.to_numpy().T, rtol=1e-5)
+        np.testing.assert_allclose(matrix.expected, expected.to_numpy().T, rtol=1e-4)
+        np.testing.assert_array_equal(matrix.anomaly, anomaly.to_numpy().T)
+
+        np.testing.assert_allclose(
+            matrix.window_means("2025-01-10", "2025-01-25"), daily.loc["2025-01-10":"2025-01-25"].mean().to_numpy(),
+        )
+
+
+def test_spike_is_flagged():
+    stations, _ = build_daily_matrices(make_frame())
+    flagged = stations.series("시청 (1호선)").query("이상치").index
+    assert pd.Timestamp("2025-01-30") in flagged
+    assert not stations.series("서울역 (1호선)")["이상치"].loc["2025-01-30"]
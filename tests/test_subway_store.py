@@ -0,0 +1,96 @@
+"""지하철 월별 저장소: 추가·교체 후 집계가 pandas groupby 와 같은지, 여러 프로세스가 동시에 써도 리비전이 겹치지 않는지"""
+
+import multiprocessing
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+from shared.subway import SCHEMA_VERSION, SUBWAY_SCHEMA
+from shared.subway_store import SubwayStore
+
+
+def make_table(days, stations=("시청", "서울역"), seed=0):
+    """2025-01 의 days(일) × stations 승하차 행 (값은 seed 로 정함)"""
+    rng = np.random.default_rng(seed)
+    dates = np.repeat(np.datetime64("2025-01-01") + np.asarray(days) - 1, len(stations))
+    n = len(dates)
+    return pa.table({
+        "사용일자": pa.array(dates.astype("datetime64[D]")),
+        "노선명": pa.array(["1호선"] * n).dictionary_encode(),
+        "역명": pa.array(list(stations) * len(days)).dictionary_encode(),
+        "승차총승객수": pa.array(rng.integers(0, 1000, n), pa.int32()),
+        "하차총승객수": pa.array(rng.integers(0, 1000, n), pa.int32()),
+    }).cast(SUBWAY_SCHEMA)
+
+
+def _append_days(root, days):
+    store = SubwayStore(root, SUBWAY_SCHEMA, SCHEMA_VERSION)
+    for day in days:
+        store.append(make_table([day], seed=day), source=f"day{day}.csv", digest=str(day))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="flock 은 POSIX 에서만")
+def test_concurrent_writers_keep_every_day(tmp_path):
+    context = multiprocessing.get_context("fork")
+    writers = [context.Process(target=_append_days, args=(tmp_path, range(start, 29, 4))) for start in range(1, 5)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+
+    store = SubwayStore(tmp_path, SUBWAY_SCHEMA, SCHEMA_VERSION)
+    (month, revision), = store.partitions()
+    rows = store.read_rows(month, revision)
+    assert rows.num_rows == 28 * 2
+    assert len(store.manifest()["sources"]) == 28
+    assert store.read_daily_line(month, revision)["승차총승객수"].sum() == pc.sum(rows["승차총승객수"]).as_py()
+
+
+def _frame(table):
+    df = table.to_pandas(date_as_object=False)
+    df["노선명"] = df["노선명"].astype(str)
+    df["역명"] = df["역명"].astype(str)
+    return df
+
+
+def _assert_aggregates(store, expected):
+    """저장소의 행·일 합계·역 합계가 expected 행 프레임을 pandas groupby 로 집계한 값과 같은지"""
+    (month, revision), = store.partitions()
+    rows = _frame(store.read_rows(month, revision)).sort_values(["사용일자", "노선명", "역명"]).reset_index(drop=True)
+    expected = expected.sort_values(["사용일자", "노선명", "역명"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(rows, expected, check_dtype=False)
+
+    counts = ["승차총승객수", "하차총승객수"]
+    daily = expected.groupby(["사용일자", "노선명"])[counts].sum().reset_index()
+    pd.testing.assert_frame_equal(store.read_daily_line(month, revision), daily, check_dtype=False)
+    station = expected.groupby(["노선명", "역명"])[counts].sum().reset_index()
+    pd.testing.assert_frame_equal(store.read_station(month, revision), station, check_dtype=False)
+
+
+def test_append_and_replace_keep_aggregates_equal_to_groupby(tmp_path):
+    store = SubwayStore(tmp_path, SUBWAY_SCHEMA, SCHEMA_VERSION)
+    first = make_table(range(1, 11), seed=1)
+    changed = store.append(first, source="a.csv", digest="a")
+    assert changed == {"2025-01": (None, 1)}
+    _assert_aggregates(store, _frame(first))
+
+    # 새 날짜(11~15일) 추가 + 기존 날짜(5~10일) 교체, 교체 날짜에는 새 역도 섞습니다.
+    second = make_table(range(5, 16), stations=("시청", "서울역", "종각"), seed=2)
+    changed = store.append(second, source="b.csv", digest="b")
+    assert changed == {"2025-01": (1, 2)}
+    old = _frame(first)
+    expected = pd.concat([old[old["사용일자"] < pd.Timestamp("2025-01-05")], _frame(second)])
+    _assert_aggregates(store, expected)
+
+    # 같은 날짜를 역이 줄어든 파일로 다시 교체하면 빠진 역의 월 합계도 사라집니다.
+    third = make_table(range(1, 16), stations=("시청",), seed=3)
+    store.append(third, source="c.csv", digest="c")
+    _assert_aggregates(store, _frame(third))
+    assert store.source_digest("c.csv") == "c"
+    assert [revision for _, revision in store.partitions()] == [3]
+    assert store._revisions("2025-01") == [2, 3]